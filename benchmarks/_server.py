@@ -0,0 +1,108 @@
+"""Local stand-in for a Spring Cloud Config Server used by the benchmarks."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def environment(app_name: str, profile: str, label: str, keys: int = 50) -> dict:
+    return {
+        "name": app_name,
+        "profiles": profile.split(","),
+        "label": label,
+        "version": "b478bb5c9784bb2285c461892fab22361007e0c9",
+        "state": None,
+        "propertySources": [
+            {
+                "name": f"file:///config/{app_name}-{profile}.yml",
+                "source": {f"{app_name}.key{i}.value": i for i in range(keys)},
+            },
+            {
+                "name": "file:///config/application.yml",
+                "source": {"spring.cloud.consul.host": "discovery"},
+            },
+        ],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:  # type: ignore
+            self.server.connections += 1  # type: ignore
+
+    def _count(self) -> None:
+        with self.server.lock:  # type: ignore
+            self.server.requests += 1  # type: ignore
+
+    def do_GET(self) -> None:
+        self._count()
+        time.sleep(self.server.latency)  # type: ignore
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 3:
+            self._send(404, b"")
+            return
+        body = json.dumps(environment(*parts, keys=self.server.keys))  # type: ignore
+        self._send(200, body.encode(), "application/json")
+
+    def do_POST(self) -> None:
+        self._count()
+        length = int(self.headers.get("Content-Length", 0))
+        data = self.rfile.read(length)
+        time.sleep(self.server.latency)  # type: ignore
+        self._send(200, data, "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class ConfigServer(ThreadingHTTPServer):
+    """Serve synthetic environments and count TCP connections.
+
+    Usage:
+
+    with ConfigServer(latency=0.01) as server:
+        requests.get(f"{server.address}/app/development/master")
+        server.connections
+    """
+
+    daemon_threads = True
+    # the default backlog of 5 drops connections of parallel batches, which
+    # then stall about 1s on SYN retransmits
+    request_queue_size = 128
+
+    def __init__(self, latency: float = 0.0, keys: int = 50) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.keys = keys
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        self.connections = 0
+        self.requests = 0
+
+    def __enter__(self) -> "ConfigServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
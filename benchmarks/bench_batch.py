@@ -0,0 +1,61 @@
+"""Serial loop vs fetch_many/fetch_many_async against a local server.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_batch.py [apps] [latency]
+"""
+
+import asyncio
+import sys
+import time
+
+from _server import ConfigServer
+
+from config import ConfigClient, http
+from config.aio import fetch_many_async
+from config.batch import fetch_many
+
+
+def report(name: str, server: ConfigServer, elapsed: float, ok: int) -> None:
+    print(
+        f"{name:<22} ok={ok:<5} requests={server.requests:<5} "
+        f"connections={server.connections:<5} elapsed={elapsed * 1000:.1f}ms"
+    )
+
+
+def main(apps: int, latency: float) -> None:
+    targets = [f"app{i}" for i in range(apps)]
+    with ConfigServer(latency=latency) as server:
+        server.reset()
+        start = time.perf_counter()
+        for target in targets:
+            ConfigClient(address=server.address, app_name=target).get_config()
+        report("serial", server, time.perf_counter() - start, apps)
+        http.close_sessions()
+
+        for workers in (8, 32):
+            server.reset()
+            start = time.perf_counter()
+            results = fetch_many(targets, address=server.address, max_workers=workers)
+            ok = sum(r.ok for r in results)
+            report(f"fetch_many({workers})", server, time.perf_counter() - start, ok)
+
+            server.reset()
+            start = time.perf_counter()
+            results = asyncio.run(
+                fetch_many_async(targets, address=server.address, limit=workers)
+            )
+            ok = sum(r.ok for r in results)
+            report(
+                f"fetch_many_async({workers})",
+                server,
+                time.perf_counter() - start,
+                ok,
+            )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.005,
+    )
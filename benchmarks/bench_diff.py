@@ -0,0 +1,50 @@
+"""Diff of two config versions where one key changed, with and without shared subtrees.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_diff.py [keys] [repeat]
+"""
+
+import copy
+import sys
+import time
+from typing import Callable
+
+from bench_tree import source
+
+from config._config import build_tree
+from config.changes import diff
+from config.snapshot import ConfigSnapshot
+
+
+def best(fnc: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fnc()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(keys: int, repeat: int) -> None:
+    flat = source(keys)
+    changed = dict(flat)
+    changed[next(iter(changed))] = "changed"
+
+    first = ConfigSnapshot.build(build_tree(flat))
+    shared = ConfigSnapshot.build(build_tree(changed), first)
+    copied = copy.deepcopy(dict(shared))
+    assert len(diff(first, shared)) == len(diff(first, copied)) == 1
+
+    print(
+        f"keys={keys:<7} "
+        f"shared subtrees={best(lambda: diff(first, shared), repeat) * 1000:8.2f}ms "
+        f"full walk={best(lambda: diff(first, copied), repeat) * 1000:8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,100 @@
+"""Flask app.config.get through the snapshot index vs the previous glom lookup.
+
+The threads column runs the same calls spread over threads, like a WSGI
+server would, while a refresh publishes a new version every millisecond.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_flask.py [calls] [threads]
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from flask import Flask
+from flask.config import Config
+from glom import glom
+
+from config.ext.flask import _Config
+from config.snapshot import ConfigSnapshot
+
+KEYS = [
+    "spring.datasource.hikari.maximum-pool-size",
+    "spring.datasource.url",
+    "server.port",
+    "DEBUG",
+    "feature.flags.missing",
+]
+CONFIG = {
+    "server": {"port": 8080},
+    "spring": {
+        "datasource": {
+            "url": "jdbc:postgresql://db/app",
+            "hikari": {"maximum-pool-size": 20, "minimum-idle": 5},
+        }
+    },
+}
+
+
+class GlomConfig(Config):
+    """The previous _Config: glom over app.config on every get."""
+
+    def __init__(self, _config, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        Config.update(self, _config)
+
+    def get(self, key, default: Any = None) -> Any:
+        return glom(self, key, default=default)
+
+
+def throughput(get: Callable, key: str, calls: int, threads: int) -> float:
+    def run(count: int) -> None:
+        for _ in range(count):
+            get(key)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(run, [calls // threads] * threads))
+    return calls / (time.perf_counter() - start)
+
+
+def main(calls: int, threads: int) -> None:
+    app = Flask(__name__)
+    old = GlomConfig(CONFIG, root_path=app.root_path, defaults=app.config)
+    new = _Config(
+        ConfigSnapshot.build(CONFIG, version="v1"),
+        root_path=app.root_path,
+        defaults=app.config,
+    )
+    stop = threading.Event()
+
+    def refresh() -> None:
+        versions = [ConfigSnapshot.build(CONFIG, version=f"v{i}") for i in range(2)]
+        while not stop.wait(0.001):
+            new._publish(versions[0])
+            versions.reverse()
+
+    refresher = threading.Thread(target=refresh, daemon=True)
+    refresher.start()
+    try:
+        for key in KEYS:
+            glom_rate = throughput(old.get, key, calls, 1)
+            get_rate = throughput(new.get, key, calls, 1)
+            threaded = throughput(new.get, key, calls, threads)
+            print(
+                f"{key:<44} glom={glom_rate:>11,.0f}/s get={get_rate:>11,.0f}/s "
+                f"threads={threaded:>11,.0f}/s speedup={get_rate / glom_rate:.1f}x"
+            )
+    finally:
+        stop.set()
+        refresher.join()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
@@ -0,0 +1,53 @@
+"""ConfigClient.get through the flat index vs glom.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_get.py [calls]
+"""
+
+import sys
+import time
+
+from glom import glom
+
+from config import ConfigClient
+
+KEYS = [
+    "spring.datasource.hikari.maximum-pool-size",
+    "spring.datasource.url",
+    "server.port",
+    "spring.datasource.hikari",
+    "feature.flags.missing",
+]
+
+
+def main(calls: int) -> None:
+    client = ConfigClient(app_name="bench")
+    client._publish(
+        {
+            "server": {"port": 8080},
+            "spring": {
+                "datasource": {
+                    "url": "jdbc:postgresql://db/app",
+                    "hikari": {"maximum-pool-size": 20, "minimum-idle": 5},
+                }
+            },
+        }
+    )
+    for key in KEYS:
+        start = time.perf_counter()
+        for _ in range(calls):
+            glom(client.config, key, default="")
+        old = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.get(key)
+        new = time.perf_counter() - start
+        print(
+            f"{key:<44} glom={calls / old:>11,.0f}/s "
+            f"get={calls / new:>11,.0f}/s speedup={old / new:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
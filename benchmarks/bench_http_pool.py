@@ -0,0 +1,56 @@
+"""Connections opened over N sequential config fetches.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_http_pool.py [N]
+"""
+
+import sys
+import time
+
+import requests
+from _server import ConfigServer
+
+from config import ConfigClient, http
+
+
+def run(server: ConfigServer, client: ConfigClient, fetches: int) -> None:
+    server.reset()
+    start = time.perf_counter()
+    for _ in range(fetches):
+        client.get_config()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{client.__class__.__name__:<12} session={client.session is not None!s:<5} "
+        f"requests={server.requests:<5} connections={server.connections:<5} "
+        f"elapsed={elapsed * 1000:.1f}ms"
+    )
+
+
+def main(fetches: int) -> None:
+    with ConfigServer() as server:
+        # one-shot requests.get, as config-client <= 1.5.0 did
+        server.reset()
+        start = time.perf_counter()
+        for _ in range(fetches):
+            requests.get(f"{server.address}/app/development/master").json()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'requests.get':<12} session=False requests={server.requests:<5} "
+            f"connections={server.connections:<5} elapsed={elapsed * 1000:.1f}ms"
+        )
+
+        client = ConfigClient(address=server.address, app_name="app")
+        run(server, client, fetches)
+
+        client = ConfigClient(
+            address=server.address,
+            app_name="app",
+            session=http.create_session(pool_maxsize=1),
+        )
+        run(server, client, fetches)
+    http.close_sessions()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,78 @@
+"""Time and peak memory of get_config decoding a large response, whole or streamed.
+
+The body is read in 64KB chunks like a socket: the whole mode joins them
+before decoding, like response.content, the stream mode parses them as
+they arrive.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_json.py [properties] [sources]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from bench_memory import environment
+
+from config import decoder
+from config.spring import ConfigClient
+
+DECODERS = {"json": json.loads}
+try:
+    import orjson
+
+    DECODERS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+
+def apply(name: str, stream: bool, chunks: List[bytes]) -> ConfigClient:
+    client = ConfigClient(
+        app_name="bench", json_decoder=DECODERS[name], resolve_placeholders=False
+    )
+    if stream:
+        data = decoder.stream_environment(iter(chunks), client.json_decoder)
+    else:
+        data = client.json_decoder(b"".join(chunks))
+    client._apply(data)
+    return client
+
+
+def measure(name: str, stream: bool, chunks: List[bytes], repeat: int = 3) -> None:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        apply(name, stream, chunks)
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    apply(name, stream, chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<8} {'stream' if stream else 'whole':<7} "
+        f"time={min(timings) * 1000:7.1f}ms peak={peak / 2**20:6.1f}MB"
+    )
+
+
+def main(properties: int, count: int) -> None:
+    body = environment(properties, count).encode()
+    chunks = [
+        body[start:][: decoder.CHUNK_SIZE]
+        for start in range(0, len(body), decoder.CHUNK_SIZE)
+    ]
+    print(f"properties={properties} sources={count} json={len(body) / 2**20:.1f}MB")
+    for name in DECODERS:
+        for stream in (False, True):
+            measure(name, stream, chunks)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 80_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 12,
+    )
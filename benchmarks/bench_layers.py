@@ -0,0 +1,79 @@
+"""Eager-merged vs layered config: refresh touching one source, then lookups.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_layers.py [keys] [sources] [repeat]
+"""
+
+import sys
+import time
+from typing import Callable, List
+
+from bench_tree import source
+
+from config._config import build_index, merge_sources
+from config.layers import LayeredConfig
+from config.snapshot import ConfigSnapshot
+
+
+def best(fnc: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fnc()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(keys: int, count: int, repeat: int) -> None:
+    sources = [source(keys // count, seed=seed) for seed in range(count)]
+    changed: List[dict] = [dict(src) for src in sources]
+    first_key = next(iter(changed[0]))
+    changed[0][first_key] = "changed"
+    named = list(enumerate(map(str, range(count))))
+
+    merged = ConfigSnapshot.build(merge_sources(sources))
+    layered = LayeredConfig.build((name, sources[i]) for i, name in named)
+
+    def merged_refresh():
+        return ConfigSnapshot.build(merge_sources(changed), merged)
+
+    def layered_refresh():
+        return LayeredConfig.build(((n, changed[i]) for i, n in named), layered)
+
+    lookups = list(build_index(merged))[:: max(1, keys // 10_000)]
+
+    def merged_get():
+        index = merged.index
+        for key in lookups:
+            index.get(key)
+
+    def layered_get():
+        cold = LayeredConfig(layered.layers)
+        for key in lookups:
+            cold.get(key)
+
+    def layered_get_warm():
+        for key in lookups:
+            layered.get(key)
+
+    print(f"keys={keys} sources={count} lookups={len(lookups)}")
+    print(
+        f"refresh  merged={best(merged_refresh, repeat) * 1000:8.1f}ms "
+        f"layered={best(layered_refresh, repeat) * 1000:8.1f}ms"
+    )
+    print(
+        f"get      merged={best(merged_get, repeat) * 1000:8.1f}ms "
+        f"layered={best(layered_get, repeat) * 1000:8.1f}ms "
+        f"layered (memoized)={best(layered_get_warm, repeat) * 1000:8.1f}ms"
+    )
+    tree = best(lambda: LayeredConfig(layered.layers).tree, repeat)
+    print(f"config   layered={tree * 1000:8.1f}ms (merged on first use)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 3,
+    )
@@ -0,0 +1,81 @@
+"""List assembly of key[i] properties with 10k entries.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_lists.py [entries] [repeat]
+"""
+
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+from config._config import _fix_key, build_tree, merge_list
+
+
+def legacy_merge_list(config: dict) -> None:
+    """merge_list before the index-aware assembly, kept for comparison."""
+    keys: dict = {}
+    for k in config.keys():
+        key, is_list = _fix_key(k)
+        if is_list:
+            keys[key] = keys.get(key, -1) + 1
+    for key, it in keys.items():
+        for i in range(it + 1):
+            if key not in config:
+                config.update({key: [config[f"{key}[{i}]"]]})
+            else:
+                config[key].append(config[f"{key}[{i}]"])
+            config.pop(f"{key}[{i}]")
+
+
+def cases(entries: int) -> dict:
+    side = int(entries**0.5)
+    ordered = {f"items[{i}]": i for i in range(entries)}
+    shuffled = list(ordered.items())
+    random.Random(0).shuffle(shuffled)
+    return {
+        "ordered": ordered,
+        "shuffled": dict(shuffled),
+        "sparse": {f"items[{i * 10}]": i for i in range(entries)},
+        "nested": {
+            f"servers[{i}].hosts[{j}]": j for i in range(side) for j in range(side)
+        },
+        "matrix": {f"matrix[{i}][{j}]": j for i in range(side) for j in range(side)},
+    }
+
+
+def best(fnc: Callable[[], object], repeat: int) -> Optional[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            fnc()
+        except KeyError:
+            return None
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def ms(elapsed: Optional[float], missing: str = "fails") -> str:
+    return missing if elapsed is None else f"{elapsed * 1000:.2f}ms"
+
+
+def main(entries: int, repeat: int) -> None:
+    for name, source in cases(entries).items():
+        legacy = best(lambda: legacy_merge_list(dict(source)), repeat)
+        # merge_list works on one dict: dotted keys are left to build_tree
+        flat = not any("." in key for key in source)
+        current = best(lambda: merge_list(dict(source)), repeat) if flat else None
+        tree = best(lambda: build_tree(source), repeat)
+        print(
+            f"{name:<9} entries={len(source):<7} legacy merge_list={ms(legacy):<9} "
+            f"merge_list={ms(current, '-'):<9} build_tree={ms(tree)}"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,78 @@
+"""Retained memory of the merged, layered and compact modes, measured with tracemalloc.
+
+The environment is parsed from JSON for every mode, like a server response,
+and released before measuring, so only what the client keeps is counted.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_memory.py [properties] [sources]
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from bench_tree import WORDS
+
+from config.spring import MODES, ConfigClient
+
+LEVELS = ["INFO", "DEBUG", "WARN", "true", "false", "30s", "http://localhost:8080"]
+
+
+def environment(properties: int, count: int) -> str:
+    """12 profiles/sources overriding a shared set of keys, like a large app."""
+    rnd = random.Random(0)
+    keys = []
+    while len(keys) < properties // 2:
+        path = [f"{rnd.choice(WORDS)}{rnd.randint(0, 20)}" for _ in range(4)]
+        keys.append(".".join(path))
+    sources = []
+    for position in range(count):
+        size = properties // count
+        chosen = rnd.sample(keys, size)
+        source = {
+            key: rnd.choice(LEVELS) if rnd.random() < 0.7 else rnd.randint(0, 100)
+            for key in chosen
+        }
+        sources.append({"name": f"application-{position}.yml", "source": source})
+    return json.dumps(
+        {"name": "bench", "version": "v1", "propertySources": sources},
+    )
+
+
+def measure(mode: str, payload: str) -> None:
+    gc.collect()
+    tracemalloc.start()
+    client = ConfigClient(app_name="bench", mode=mode, resolve_placeholders=False)
+    data = json.loads(payload)
+    client._apply(data)
+    del data
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    keys = list(client._current()[1])[::50]
+    start = time.perf_counter()
+    for key in keys:
+        client.get(key)
+    elapsed = (time.perf_counter() - start) / len(keys)
+    print(
+        f"{mode:<8} retained={retained / 2**20:7.1f}MB peak={peak / 2**20:7.1f}MB "
+        f"get={elapsed * 1e6:5.2f}us"
+    )
+
+
+def main(properties: int, count: int) -> None:
+    payload = environment(properties, count)
+    print(f"properties={properties} sources={count} json={len(payload) / 2**20:.1f}MB")
+    for mode in MODES:
+        measure(mode, payload)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 80_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 12,
+    )
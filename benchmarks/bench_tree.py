@@ -0,0 +1,89 @@
+"""to_dict + merge_dict vs the single-pass build_tree on large property sources.
+
+Usage:
+
+PYTHONPATH=. python benchmarks/bench_tree.py [repeat]
+"""
+
+import random
+import sys
+import time
+from typing import Callable, List
+
+from config._config import build_tree, merge_dict, to_dict
+
+SIZES = (1_000, 10_000, 100_000)
+WORDS = [
+    "spring",
+    "datasource",
+    "cloud",
+    "server",
+    "client",
+    "management",
+    "security",
+    "logging",
+    "level",
+    "pool",
+    "cache",
+    "kafka",
+    "consumer",
+    "producer",
+    "timeout",
+]
+
+
+def source(keys: int, seed: int = 0) -> dict:
+    """Flat property source shaped like Spring's: 2-6 segments, ~5% list entries."""
+    rnd = random.Random(seed)
+    flat: dict = {}
+    while len(flat) < keys:
+        path = [rnd.choice(WORDS) for _ in range(rnd.randint(1, 5))]
+        prefix = ".".join(f"{w}{rnd.randint(0, 9)}" for w in path)
+        if rnd.random() < 0.05:
+            for i in range(rnd.randint(1, 10)):
+                flat[f"{prefix}.items[{i}]"] = f"value-{i}"
+        else:
+            flat[f"{prefix}.key{len(flat)}"] = rnd.randint(0, 10_000)
+    return flat
+
+
+def legacy(sources: List[dict]) -> dict:
+    config: dict = {}
+    for src in reversed(sources):
+        merge_dict(config, to_dict(src))
+    return config
+
+
+def single_pass(sources: List[dict]) -> dict:
+    config: dict = {}
+    for src in reversed(sources):
+        merge_dict(config, build_tree(src))
+    return config
+
+
+def best(fnc: Callable[[List[dict]], dict], sources: List[dict], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fnc(sources)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(repeat: int) -> None:
+    for size in SIZES:
+        # application-profile.yml overriding half of application.yml
+        base = source(size, seed=1)
+        override = dict(list(base.items())[: size // 2])
+        sources = [override, base]
+        assert legacy(sources) == single_pass(sources)
+        old = best(legacy, sources, repeat)
+        new = best(single_pass, sources, repeat)
+        print(
+            f"keys={size:<7} to_dict+merge_dict={old * 1000:9.1f}ms "
+            f"build_tree={new * 1000:9.1f}ms speedup={old / new:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
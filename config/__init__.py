@@ -1,15 +1,26 @@
 from .auth import OAuth2
 from .cf import CF
 from .cfenv import CFenv
+from .cipher import RemoteDecryptor
+from .monitor import AsyncRefreshReceiver, MonitorServer, RefreshReceiver
+from .refresh import AsyncRefreshScheduler, RefreshScheduler
+from .snapshot import ConfigSnapshot
 from .spring import ConfigClient, config_client, create_config_client
 
 __version__ = "1.5.0"
 __all__ = [
     "__version__",
     "ConfigClient",
+    "ConfigSnapshot",
     "CFenv",
     "CF",
+    "MonitorServer",
     "OAuth2",
+    "RefreshReceiver",
+    "RefreshScheduler",
+    "RemoteDecryptor",
+    "AsyncRefreshReceiver",
+    "AsyncRefreshScheduler",
     "create_config_client",
     "config_client",
 ]
@@ -1,5 +1,4 @@
-from contextlib import suppress
-from typing import Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 def to_dict(config: dict) -> dict:
@@ -30,25 +29,147 @@ def merge_dict(primary_config: dict, secondary_config: dict) -> dict:
     return primary_config
 
 
-def merge_list(config: dict) -> None:
-    keys = {}
-    with suppress(AttributeError):
-        for k in config.keys():
-            key, is_list = _fix_key(k)
-            if is_list:
-                if key not in keys:
-                    keys[key] = 0
-                else:
-                    keys[key] += 1
-
-    for key, it in keys.items():
-        for i in range(it + 1):
-            if key not in config:
-                config.update({key: [config[f"{key}[{i}]"]]})
-                config.pop(f"{key}[{i}]")
-            else:
-                config[key].append(config[f"{key}[{i}]"])
-                config.pop(f"{key}[{i}]")
+def build_tree(config: dict) -> dict:
+    """Nested config from a flat property source, built in a single pass.
+
+    Same result as to_dict, without the intermediate dict per key and the
+    merge_dict of each one: the key is split once and its nodes are created
+    in place. key[i] segments, nested (servers[0].hosts[2]) or chained
+    (matrix[0][1]), collect their elements by index while the tree is built
+    and each list is assembled once at the end, holes filled with None.
+    """
+    tree: dict = {}
+    lists: List[Tuple[dict, Any, _Indexed]] = []
+    values: Dict[int, dict] = {}
+    for key, value in config.items():
+        path = _path(key)
+        node = tree
+        if "[" not in key:
+            for step in path[:-1]:
+                child = node.get(step)
+                if type(child) is not dict:
+                    child = node[step] = {}
+                node = child
+        else:
+            for step, following in zip(path, path[1:]):
+                kind = _Indexed if type(following) is int else dict
+                child = node.get(step)
+                if type(child) is not kind:
+                    child = node[step] = _Indexed() if kind is _Indexed else {}
+                    if type(child) is _Indexed:
+                        lists.append((node, step, child))
+                node = child
+        last = path[-1]
+        current = node.get(last)
+        if type(current) is dict and isinstance(value, dict):
+            merge_dict(current, value)
+            value = current
+        elif isinstance(current, dict) and not isinstance(value, dict):
+            continue
+        else:
+            node[last] = value
+        if isinstance(value, dict):
+            values[id(value)] = value
+    for node in values.values():
+        _merge(node)
+    assembled = []
+    for node, step, indexed in reversed(lists):
+        if node.get(step) is indexed:
+            node[step] = _to_list(indexed)
+            assembled.append((node, step))
+    # lists go after the other keys of their dict, as merge_list puts them
+    for node, step in reversed(assembled):
+        node[step] = node.pop(step)
+    return tree
+
+
+def merge_sources(sources: Iterable[dict]) -> dict:
+    """Merge flat property sources, ordered from the highest to the lowest precedence.
+
+    Each source is merged under the ones before it as soon as it's read,
+    so a stream of sources never has to be held as a whole.
+    """
+    server_config: dict = {}
+    for source in sources:
+        server_config = merge_dict(build_tree(source), server_config)
+    return server_config
+
+
+def build_index(config: dict) -> Dict[str, Any]:
+    """Dotted path -> value of every node of the config, subtrees included.
+
+    Paths are the ones glom resolves on the same config, e.g.
+    'spring.cloud' for a subtree or 'servers.0.host' inside a list.
+    """
+    index: Dict[str, Any] = {}
+    stack: List[Tuple[str, Any]] = [("", config)]
+    while stack:
+        prefix, node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(key, str) and "." in key:
+                continue  # unreachable through a dotted path
+            path = f"{prefix}{key}"
+            index[path] = value
+            if value and isinstance(value, (dict, list)):
+                stack.append((f"{path}.", value))
+    return index
+
+
+def merge_list(config: Any) -> None:
+    """Replace the key[i] entries of a dict by lists, in place.
+
+    Entries in index order without gaps, as the server sends them, are
+    appended as they come. Otherwise indices are parsed once and the elements
+    placed by index, so the order doesn't matter and missing indices are None.
+    """
+    if not isinstance(config, dict):
+        return
+    keys = [k for k in config if isinstance(k, str) and k.endswith("]")]
+    if not keys:
+        return
+    dense = _dense_lists(config, keys)
+    if dense is not None:
+        for key in keys:
+            del config[key]
+        for name, items in dense.items():
+            config.pop(name, None)
+            config[name] = items
+        return
+    lists: Dict[str, _Indexed] = {}
+    for key in keys:
+        name, indices = _split_index(key)
+        if not indices:
+            continue
+        node = lists.get(name)
+        if node is None:
+            node = lists[name] = _Indexed()
+        for index in indices[:-1]:
+            child = node.get(index)
+            if type(child) is not _Indexed:
+                child = node[index] = _Indexed()
+            node = child
+        node[indices[-1]] = config.pop(key)
+    for name, indexed in lists.items():
+        config.pop(name, None)
+        config[name] = _to_list(indexed)
+
+
+def _dense_lists(config: dict, keys: List[str]) -> Optional[Dict[str, list]]:
+    """Lists of key[i] entries sent in order without gaps, as the server does.
+
+    None when an entry is out of order, sparse or nested, left to merge_list.
+    """
+    lists: Dict[str, list] = {}
+    for key in keys:
+        name, _, index = key[:-1].partition("[")
+        items = lists.get(name)
+        if items is None:
+            items = lists[name] = []
+        if not index.isdecimal() or int(index) != len(items):
+            return None
+        items.append(config[key])
+    return lists
 
 
 def _merge(config: dict) -> None:
@@ -59,6 +180,59 @@ def _merge(config: dict) -> None:
             _merge(v)
 
 
+class _Indexed(dict):
+    """Elements of a list being assembled, keyed by index."""
+
+
+def _split_index(segment: str) -> Tuple[str, List[int]]:
+    """Name and indices of a key segment.
+
+    For example:
+    input: 'hosts[2]'
+    output: 'hosts', [2]
+
+    input: 'matrix[0][1]'
+    output: 'matrix', [0, 1]
+
+    input: 'hosts'
+    output: 'hosts', []
+    """
+    name, bracket, rest = segment.partition("[")
+    if not bracket or not rest.endswith("]"):
+        return segment, []
+    rest = rest[:-1]
+    if rest.isdecimal():
+        return name, [int(rest)]
+    indices = rest.split("][")
+    if not all(index.isdecimal() for index in indices):
+        return segment, []
+    return name, [int(index) for index in indices]
+
+
+def _path(key: str) -> List[Any]:
+    """Steps from the root to a dotted key: names for dicts, indices for lists."""
+    segments = key.split(".")
+    # to_dict restarts the path on the first segment equal to the last one
+    end = segments.index(segments[-1]) + 1
+    if end < len(segments):
+        segments = segments[:end]
+    if "[" not in key:
+        return segments
+    path: List[Any] = []
+    for segment in segments:
+        name, indices = _split_index(segment)
+        path.append(name)
+        path.extend(indices)
+    return path
+
+
+def _to_list(indexed: dict) -> list:
+    items: list = [None] * (max(indexed) + 1)
+    for index, value in indexed.items():
+        items[index] = _to_list(value) if type(value) is _Indexed else value
+    return items
+
+
 def _fix_key(key_str: str) -> Tuple[str, bool]:
     """Check if a dictionary key has array values.
 
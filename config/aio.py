@@ -0,0 +1,363 @@
+"""Module for retrieve application's config from Spring Cloud Config using asyncio."""
+
+import asyncio
+import ssl
+from base64 import b64encode
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+from attrs import field, mutable, validators
+from requests.auth import HTTPBasicAuth
+
+from .auth import OAuth2
+from .batch import FetchResult, Target, _result, _split_params, _target_params
+from .decoder import CHUNK_SIZE, SOURCES, EnvironmentParser
+from .exceptions import RequestFailedException, RequestTokenException
+from .logger import logger
+from .singleflight import AsyncSingleFlight
+from .spring import BaseConfigClient
+
+
+@mutable
+class AsyncConfigClient(BaseConfigClient):
+    """Spring Cloud Config Client built on aiohttp.
+
+    Usage:
+
+    async with AsyncConfigClient(app_name='foo') as client:
+        await client.get_config()
+        client.get('spring.cloud.consul.host')
+    """
+
+    session: Optional[aiohttp.ClientSession] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(aiohttp.ClientSession)),
+        repr=False,
+    )
+    _owns_session: bool = field(default=False, init=False, repr=False)
+    _revalidation: Optional[asyncio.Future] = field(
+        default=None, init=False, repr=False
+    )
+    _token_lock: Optional[asyncio.Lock] = field(default=None, init=False, repr=False)
+    _flight: AsyncSingleFlight = field(
+        factory=AsyncSingleFlight, init=False, repr=False
+    )
+
+    async def __aenter__(self) -> "AsyncConfigClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session if it was created by the client."""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
+        return self.session
+
+    @property
+    def coalesced(self) -> int:
+        """Calls of get_config that shared the request of a concurrent one."""
+        return self._flight.coalesced
+
+    async def get_config(self, **kwargs) -> bool:
+        """Request the configuration to the config server.
+
+        Tasks calling it while a request is in flight wait for that request
+        and get its result, instead of sending their own.
+
+        Usage:
+
+        # Example 1:
+        await client.get_config()
+
+        # Example 2:
+        await client.get_config(verify=False)
+
+        :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: False if the server reported no change since the last request.
+        """
+        return await self._flight.do(self._target, self._fetch, **kwargs)
+
+    async def _fetch(self, **kwargs) -> bool:
+        kwargs = self._conditional_headers(await self._configure_oauth2(**kwargs))
+
+        async def fetch(address: str) -> Tuple[Optional[dict], Optional[str]]:
+            async with self._session().get(
+                f"{address}{self._path}", raise_for_status=True, **options
+            ) as response:
+                etag = response.headers.get("ETag")
+                if response.status == 304:
+                    return None, etag
+                if self.stream:
+                    return await self._stream(response), etag
+                return self.json_decoder(await response.read()), etag
+
+        try:
+            options = _request_kwargs(kwargs)
+            data, etag = await self.replicas.call_async(fetch)
+            plaintexts = await self._decrypt(data, kwargs)
+        except Exception as err:
+            return self._request_failed(err)
+        return self._apply(data, etag, plaintexts)
+
+    async def _stream(self, response: aiohttp.ClientResponse) -> dict:
+        """Environment parsed while it's read, the body is never held as a whole.
+
+        Reading stops at the property sources when the version sent before
+        them was already applied.
+        """
+        parser = EnvironmentParser(self.json_decoder)
+        sources: List[dict] = []
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            sources += parser.feed(chunk)
+            if parser.has_sources and not self._pending(parser.environment):
+                return parser.environment
+        environment = parser.close()
+        if parser.has_sources:
+            environment[SOURCES] = sources
+        return environment
+
+    async def warm_start(self, **kwargs) -> bool:
+        """Load the last-known-good snapshot and revalidate it on a background task.
+
+        Without a snapshot, the config is requested right away.
+
+        :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: True if the snapshot was loaded.
+        """
+        if not self.load_snapshot():
+            await self.get_config(**kwargs)
+            return False
+        self._revalidation = asyncio.ensure_future(self._revalidate(**kwargs))
+        return True
+
+    async def _revalidate(self, **kwargs) -> None:
+        try:
+            await self.get_config(**kwargs)
+        except (Exception, SystemExit) as err:
+            logger.error(f"Failed to revalidate snapshot: [error='{err}']")
+
+    async def _decrypt(
+        self, environment: Optional[dict], kwargs: dict
+    ) -> Dict[str, str]:
+        ciphertexts = self._ciphers(environment)
+        if not ciphertexts:
+            return {}
+        return await self.decryptor.decrypt_all_async(  # type: ignore
+            ciphertexts, self, **self._decrypt_options(kwargs)
+        )
+
+    async def _configure_oauth2(self, **kwargs) -> dict:
+        if self.oauth2:
+            if not self.oauth2.valid:
+                if self._token_lock is None:
+                    self._token_lock = asyncio.Lock()
+                async with self._token_lock:
+                    if not self.oauth2.valid:
+                        await self._request_token(**kwargs)
+            try:
+                kwargs["headers"].update(self.oauth2.authorization_header)
+            except KeyError:
+                kwargs.update(dict(headers=self.oauth2.authorization_header))
+        return kwargs
+
+    async def _request_token(self, **kwargs) -> None:
+        oauth2: OAuth2 = self.oauth2  # type: ignore
+        try:
+            async with self._session().post(
+                oauth2.access_token_uri,
+                data={"grant_type": oauth2.grant_type},
+                raise_for_status=True,
+                **_request_kwargs(
+                    {k: v for k, v in kwargs.items() if k != "auth"},
+                    auth=(oauth2.client_id, oauth2.client_secret),
+                ),
+            ) as response:
+                data = await response.json(content_type=None)
+        except aiohttp.InvalidURL:
+            raise RequestFailedException("empty")
+        except aiohttp.ClientResponseError:
+            raise RequestTokenException
+        oauth2.set_token(data.get("access_token"), data.get("expires_in"))
+        logger.debug("Access token successfully obtained.")
+
+    async def _text(self, method: str, path: str, **kwargs) -> str:
+        failed = [self.address]
+
+        async def fetch(address: str) -> str:
+            try:
+                async with self._session().request(
+                    method, f"{address}{path}", raise_for_status=True, **options
+                ) as response:
+                    return await response.text()
+            except Exception:
+                failed.append(address)
+                raise
+
+        try:
+            options = _request_kwargs(kwargs)
+            return await self.replicas.call_async(fetch)
+        except Exception:
+            # the URL of the replica that failed last, not the whole address list
+            raise RequestFailedException(f"{failed[-1]}{path}")
+
+    async def get_file(self, filename: str, **kwargs) -> str:
+        """Request a file from the config server.
+
+        Usage:
+
+        await client.get_file('nginx.conf')
+
+
+        :param filename: filename to retrieve from the server.
+        :param kwargs: any keyword argument used to configure request for the server.
+        """
+        return await self._text("GET", f"{self._path}/{filename}", **kwargs)
+
+    async def encrypt(
+        self,
+        value: str,
+        path: str = "/encrypt",
+        headers: dict = {"Content-Type": "text/plain"},
+        **kwargs,
+    ) -> str:
+        """Request a encryption of a value to the config server.
+
+        Usage:
+
+        await client.encrypt('123')
+
+
+        :param value: value to encrypt.
+        :param path: base URL to encrypt. [default=/encrypt].
+        :param headers: HTTP Headers to send to server.
+        :param kwargs: any keyword argument used to configure request for the server.
+        """
+        return await self._text("POST", path, data=value, headers=headers, **kwargs)
+
+    async def decrypt(
+        self,
+        value: str,
+        path: str = "/decrypt",
+        headers: dict = {"Content-Type": "text/plain"},
+        **kwargs,
+    ) -> str:
+        """Request decryption from a value to the config server.
+
+        Usage:
+
+        await client.decrypt('35a51fc974e5df6779265239624c4b404ababf08093d1ca265b19bed4863f038')
+
+
+        :param value: value to decrypt.
+        :param path: base URL to decrypt. [default=/decrypt].
+        :param headers: HTTP Headers to send to server.
+        :param kwargs: any keyword argument used to configure request for the server.
+        """
+        return await self._text("POST", path, data=value, headers=headers, **kwargs)
+
+
+async def fetch_many_async(
+    targets: Iterable[Target], limit: int = 8, **kwargs
+) -> List[FetchResult]:
+    """Fetch many (app_name, profile, label) concurrently over a shared aiohttp session.
+
+    Usage:
+
+    results = await fetch_many_async(
+        [('app1', 'development', 'master'), ('app2', 'production'), 'app3'],
+        address='http://localhost:8888',
+        limit=16,
+    )
+
+    :param targets: app_name or (app_name[, profile[, label]]) tuples.
+    :param limit: maximum number of concurrent requests. [default=8].
+    :param kwargs: AsyncConfigClient parameters or keyword arguments used on get_config.
+
+    :return: one FetchResult per target, in the same order.
+    """
+    instance_params, get_config_params = _split_params(**kwargs)
+    session = instance_params.get("session")
+    owns_session = session is None
+    if owns_session:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=limit))
+        instance_params["session"] = session
+    clients = [
+        AsyncConfigClient(**_target_params(target, instance_params))
+        for target in targets
+    ]
+    semaphore = asyncio.Semaphore(limit)
+
+    async def fetch(client: AsyncConfigClient) -> FetchResult:
+        async with semaphore:
+            try:
+                await client.get_config(**get_config_params)
+            except (Exception, SystemExit) as err:
+                logger.error(f"Failed to fetch config: [url='{client.url}']")
+                return _result(client, err)
+        return _result(client)
+
+    try:
+        return list(await asyncio.gather(*(fetch(client) for client in clients)))
+    finally:
+        if owns_session:
+            await session.close()  # type: ignore
+
+
+def _request_kwargs(kwargs: dict, **overrides) -> dict:
+    """Translate requests-style keyword arguments to aiohttp."""
+    kwargs = dict(kwargs, **overrides)
+    verify = kwargs.pop("verify", True)
+    cert = kwargs.pop("cert", None)
+    if cert is not None:
+        kwargs["ssl"] = _ssl_context(verify, cert)
+    elif verify is False:
+        kwargs["ssl"] = False
+    elif isinstance(verify, str):
+        kwargs["ssl"] = ssl.create_default_context(cafile=verify)
+    timeout = kwargs.get("timeout")
+    if isinstance(timeout, (int, float)):
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+    auth = kwargs.pop("auth", None)
+    if isinstance(auth, HTTPBasicAuth):
+        auth = (auth.username, auth.password)
+    if isinstance(auth, aiohttp.BasicAuth):
+        # a namedtuple too, encoded by aiohttp with its own encoding
+        kwargs["headers"] = dict(
+            kwargs.get("headers") or {}, Authorization=auth.encode()
+        )
+    elif isinstance(auth, tuple):
+        kwargs["headers"] = dict(
+            kwargs.get("headers") or {}, Authorization=_basic_auth(*auth)
+        )
+    return kwargs
+
+
+def _ssl_context(
+    verify: Union[bool, str], cert: Union[str, Tuple[str, str]]
+) -> ssl.SSLContext:
+    """Context presenting a client certificate, cert is a file or (cert, key) like on requests."""
+    context = ssl.create_default_context(
+        cafile=verify if isinstance(verify, str) else None
+    )
+    if verify is False:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    certfile, keyfile = (cert, None) if isinstance(cert, str) else cert
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def _basic_auth(username: str, password: str) -> str:
+    credentials = f"{username}:{password}".encode("latin1")
+    return f"Basic {b64encode(credentials).decode()}"
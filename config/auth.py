@@ -1,5 +1,8 @@
-from typing import Dict
+import threading
+import time
+from typing import Dict, Optional
 
+import requests
 from attrs import field, mutable, validators
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import HTTPError, MissingSchema
@@ -18,7 +21,20 @@ class OAuth2:
         default="client_credentials",
         validator=validators.instance_of(str),
     )
+    session: Optional[requests.Session] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(requests.Session)),
+        repr=False,
+    )
+    renew_before: float = field(
+        default=30.0,
+        validator=validators.instance_of((int, float)),
+    )
     _token: str = field(factory=str, validator=validators.instance_of(str), repr=False)
+    _renew_at: float = field(default=0.0, init=False, repr=False, eq=False)
+    _lock: threading.Lock = field(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
 
     @property
     def token(self) -> str:
@@ -27,13 +43,31 @@ class OAuth2:
     @token.setter
     def token(self, value) -> None:
         self._token = value
+        self._renew_at = 0.0
         logger.debug(f"set: [access_token='{self._token}']")
 
+    @property
+    def valid(self) -> bool:
+        """True while the cached token can be used without renewal."""
+        return bool(self._token) and time.monotonic() < self._renew_at
+
+    def set_token(self, token: str, expires_in: Optional[float] = None) -> None:
+        """Cache the token until renew_before seconds ahead of its expiry.
+
+        Tokens without expires_in are not cached.
+        """
+        self.token = token
+        if expires_in:
+            ttl = float(expires_in)
+            self._renew_at = time.monotonic() + max(ttl - self.renew_before, ttl / 2)
+
     @property
     def authorization_header(self) -> Dict[str, str]:
         return {"Authorization": f"Bearer {self.token}"}
 
     def request_token(self, client_auth: HTTPBasicAuth, data: dict, **kwargs) -> None:
+        if self.session is not None:
+            kwargs.setdefault("session", self.session)
         try:
             response = http.post(
                 self.access_token_uri, auth=client_auth, data=data, **kwargs
@@ -42,10 +76,19 @@ class OAuth2:
             raise RequestFailedException("empty")
         except HTTPError:
             raise RequestTokenException
-        self.token = response.json().get("access_token")
+        body = response.json()
+        self.set_token(body.get("access_token"), body.get("expires_in"))
         logger.debug("Access token successfully obtained.")
 
     def configure(self, **kwargs) -> None:
-        client_auth = HTTPBasicAuth(self.client_id, self.client_secret)
-        data = {"grant_type": f"{self.grant_type}"}
-        self.request_token(client_auth, data, **kwargs)
+        """Obtain an access token, reusing the cached one until it's close to expiry.
+
+        Concurrent callers wait for a single token request.
+        """
+        if self.valid:
+            return
+        with self._lock:
+            if not self.valid:
+                client_auth = HTTPBasicAuth(self.client_id, self.client_secret)
+                data = {"grant_type": f"{self.grant_type}"}
+                self.request_token(client_auth, data, **kwargs)
@@ -0,0 +1,101 @@
+"""Fetch the config of many applications concurrently."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from attrs import field, frozen
+
+from . import http
+from .logger import logger
+from .spring import ConfigClient, _get_params
+
+Target = Union[str, Sequence[str]]
+
+_TARGET_FIELDS = ("app_name", "profile", "label")
+
+
+@frozen
+class FetchResult:
+    """Outcome of fetching the config of one (app_name, profile, label)."""
+
+    app_name: str
+    profile: str
+    label: str
+    client: Any = field(default=None, repr=False)
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def config(self) -> dict:
+        return self.client.config if self.client is not None else {}
+
+
+def _target_params(target: Target, instance_params: dict) -> dict:
+    """Map 'app' or ('app', 'profile', 'label') onto ConfigClient parameters."""
+    if isinstance(target, str):
+        target = (target,)
+    if not 1 <= len(target) <= len(_TARGET_FIELDS):
+        raise ValueError(f"invalid target: {target!r}")
+    return dict(instance_params, **dict(zip(_TARGET_FIELDS, target)))
+
+
+def _result(client: Any, error: Optional[BaseException] = None) -> FetchResult:
+    return FetchResult(client.app_name, client.profile, client.label, client, error)
+
+
+def _split_params(**kwargs) -> Tuple[dict, dict]:
+    instance_params, get_config_params = _get_params(**kwargs)
+    instance_params.setdefault("fail_fast", False)
+    return instance_params, get_config_params
+
+
+def fetch_many(
+    targets: Iterable[Target], max_workers: int = 8, **kwargs
+) -> List[FetchResult]:
+    """Fetch many (app_name, profile, label) concurrently over a shared connection pool.
+
+    Usage:
+
+    results = fetch_many(
+        [('app1', 'development', 'master'), ('app2', 'production'), 'app3'],
+        address='http://localhost:8888',
+        max_workers=16,
+        timeout=5.0,
+    )
+    for result in results:
+        if result.ok:
+            result.client.get('spring.cloud.consul.host')
+
+    :param targets: app_name or (app_name[, profile[, label]]) tuples.
+    :param max_workers: maximum number of concurrent requests. [default=8].
+    :param kwargs: ConfigClient parameters or keyword arguments used on get_config.
+
+    :return: one FetchResult per target, in the same order.
+    """
+    instance_params, get_config_params = _split_params(**kwargs)
+    session = instance_params.get("session")
+    owns_session = session is None
+    if owns_session:
+        session = http.create_session(pool_maxsize=max_workers)
+        instance_params["session"] = session
+    clients = [
+        ConfigClient(**_target_params(target, instance_params)) for target in targets
+    ]
+
+    def fetch(client: ConfigClient) -> FetchResult:
+        try:
+            client.get_config(**get_config_params)
+        except (Exception, SystemExit) as err:
+            logger.error(f"Failed to fetch config: [url='{client.url}']")
+            return _result(client, err)
+        return _result(client)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, clients))
+    finally:
+        if owns_session:
+            session.close()  # type: ignore
@@ -1,5 +1,6 @@
-from typing import Any, Dict, KeysView
+from typing import Any, Dict, Iterable, Iterator, KeysView, Mapping, Optional, Tuple
 
+import requests
 from attrs import field, mutable, validators
 
 from .auth import OAuth2
@@ -15,6 +16,7 @@ class CF:
     )
     oauth2: OAuth2 = field(default=None)
     client: ConfigClient = field(default=None)
+    session: Optional[requests.Session] = field(default=None, repr=False)
 
     def __attrs_post_init__(self) -> None:
         if not self.oauth2:
@@ -22,14 +24,17 @@ class CF:
                 access_token_uri=self.cfenv.configserver_access_token_uri(),
                 client_id=self.cfenv.configserver_client_id(),
                 client_secret=self.cfenv.configserver_client_secret(),
+                session=self.session,
             )
 
         if not self.client:
+            uris = self.cfenv.configserver_uris()
             self.client = ConfigClient(
-                address=self.cfenv.configserver_uri(),
+                address=",".join(uris) if uris else self.cfenv.configserver_uri(),
                 app_name=self.cfenv.application_name,
                 profile=self.cfenv.space_name.lower(),
                 oauth2=self.oauth2,
+                session=self.session,
             )
 
     @property
@@ -40,7 +45,7 @@ class CF:
     def vcap_application(self):
         return self.cfenv.vcap_application
 
-    def get_config(self, **kwargs) -> None:
+    def get_config(self, **kwargs) -> bool:
         """Request the configuration to the config server.
 
         Usage:
@@ -52,10 +57,12 @@ class CF:
         cf.get_config(verify=False)
 
         :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: False if the server reported no change since the last request.
         """
-        self.client.get_config(**kwargs)
+        return self.client.get_config(**kwargs)
 
-    async def get_config_async(self, **kwargs) -> None:
+    async def get_config_async(self, **kwargs) -> bool:
         """Request the configuration to the config server.
 
         Usage:
@@ -67,11 +74,13 @@ class CF:
         await cf.get_config_async(verify=False)
 
         :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: False if the server reported no change since the last request.
         """
-        await self.client.get_config_async(**kwargs)
+        return await self.client.get_config_async(**kwargs)
 
     @property
-    def config(self) -> Dict:
+    def config(self) -> Mapping:
         """Getter from configurations retrieved from ConfigClient."""
         return self.client.config
 
@@ -92,5 +101,36 @@ class CF:
         """
         return self.client.get(key, default)
 
+    def get_many(self, keys: Iterable[str], default: Any = "") -> Dict[str, Any]:
+        """Loads many configurations at once.
+
+        Usage:
+
+        cf.get_many(['spring.datasource.url', 'spring.datasource.username'])
+
+        :param keys: configuration keys.
+        :param default: value of the keys that do not exist. [default=''].
+        """
+        return self.client.get_many(keys, default)
+
+    def iter_prefix(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        """Iterates over the (key, value) leaves under a prefix, sorted by key.
+
+        :param prefix: dotted prefix, the whole config if empty. [default=''].
+        """
+        return self.client.iter_prefix(prefix)
+
+    def get_prefix(self, prefix: str, nested: bool = False) -> Mapping[str, Any]:
+        """Loads every configuration under a prefix.
+
+        Usage:
+
+        cf.get_prefix('spring.datasource')
+
+        :param prefix: dotted prefix.
+        :param nested: return the subtree instead of flat keys. [default=False].
+        """
+        return self.client.get_prefix(prefix, nested)
+
     def keys(self) -> KeysView:
         return self.client.keys()
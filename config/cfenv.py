@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Any
+from typing import Any, List
 
 from attrs import field, mutable, validators
 from glom import Path, glom
@@ -53,6 +53,13 @@ class CFenv:
         path = self._format_vcap_path(vcap_path)
         return glom(self.vcap_services, path, default=default)
 
+    def configserver_uris(self, vcap_path: str = "credentials.uri") -> List[str]:
+        """URIs of every config server binding."""
+        bindings = glom(self.vcap_services, Path(self.vcap_service_prefix), default=[])
+        return [
+            uri for uri in (glom(b, vcap_path, default="") for b in bindings) if uri
+        ]
+
     def configserver_access_token_uri(
         self, vcap_path: str = "0.credentials.access_token_uri", default: Any = ""
     ) -> Any:
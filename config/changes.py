@@ -0,0 +1,191 @@
+"""Key-level config diffs and listeners registered on key prefixes."""
+
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from attrs import field, frozen, mutable
+
+from .logger import logger
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+_MISSING = object()
+
+Listener = Callable[[List["ConfigChange"]], Any]
+
+
+@frozen
+class ConfigChange:
+    """A dotted key whose value changed between two versions of the config.
+
+    old is None for added keys and new is None for removed ones.
+    """
+
+    key: str
+    kind: str
+    old: Any = None
+    new: Any = None
+
+
+def diff(old: Any, new: Any, prefix: str = "") -> List[ConfigChange]:
+    """Changes from old to new config, one per leaf key.
+
+    Subtrees shared by both versions (the same object) are skipped without
+    being visited, which is what the snapshots of a refresh provide for the
+    parts that didn't change. A value replaced by one of another type
+    (e.g. a dict by a string) is reported once, on its own key.
+
+    Usage:
+
+    diff({'a': {'b': 1}}, {'a': {'b': 2}})
+    # [ConfigChange(key='a.b', kind='modified', old=1, new=2)]
+    """
+    changes: List[ConfigChange] = []
+    _diff(old, new, prefix, changes)
+    return changes
+
+
+def _diff(old: Any, new: Any, path: str, changes: List[ConfigChange]) -> None:
+    if old is new:
+        return
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        items: Iterator = _dict_pairs(old, new)
+    elif isinstance(old, list) and isinstance(new, list):
+        items = _list_pairs(old, new)
+    else:
+        if type(old) is not type(new) or old != new:
+            changes.append(ConfigChange(path, MODIFIED, old, new))
+        return
+    start = f"{path}." if path else ""
+    for key, before, after in items:
+        child = f"{start}{key}"
+        if before is _MISSING:
+            changes.append(ConfigChange(child, ADDED, None, after))
+        elif after is _MISSING:
+            changes.append(ConfigChange(child, REMOVED, before, None))
+        else:
+            _diff(before, after, child, changes)
+
+
+def _dict_pairs(old: Mapping, new: Mapping) -> Iterator:
+    for key, value in new.items():
+        yield key, old.get(key, _MISSING), value
+    for key, value in old.items():
+        if key not in new:
+            yield key, value, _MISSING
+
+
+def _list_pairs(old: list, new: list) -> Iterator:
+    for position in range(max(len(old), len(new))):
+        before = old[position] if position < len(old) else _MISSING
+        after = new[position] if position < len(new) else _MISSING
+        yield position, before, after
+
+
+class _Node:
+    __slots__ = ("children", "listeners")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.listeners: List[Listener] = []
+
+    def walk(self) -> Iterator["_Node"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+
+def _segments(prefix: str) -> List[str]:
+    prefix = prefix.strip()
+    if prefix.endswith("*"):
+        prefix = prefix[:-1]
+    prefix = prefix.strip(".")
+    return prefix.split(".") if prefix else []
+
+
+@mutable
+class ChangeListeners:
+    """Listeners indexed by key prefix in a trie.
+
+    A change is dispatched only to the listeners whose prefix is one of its
+    parents, or one of its children when a whole subtree was replaced. Each
+    listener is called once per refresh with its changes.
+
+    Usage:
+
+    listeners = ChangeListeners()
+    listeners.add('spring.datasource', rebuild_pool)
+    listeners.dispatch(diff(old_config, new_config))
+    """
+
+    _root: _Node = field(factory=_Node, init=False, repr=False)
+    _count: int = field(default=0, init=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False)
+
+    def add(self, prefix: str, listener: Listener) -> None:
+        """Call listener with the changes of keys under prefix ('' for every key)."""
+        with self._lock:
+            node = self._root
+            for segment in _segments(prefix):
+                node = node.children.setdefault(segment, _Node())
+            node.listeners.append(listener)
+            self._count += 1
+
+    def remove(self, prefix: str, listener: Listener) -> bool:
+        with self._lock:
+            node: Optional[_Node] = self._root
+            for segment in _segments(prefix):
+                node = node.children.get(segment) if node else None
+            if node is None or listener not in node.listeners:
+                return False
+            node.listeners.remove(listener)
+            self._count -= 1
+            return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def matching(
+        self, changes: List[ConfigChange]
+    ) -> Dict[Listener, List[ConfigChange]]:
+        """Changes grouped by the listeners they must be sent to."""
+        grouped: Dict[Listener, List[ConfigChange]] = {}
+        for change in changes:
+            targets: Dict[Listener, None] = {}
+            node: Optional[_Node] = self._root
+            nodes = [self._root]
+            for segment in change.key.split("."):
+                node = node.children.get(segment) if node else None
+                if node is None:
+                    break
+                nodes.append(node)
+            else:
+                nodes.extend(list(nodes.pop().walk()))
+            for matched in nodes:
+                targets.update(dict.fromkeys(matched.listeners))
+            for listener in targets:
+                grouped.setdefault(listener, []).append(change)
+        return grouped
+
+    def dispatch(self, changes: List[ConfigChange]) -> int:
+        """Call the affected listeners, errors are logged and never raised.
+
+        :return: number of listeners called.
+        """
+        if not changes or not self._count:
+            return 0
+        with self._lock:
+            grouped = self.matching(changes)
+        for listener, matched in grouped.items():
+            try:
+                listener(matched)
+            except Exception as err:
+                logger.error(
+                    f"Failed to notify config change: [listener='{listener}', error='{err}']"
+                )
+        return len(grouped)
@@ -0,0 +1,228 @@
+"""Bulk decryption of {cipher} property values."""
+
+import abc
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from attrs import field, frozen, mutable, validators
+
+from .logger import logger
+
+CIPHER_PREFIX = "{cipher}"
+_OFFSET = len(CIPHER_PREFIX)
+
+
+def is_cipher(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(CIPHER_PREFIX)
+
+
+def find_ciphers(sources: Iterable[dict]) -> Set[str]:
+    """Distinct ciphertexts, without the {cipher} prefix, found on flat property sources."""
+    return {
+        value[_OFFSET:]
+        for source in sources
+        for value in source.values()
+        if is_cipher(value)
+    }
+
+
+def decrypt_source(source: dict, plaintexts: Dict[str, str]) -> dict:
+    """Copy of source with {cipher} values replaced, the source itself without them."""
+    if not any(is_cipher(value) for value in source.values()):
+        return source
+    return {
+        key: plaintexts.get(value[_OFFSET:], value) if is_cipher(value) else value
+        for key, value in source.items()
+    }
+
+
+def decrypt_sources(sources: List[dict], plaintexts: Dict[str, str]) -> List[dict]:
+    """Copy of sources with {cipher} values replaced, sources without them are reused."""
+    return [decrypt_source(source, plaintexts) for source in sources]
+
+
+@mutable
+class DecryptCache:
+    """Thread safe LRU cache of plaintexts keyed by ciphertext.
+
+    :param maxsize: maximum number of entries. [default=1024].
+    :param ttl: seconds an entry is kept, None keeps it until evicted. [default=None].
+    """
+
+    maxsize: int = field(default=1024, validator=validators.instance_of(int))
+    ttl: Optional[float] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of((int, float))),
+    )
+    _entries: "OrderedDict[str, Tuple[str, float]]" = field(
+        factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, ciphertext: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(ciphertext)
+            if entry is None:
+                return None
+            if self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[ciphertext]
+                return None
+            self._entries.move_to_end(ciphertext)
+            return entry[0]
+
+    def put(self, ciphertext: str, plaintext: str) -> None:
+        with self._lock:
+            self._entries[ciphertext] = (plaintext, time.monotonic())
+            self._entries.move_to_end(ciphertext)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@frozen
+class DecryptStats:
+    """Decryption work done on the last refresh."""
+
+    values: int = 0
+    cached: int = 0
+    calls: int = 0
+    elapsed: float = 0.0
+
+
+@mutable
+class Decryptor(abc.ABC):
+    """Decrypt many ciphertexts at once, skipping the ones already cached.
+
+    Subclasses implement _decrypt, like RemoteDecryptor and LocalDecryptor.
+    """
+
+    cache: DecryptCache = field(
+        factory=DecryptCache, validator=validators.instance_of(DecryptCache)
+    )
+    stats: DecryptStats = field(factory=DecryptStats, init=False)
+
+    def decrypt_all(
+        self, ciphertexts: Iterable[str], client: Any, **kwargs
+    ) -> Dict[str, str]:
+        """Plaintext of every ciphertext, keyed by ciphertext."""
+        start = time.perf_counter()
+        plaintexts, missing = self._lookup(ciphertexts)
+        if missing:
+            plaintexts.update(
+                self._store(missing, self._decrypt(missing, client, kwargs))
+            )
+        self._report(plaintexts, missing, start)
+        return plaintexts
+
+    async def decrypt_all_async(
+        self, ciphertexts: Iterable[str], client: Any, **kwargs
+    ) -> Dict[str, str]:
+        """Plaintext of every ciphertext, keyed by ciphertext."""
+        start = time.perf_counter()
+        plaintexts, missing = self._lookup(ciphertexts)
+        if missing:
+            plaintexts.update(
+                self._store(missing, await self._decrypt_async(missing, client, kwargs))
+            )
+        self._report(plaintexts, missing, start)
+        return plaintexts
+
+    @abc.abstractmethod
+    def _decrypt(self, ciphertexts: List[str], client: Any, kwargs: dict) -> List[str]:
+        """Plaintexts of ciphertexts, in the same order."""
+
+    async def _decrypt_async(
+        self, ciphertexts: List[str], client: Any, kwargs: dict
+    ) -> List[str]:
+        return self._decrypt(ciphertexts, client, kwargs)
+
+    def _lookup(self, ciphertexts: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+        plaintexts: Dict[str, str] = {}
+        missing: List[str] = []
+        for ciphertext in dict.fromkeys(ciphertexts):
+            plaintext = self.cache.get(ciphertext)
+            if plaintext is None:
+                missing.append(ciphertext)
+            else:
+                plaintexts[ciphertext] = plaintext
+        return plaintexts, missing
+
+    def _store(
+        self, ciphertexts: List[str], plaintexts: Iterable[str]
+    ) -> Dict[str, str]:
+        decrypted = dict(zip(ciphertexts, plaintexts))
+        for ciphertext, plaintext in decrypted.items():
+            self.cache.put(ciphertext, plaintext)
+        return decrypted
+
+    def _report(
+        self, plaintexts: Dict[str, str], missing: List[str], start: float
+    ) -> None:
+        self.stats = DecryptStats(
+            values=len(plaintexts),
+            cached=len(plaintexts) - len(missing),
+            calls=len(missing),
+            elapsed=time.perf_counter() - start,
+        )
+        logger.debug(
+            f"Values decrypted: [values='{self.stats.values}', calls='{self.stats.calls}', "
+            f"elapsed='{self.stats.elapsed:.3f}s']"
+        )
+
+
+@mutable
+class RemoteDecryptor(Decryptor):
+    """Decrypt {cipher} values through the config server, concurrently.
+
+    Identical ciphertexts are decrypted once and cached, so unchanged secrets
+    are not sent to the server again on refresh.
+
+    Usage:
+
+    client = ConfigClient(app_name='foo', decryptor=RemoteDecryptor(max_workers=16))
+    client.get_config()
+    client.decryptor.stats
+
+    :param cache: DecryptCache with the plaintexts already known.
+    :param max_workers: maximum number of concurrent decrypt requests. [default=8].
+    :param path: base URL to decrypt. [default=/decrypt].
+    """
+
+    max_workers: int = field(default=8, validator=validators.instance_of(int))
+    path: str = field(default="/decrypt", validator=validators.instance_of(str))
+
+    def _decrypt(self, ciphertexts: List[str], client: Any, kwargs: dict) -> List[str]:
+        if len(ciphertexts) == 1:
+            return [client.decrypt(ciphertexts[0], path=self.path, **kwargs)]
+        workers = min(self.max_workers, len(ciphertexts))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="config-client-decrypt"
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda value: client.decrypt(value, path=self.path, **kwargs),
+                    ciphertexts,
+                )
+            )
+
+    async def _decrypt_async(
+        self, ciphertexts: List[str], client: Any, kwargs: dict
+    ) -> List[str]:
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def decrypt(value: str) -> str:
+            async with semaphore:
+                plaintext: str = await client.decrypt(value, path=self.path, **kwargs)
+                return plaintext
+
+        return list(await asyncio.gather(*(decrypt(c) for c in ciphertexts)))
@@ -15,7 +15,7 @@ from rich.table import Table
 from trogon import tui
 
 from config import __version__
-from config.exceptions import RequestFailedException
+from config.exceptions import DecryptException, RequestFailedException
 from config.spring import ConfigClient
 
 CONTEXT_SETTINGS = dict(
@@ -231,24 +231,49 @@ def _display_result(content, filter_key):
 @click.option(
     "-p", "--path", required=True, default="/decrypt", help="Decrypt path endpoint."
 )
-def decrypt(text, address, path):
+@click.option(
+    "-k", "--key", required=False, help="Symmetric key to decrypt locally (offline)."
+)
+@click.option(
+    "--salt", default="deadbeef", show_default=True, help="Salt used with --key."
+)
+def decrypt(text, address, path, key, salt):
     """Decrypt a input via Spring Cloud Config."""
+    if key:
+        resp = _decrypt_locally(text, key, salt)
+    else:
+        resp = _decrypt_remotely(text, address, path)
+
+    table = Table.grid(padding=(0, 1))
+    table.add_column(style="cyan", justify="right")
+    table.add_column(style="magenta")
+
+    table.add_row("decrypted data[yellow]:[/yellow] ", f"'{resp}'")
+    console.print(Panel(table, border_style="yellow", expand=True))
+
+
+def _decrypt_remotely(text, address, path):
     client = ConfigClient(address=address, fail_fast=False)
     cipher = re.match(r"^.?{cipher}?(?P<name>\w.*)", text)
     if cipher:
         text = cipher.group("name")
 
     try:
-        resp = client.decrypt(text, path=path)
+        return client.decrypt(text, path=path)
     except Exception:
         raise click.ClickException("💥 Failed to contact server!")
 
-    table = Table.grid(padding=(0, 1))
-    table.add_column(style="cyan", justify="right")
-    table.add_column(style="magenta")
 
-    table.add_row("decrypted data[yellow]:[/yellow] ", f"'{resp}'")
-    console.print(Panel(table, border_style="yellow", expand=True))
+def _decrypt_locally(text, key, salt):
+    try:
+        from config.crypto import LocalDecryptor
+    except ImportError:
+        raise click.ClickException("💥 cryptography is required to decrypt locally!")
+
+    try:
+        return LocalDecryptor(key=key, salt=salt).decrypt(text)
+    except (DecryptException, ValueError):
+        raise click.ClickException("💥 Failed to decrypt value!")
 
 
 @cli.command()
@@ -0,0 +1,202 @@
+"""Compact, hash-consed config trees for very large configs."""
+
+import sys
+import threading
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .snapshot import FrozenDict, FrozenList
+
+_MISSING = object()
+
+
+class CompactNode(FrozenDict):
+    """Read-only dict of a compact tree, one instance for every equal subtree."""
+
+    __slots__ = ("__weakref__",)
+
+    # canonical nodes are compared by identity while building
+    __hash__ = object.__hash__  # type: ignore
+
+
+class CompactList(FrozenList):
+    """Read-only list of a compact tree."""
+
+    __slots__ = ("__weakref__",)
+    __hash__ = object.__hash__  # type: ignore
+
+
+class CompactConfig(CompactNode):
+    """Root of a compact config, with the server version like ConfigSnapshot.
+
+    There is no flat index: dotted keys are resolved by walking the tree,
+    one lookup per segment.
+
+    Usage:
+
+    config = CompactConfig.build({'spring': {'cloud': {'port': 8500}}}, version='v1')
+    config.index.get('spring.cloud.port')
+    """
+
+    __slots__ = ("version", "revision", "_index")
+
+    def __init__(
+        self,
+        data: Any = (),
+        version: Optional[str] = None,
+        revision: int = 0,
+    ) -> None:
+        super().__init__(data)
+        self.version = version
+        self.revision = revision
+        self._index: Optional[PathIndex] = None
+        with _roots_lock:
+            _roots.add(self)
+
+    def __reduce__(self):
+        return type(self), (dict(self), self.version, self.revision)
+
+    @classmethod
+    def build(
+        cls,
+        config: dict,
+        previous: Any = None,
+        version: Optional[str] = None,
+    ) -> "CompactConfig":
+        """Compact copy of config, the revision follows previous."""
+        with _roots_lock:
+            roots = list(_roots)
+        builder = _Builder(roots)
+        keys = tuple(_key(key) for key in config)
+        values = tuple(builder.value(value) for value in config.values())
+        revision = getattr(previous, "revision", 0) + 1
+        return cls(zip(keys, values), version, revision)
+
+    @property
+    def index(self) -> "PathIndex":
+        if self._index is None:
+            self._index = PathIndex(self)
+        return self._index
+
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(version={self.version!r}, "
+            f"revision={self.revision}, {dict.__repr__(self)})"
+        )
+
+
+class PathIndex(Mapping):
+    """Dotted path view of a compact tree, walked on each lookup."""
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: Mapping) -> None:
+        self.root = root
+
+    def get(self, key: str, default: Any = None) -> Any:
+        node: Any = self.root
+        for segment in key.split("."):
+            if isinstance(node, Mapping):
+                node = node.get(segment, _MISSING)
+            elif isinstance(node, list) and segment.isdecimal():
+                position = int(segment)
+                node = node[position] if position < len(node) else _MISSING
+            else:
+                return default
+            if node is _MISSING:
+                return default
+        return node
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Every dotted path, subtrees included, like build_index."""
+        stack: List[Tuple[str, Any]] = [("", self.root)]
+        while stack:
+            prefix, node = stack.pop()
+            items = node.items() if isinstance(node, Mapping) else enumerate(node)
+            for key, value in items:
+                if isinstance(key, str) and "." in key:
+                    continue
+                path = f"{prefix}{key}"
+                yield path
+                if value and isinstance(value, (Mapping, list)):
+                    stack.append((f"{path}.", value))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+# compact configs alive in the process, one per profile or per kept version:
+# a build reuses their nodes, so equal subtrees are shared between them
+_roots: "weakref.WeakSet[CompactConfig]" = weakref.WeakSet()
+_roots_lock = threading.Lock()
+
+
+def _key(key: Any) -> Any:
+    return sys.intern(key) if type(key) is str else key
+
+
+def _signature(keys: Optional[Tuple], values: Tuple) -> Tuple:
+    # types keep 1, 1.0 and True apart
+    return keys, values, tuple(map(type, values))
+
+
+class _Builder:
+    """Hash-consing of one build: equal subtrees become the same node.
+
+    The table lives as long as the build, it's seeded with the nodes of the
+    compact configs still alive instead of keeping every node of the process.
+    """
+
+    __slots__ = ("_nodes",)
+
+    def __init__(self, roots: Iterable[Mapping]) -> None:
+        self._nodes: Dict[Tuple, Any] = {}
+        for root in roots:
+            for value in root.values():
+                self._register(value)
+
+    def _register(self, node: Any) -> None:
+        if isinstance(node, CompactNode):
+            keys: Optional[Tuple] = tuple(node)
+            values = tuple(node.values())
+        elif isinstance(node, CompactList):
+            keys, values = None, tuple(node)
+        else:
+            return
+        signature = _signature(keys, values)
+        if signature not in self._nodes:
+            # the children of a registered node are registered too
+            for value in values:
+                self._register(value)
+            self._nodes.setdefault(signature, node)
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            keys = tuple(_key(key) for key in value)
+            values = tuple(self.value(item) for item in value.values())
+            return self._canonical(keys, values)
+        if isinstance(value, list):
+            return self._canonical(None, tuple(self.value(item) for item in value))
+        if type(value) is str:
+            return sys.intern(value)
+        return value
+
+    def _canonical(self, keys: Optional[Tuple], values: Tuple) -> Any:
+        signature = _signature(keys, values)
+        node = self._nodes.get(signature)
+        if node is None:
+            if keys is None:
+                node = CompactList(values)
+            else:
+                node = CompactNode(zip(keys, values))
+            self._nodes[signature] = node
+        return node
@@ -0,0 +1,158 @@
+"""Decrypt {cipher} values in-process, compatible with Spring Cloud Config encryption."""
+
+import os
+import re
+from base64 import b64decode
+from binascii import Error as BinasciiError
+from binascii import unhexlify
+from typing import Any, List, Optional
+
+from attrs import field, mutable, validators
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.asymmetric import padding as rsa_padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, pkcs12
+
+from .cipher import CIPHER_PREFIX, Decryptor
+from .exceptions import DecryptException
+
+DEFAULT_SALT = "deadbeef"
+RSA_ALGORITHMS = ("DEFAULT", "OAEP")
+
+_IV_SIZE = 16
+_ITERATIONS = 1024
+_PREFIXES = re.compile(r"^(\{[^{}:]+:[^{}]*\})+")
+
+
+def derive_key(password: str, salt: str = DEFAULT_SALT) -> bytes:
+    """AES-256 key derived as Spring Security's AesBytesEncryptor does (PBKDF2WithHmacSHA1)."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA1(),  # nosec B303 - required by the Spring format
+        length=32,
+        salt=unhexlify(salt),
+        iterations=_ITERATIONS,
+    )
+    return kdf.derive(password.encode())
+
+
+def aes_decrypt(key: bytes, data: bytes, gcm: bool = False) -> bytes:
+    """Decrypt iv + ciphertext written by Encryptors.standard (CBC) or Encryptors.stronger (GCM)."""
+    iv, body = data[:_IV_SIZE], data[_IV_SIZE:]
+    if gcm:
+        return AESGCM(key).decrypt(iv, body, None)
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    padded = decryptor.update(body) + decryptor.finalize()
+    return unpadder.update(padded) + unpadder.finalize()
+
+
+def strip_prefixes(value: str) -> str:
+    """Remove {cipher} and the {key:name}/{secret:...} prefixes of a value."""
+    if value.startswith(CIPHER_PREFIX):
+        value = value.replace(CIPHER_PREFIX, "", 1)
+    return _PREFIXES.sub("", value)
+
+
+def _rsa_key(key: Any) -> RSAPrivateKey:
+    if not isinstance(key, RSAPrivateKey):
+        raise ValueError("an RSA private key is required")
+    return key
+
+
+@mutable
+class LocalDecryptor(Decryptor):
+    """Decrypt {cipher} values locally, without requests to the config server.
+
+    With a symmetric key it reproduces the config server `encrypt.key`
+    encryptor: AES-256/CBC keyed by PBKDF2WithHmacSHA1 and hex encoded.
+    With an RSA private key it reproduces `encrypt.key-store`: base64 of a
+    RSA encrypted random secret followed by the value encrypted with AES.
+
+    Usage:
+
+    # Example 1:
+    client = ConfigClient(app_name='foo', decryptor=LocalDecryptor(key='my-key'))
+
+    # Example 2:
+    decryptor = LocalDecryptor.from_keystore('server.p12', 'changeme')
+    decryptor.decrypt('{cipher}AQBv...')
+
+    :param key: symmetric key, same as encrypt.key on the server. [default=ENCRYPT_KEY].
+    :param salt: hex encoded salt, same as encrypt.salt on the server. [default=deadbeef].
+    :param rsa_key: RSA private key, same as the key of encrypt.key-store.
+    :param rsa_algorithm: DEFAULT or OAEP, same as encrypt.rsa.algorithm. [default=DEFAULT].
+    :param strong: use AES/GCM after RSA, same as encrypt.rsa.strong. [default=False].
+    :param cache: DecryptCache with the plaintexts already known.
+    """
+
+    key: Optional[str] = field(
+        default=os.getenv("ENCRYPT_KEY"),
+        validator=validators.optional(validators.instance_of(str)),
+        repr=False,
+    )
+    salt: str = field(default=DEFAULT_SALT, validator=validators.instance_of(str))
+    rsa_key: Optional[RSAPrivateKey] = field(
+        default=None,
+        validator=validators.optional(
+            validators.instance_of(RSAPrivateKey)  # type: ignore
+        ),
+        repr=False,
+    )
+    rsa_algorithm: str = field(
+        default="DEFAULT", validator=validators.in_(RSA_ALGORITHMS)
+    )
+    strong: bool = field(default=False, validator=validators.instance_of(bool))
+    _secret: Optional[bytes] = field(default=None, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.rsa_key is None and not self.key:
+            raise ValueError("key or rsa_key is required")
+        if self.rsa_key is None:
+            self._secret = derive_key(self.key, self.salt)  # type: ignore
+
+    @classmethod
+    def from_pem(
+        cls, data: bytes, password: Optional[bytes] = None, **kwargs
+    ) -> "LocalDecryptor":
+        """Create from a PEM encoded RSA private key."""
+        return cls(rsa_key=_rsa_key(load_pem_private_key(data, password)), **kwargs)
+
+    @classmethod
+    def from_keystore(cls, path: str, password: str, **kwargs) -> "LocalDecryptor":
+        """Create from the private key of a PKCS12 keystore."""
+        with open(path, "rb") as f:
+            key, _, _ = pkcs12.load_key_and_certificates(f.read(), password.encode())
+        return cls(rsa_key=_rsa_key(key), **kwargs)
+
+    def decrypt(self, value: str) -> str:
+        """Decrypt one value, with or without the {cipher} prefix."""
+        value = strip_prefixes(value)
+        try:
+            if self.rsa_key is None:
+                data = aes_decrypt(self._secret, unhexlify(value))  # type: ignore
+            else:
+                data = self._rsa_decrypt(b64decode(value, validate=True))
+            return data.decode()
+        except (BinasciiError, InvalidTag, ValueError) as err:
+            raise DecryptException(f"Failed to decrypt value: [error='{err}']")
+
+    def _rsa_decrypt(self, data: bytes) -> bytes:
+        end = 2 + int.from_bytes(data[:2], "big")
+        secret = data[2:end]
+        if self.rsa_algorithm == "OAEP":
+            scheme: Any = rsa_padding.OAEP(
+                mgf=rsa_padding.MGF1(hashes.SHA1()),  # nosec B303
+                algorithm=hashes.SHA1(),  # nosec B303
+                label=None,
+            )
+        else:
+            scheme = rsa_padding.PKCS1v15()
+        password = self.rsa_key.decrypt(secret, scheme).hex()  # type: ignore
+        return aes_decrypt(derive_key(password, self.salt), data[end:], gcm=self.strong)
+
+    def _decrypt(self, ciphertexts: List[str], client: Any, kwargs: dict) -> List[str]:
+        return [self.decrypt(value) for value in ciphertexts]
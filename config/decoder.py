@@ -0,0 +1,238 @@
+"""JSON decoding of server responses, whole or one property source at a time."""
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+Decoder = Callable[[bytes], Any]
+
+# orjson and ujson are faster but turn integers beyond 64 bits into floats,
+# they are only used when set as json_decoder
+loads: Decoder = json.loads
+
+CHUNK_SIZE = 64 * 1024
+SOURCES = "propertySources"
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# strings and anything else but brackets, up to the next bracket
+_CONTENT = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_LITERAL = re.compile(rb"[^ \t\n\r,\]}]+")
+_OPEN = frozenset(b"{[")
+
+
+class EnvironmentParser:
+    """Push parser of an environment that returns each property source once it's complete.
+
+    The other fields are decoded into environment as they arrive, only the
+    bytes of the value being parsed are kept, so the whole body is never
+    held in memory.
+
+    Usage:
+
+    parser = EnvironmentParser()
+    for chunk in response.iter_content(CHUNK_SIZE):
+        for source in parser.feed(chunk):
+            ...
+    environment = parser.close()
+    """
+
+    def __init__(self, decoder: Decoder = loads) -> None:
+        self.decoder = decoder
+        self.environment: Dict[str, Any] = {}
+        self.has_sources = False
+        self._buffer = bytearray()
+        self._pos = 0
+        self._state = "start"
+        self._key = ""
+        # value being scanned: start, position to resume from and depth
+        self._start = -1
+        self._resume = 0
+        self._depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self._state == "end"
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        """Parse chunk and return the property sources it completed, in order."""
+        self._buffer += chunk
+        sources: List[dict] = []
+        while self._step(sources):
+            pass
+        self._discard()
+        return sources
+
+    def close(self) -> Dict[str, Any]:
+        """Environment fields, raises ValueError if the body is incomplete."""
+        end = self._skip()
+        if self._state != "end" or end < len(self._buffer):
+            raise ValueError(f"Incomplete environment: [state='{self._state}']")
+        return self.environment
+
+    def _skip(self) -> int:
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+        return self._pos
+
+    def _expect(self, chars: bytes) -> Optional[int]:
+        pos = self._skip()
+        if pos == len(self._buffer):
+            return None
+        char = self._buffer[pos]
+        if char not in chars:
+            raise ValueError(f"Unexpected character: [char='{chr(char)}', pos={pos}]")
+        return char
+
+    def _step(self, sources: List[dict]) -> bool:
+        state = self._state
+        if state == "start":
+            if self._expect(b"{") is None:
+                return False
+            self._pos += 1
+            self._state = "key"
+        elif state == "key":
+            char = self._expect(b'",}')
+            if char is None:
+                return False
+            if char != ord('"'):
+                self._pos += 1
+                self._state = "end" if char == ord("}") else "key"
+                return True
+            match = _STRING.match(self._buffer, self._pos)
+            if match is None:
+                return False
+            self._key = self.decoder(bytes(match.group()))
+            self._pos = match.end()
+            self._state = "colon"
+        elif state == "colon":
+            if self._expect(b":") is None:
+                return False
+            self._pos += 1
+            self.has_sources = self.has_sources or self._key == SOURCES
+            self._state = "sources" if self._key == SOURCES else "value"
+        elif state == "value":
+            if self._expect(b'"{[-0123456789tfn') is None:
+                return False
+            self._begin()
+            self._state = "field"
+        elif state == "field":
+            end = self._scan()
+            if end is None:
+                return False
+            self.environment[self._key] = self._value(end)
+            self._state = "key"
+        elif state == "sources":
+            if self._expect(b"[") is None:
+                return False
+            self._pos += 1
+            self._state = "source"
+        elif state == "source":
+            char = self._expect(b",]{")
+            if char is None:
+                return False
+            if char == ord("{"):
+                self._begin()
+                self._state = "element"
+            else:
+                self._pos += 1
+                if char == ord("]"):
+                    self._state = "key"
+        elif state == "element":
+            end = self._scan()
+            if end is None:
+                return False
+            sources.append(self._value(end))
+            self._state = "source"
+        else:
+            return False
+        return True
+
+    def _begin(self) -> None:
+        self._start = self._resume = self._pos
+        self._depth = 0
+
+    def _value(self, end: int) -> Any:
+        start = self._start
+        value = self.decoder(bytes(self._buffer[start:end]))
+        self._pos = end
+        self._start = -1
+        return value
+
+    def _scan(self) -> Optional[int]:
+        """End of the value at _start, None until its last byte was fed."""
+        buffer = self._buffer
+        first = buffer[self._start]
+        if first == ord('"'):
+            string = _STRING.match(buffer, self._start)
+            return None if string is None else string.end()
+        if first not in _OPEN:
+            return self._literal()
+        pos, depth = self._resume, self._depth
+        while True:
+            pos = _CONTENT.match(buffer, pos).end()  # type: ignore
+            if pos == len(buffer) or buffer[pos] == ord('"'):
+                # the next string isn't complete yet
+                self._resume, self._depth = pos, depth
+                return None
+            depth += 1 if buffer[pos] in _OPEN else -1
+            pos += 1
+            if depth == 0:
+                return pos
+
+    def _literal(self) -> Optional[int]:
+        # a number is complete once the byte after it arrived
+        match = _LITERAL.match(self._buffer, self._start)
+        if match is None or match.end() == len(self._buffer):
+            return None
+        return match.end()
+
+    def _discard(self) -> None:
+        """Drop the bytes already parsed."""
+        offset = self._pos if self._start < 0 else self._start
+        if offset:
+            del self._buffer[:offset]
+            self._pos -= offset
+            if self._start >= 0:
+                self._start -= offset
+                self._resume -= offset
+
+
+def stream_environment(
+    chunks: Iterable[bytes], decoder: Decoder = loads
+) -> Dict[str, Any]:
+    """Environment whose property sources are parsed while they are iterated.
+
+    The fields before propertySources, like version and state on Spring
+    Cloud Config, are read right away and the ones after it are added once
+    the sources were consumed.
+
+    Usage:
+
+    environment = stream_environment(response.iter_content(CHUNK_SIZE))
+    for source in environment['propertySources']:
+        ...
+
+    :param chunks: bytes of the response body.
+    :param decoder: JSON decoder of each value. [default=loads].
+    """
+    parser = EnvironmentParser(decoder)
+    iterator = iter(chunks)
+    sources: List[dict] = []
+    for chunk in iterator:
+        sources = parser.feed(chunk)
+        if parser.has_sources or parser.done:
+            break
+    if parser.has_sources:
+        parser.environment[SOURCES] = _sources(parser, sources, iterator)
+    else:
+        parser.close()
+    return parser.environment
+
+
+def _sources(
+    parser: EnvironmentParser, sources: List[dict], chunks: Iterator[bytes]
+) -> Iterator[dict]:
+    yield from sources
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
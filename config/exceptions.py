@@ -8,3 +8,8 @@ class RequestFailedException(Exception):
         self, url: str, message: str = "Failed to perform request: [URL='{url}']"
     ) -> None:
         super().__init__(message.format(url=url))
+
+
+class DecryptException(Exception):
+    def __init__(self, message: str = "Failed to decrypt value") -> None:
+        super().__init__(message)
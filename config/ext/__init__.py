@@ -10,7 +10,12 @@ except ImportError:
 
 
 try:
-    from config.ext.fastapi import fastapi_cloud_foundry, fastapi_config_client
+    from config.ext.fastapi import (
+        config_lifespan,
+        fastapi_cloud_foundry,
+        fastapi_config,
+        fastapi_config_client,
+    )
 except ImportError:
     fastapi = None
 
@@ -20,4 +25,6 @@ __all__ = [
     "FlaskConfig",
     "fastapi_config_client,",
     "fastapi_cloud_foundry",
+    "fastapi_config",
+    "config_lifespan",
 ]
@@ -1,10 +1,16 @@
-from typing import Any, Optional
+import inspect
+from typing import Any, AsyncIterator, Mapping, Optional
 
+import aiohttp
 from aiohttp import web
-from glom import glom
+from attrs import field, mutable
 
+from config import http
+from config.aio import AsyncConfigClient
 from config.logger import logger
-from config.spring import ConfigClient
+from config.monitor import AsyncRefreshReceiver
+from config.refresh import AsyncRefreshScheduler, _get_config
+from config.spring import ConfigClient, _index, _lookup
 
 
 class AioHttpConfig:
@@ -41,15 +47,144 @@ class AioHttpConfig:
         client.get_config(**kwargs)
         app[str(key)] = _Config(client.config)
 
-    def _validate_app(self, app: web.Application) -> None:
+    @classmethod
+    def setup(
+        cls,
+        app: web.Application,
+        key: str = "config",
+        client: Any = None,
+        interval: Optional[float] = None,
+        jitter: float = 0.1,
+        monitor: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """Load the config on startup of the application, without blocking the loop.
+
+        A cleanup context owns the HTTP session used by the client and the
+        refresh task, both closed on cleanup.
+
+        Usage:
+
+        from config.aio import AsyncConfigClient
+        from config.ext import AioHttpConfig
+        from aiohttp import web
+
+
+        app = web.Application()
+        AioHttpConfig.setup(app, client=AsyncConfigClient(app_name='foo'), interval=60)
+
+        web.run_app(app)
+
+
+        :param app: AIOHTTP web.Application.
+        :param key: key prefix to access config.
+        :param client: AsyncConfigClient, ConfigClient or CF. [default=AsyncConfigClient()].
+        :param interval: seconds between background refreshes, None to disable them. [default=None].
+        :param jitter: random spread applied to interval, as a fraction of it. [default=0.1].
+        :param monitor: path receiving the refresh events of Spring Cloud Bus or /monitor, None to disable it. [default=None].
+        :param kwargs: keyword arguments used on every get_config call.
+        """
+        cls._validate_app(app)
+        if not client:
+            client = AsyncConfigClient()
+        if not isinstance(client, AsyncConfigClient):
+            cls._validate_client(client)
+        context = _Context(client, str(key), interval, jitter, kwargs, monitor)
+        app.cleanup_ctx.append(context.cleanup_ctx)
+        app.on_startup.append(context.startup)
+        if monitor is not None:
+            app.router.add_post(monitor, context.refresh_events)
+
+    @staticmethod
+    def _validate_app(app: web.Application) -> None:
         if not isinstance(app, web.Application):
             raise TypeError("instance must be <aiohttp.web.Application>")
 
-    def _validate_client(self, client) -> None:
+    @staticmethod
+    def _validate_client(client) -> None:
         if client.__class__.__name__ not in ("ConfigClient", "CF"):
             raise TypeError("instance must be <ConfigClient> or <CF>")
 
 
+@mutable
+class _Context:
+    client: Any
+    key: str
+    interval: Optional[float]
+    jitter: float
+    kwargs: dict
+    monitor: Optional[str] = None
+    _scheduler: Optional[AsyncRefreshScheduler] = field(default=None, init=False)
+    _receiver: Optional[AsyncRefreshReceiver] = field(default=None, init=False)
+
+    async def cleanup_ctx(self, app: web.Application) -> AsyncIterator[None]:
+        # runs before the on_startup hooks, and its cleanup after the requests
+        client = getattr(self.client, "client", self.client)  # CF
+        session: Any = None
+        if client.session is None:
+            if isinstance(client, AsyncConfigClient):
+                session = client.session = aiohttp.ClientSession()
+            else:
+                session = client.session = http.create_session()
+        try:
+            yield
+        finally:
+            if self._scheduler is not None:
+                await self._scheduler.stop()
+                self._scheduler = None
+            if self._receiver is not None:
+                await self._receiver.stop()
+                self._receiver = None
+            if session is not None:
+                client.session = None
+                closed = session.close()
+                if inspect.isawaitable(closed):
+                    await closed
+
+    async def startup(self, app: web.Application) -> None:
+        await _get_config(self.client, **self.kwargs)
+        config = app[self.key] = _Config(self.client.config)
+        logger.debug(f"AioHttpConfig config loaded: [key='{self.key}']")
+
+        def publish() -> None:
+            config._publish(self.client.config)
+
+        if self.interval is not None:
+            self._scheduler = AsyncRefreshScheduler(
+                self.client,
+                interval=self.interval,
+                jitter=self.jitter,
+                kwargs=self.kwargs,
+                on_refresh=publish,
+            )
+            self._scheduler.start()
+        if self.monitor is not None:
+            self._receiver = AsyncRefreshReceiver(
+                self.client, kwargs=self.kwargs, on_refresh=publish
+            )
+
+    async def refresh_events(self, request: web.Request) -> web.Response:
+        if self._receiver is None:
+            raise web.HTTPServiceUnavailable(text="config not loaded")
+        try:
+            refresh = self._receiver.receive(await request.read(), request.content_type)
+        except ValueError:
+            raise web.HTTPBadRequest(text="invalid refresh event")
+        return web.json_response({"refresh": refresh})
+
+
 class _Config(dict):
+    """Config stored on the application, dotted keys read from a flat index."""
+
+    def __init__(self, config: Mapping) -> None:
+        super().__init__()
+        self._publish(config)
+
+    def _publish(self, config: Mapping) -> None:
+        # a single step of the event loop, handlers never see a partial update
+        self._index = _index(config)
+        self.clear()
+        self.update(config)
+
     def get(self, key, default: Any = None) -> Any:
-        return glom(self, key, default=default)
+        return _lookup(self, self._index, key, default)
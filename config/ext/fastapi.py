@@ -1,7 +1,31 @@
-from fastapi import Request
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Mapping, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from config import CF, ConfigClient
 from config.logger import logger
+from config.monitor import AsyncRefreshReceiver
+from config.refresh import AsyncRefreshScheduler, _get_config
+from config.singleflight import AsyncSingleFlight
+
+# the first requests after boot share one initialization per app
+_flight = AsyncSingleFlight()
+
+
+async def _initialize(app: Any, factory: Callable[[], Any]) -> None:
+    try:
+        app.config_client
+        return
+    except AttributeError:
+        pass
+    logger.debug("Initializing ConfigClient")
+    cc = factory()
+    await cc.get_config_async()
+    app.config_client = cc
+    logger.debug("ConfigClient successfully initialized")
 
 
 async def fastapi_config_client(request: Request):
@@ -26,11 +50,7 @@ async def fastapi_config_client(request: Request):
         request.app.config_client
         logger.debug("ConfigClient already initialized")
     except AttributeError:
-        logger.debug("Initializing ConfigClient")
-        cc = ConfigClient()
-        await cc.get_config_async()
-        request.app.config_client = cc
-        logger.debug("ConfigClient successfully initialized")
+        await _flight.do(id(request.app), _initialize, request.app, ConfigClient)
 
 
 async def fastapi_cloud_foundry(request: Request):
@@ -55,8 +75,110 @@ async def fastapi_cloud_foundry(request: Request):
         request.app.config_client
         logger.debug("ConfigClient already initialized")
     except AttributeError:
-        logger.debug("Initializing ConfigClient")
-        cc = CF()
-        await cc.get_config_async()
-        request.app.config_client = cc
+        await _flight.do(id(request.app), _initialize, request.app, CF)
+
+
+def config_lifespan(
+    client: Any = None,
+    interval: Optional[float] = None,
+    jitter: float = 0.1,
+    monitor: Optional[str] = None,
+    **kwargs,
+) -> Callable[[FastAPI], AsyncContextManager[None]]:
+    """Lifespan that loads the config before the application accepts requests.
+
+    The client is stored on app.state.config_client and its read-only
+    config on app.state.config, replaced after each refresh that changed it.
+
+    Usage:
+
+    from fastapi import Depends, FastAPI
+    from config.aio import AsyncConfigClient
+    from config.ext.fastapi import config_lifespan, fastapi_config
+
+
+    app = FastAPI(lifespan=config_lifespan(AsyncConfigClient(app_name='foo'), interval=60))
+
+    @app.get("/info")
+    async def info(config = Depends(fastapi_config)):
+        return config["info"]
+
+    :param client: AsyncConfigClient, ConfigClient or CF. [default=AsyncConfigClient()].
+    :param interval: seconds between background refreshes, None to disable them. [default=None].
+    :param jitter: random spread applied to interval, as a fraction of it. [default=0.1].
+    :param monitor: path receiving the refresh events of Spring Cloud Bus or /monitor, None to disable it. [default=None].
+    :param kwargs: keyword arguments used on every get_config call.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        cc = client if client is not None else _default_client()
+        await _get_config(cc, **kwargs)
+        app.state.config_client = cc
+        # keeps fastapi_config_client from fetching again
+        app.config_client = cc  # type: ignore
+        app.state.config = cc.config
         logger.debug("ConfigClient successfully initialized")
+
+        def publish() -> None:
+            app.state.config = cc.config
+
+        scheduler = receiver = None
+        if interval is not None:
+            scheduler = AsyncRefreshScheduler(
+                cc,
+                interval=interval,
+                jitter=jitter,
+                kwargs=kwargs,
+                on_refresh=publish,
+            )
+            scheduler.start()
+        if monitor is not None:
+            receiver = app.state.config_receiver = AsyncRefreshReceiver(
+                cc, kwargs=kwargs, on_refresh=publish
+            )
+            if not any(getattr(r, "path", None) == monitor for r in app.routes):
+                app.add_api_route(
+                    monitor,
+                    _refresh_events,
+                    methods=["POST"],
+                    include_in_schema=False,
+                )
+        try:
+            yield
+        finally:
+            if scheduler is not None:
+                await scheduler.stop()
+            if receiver is not None:
+                await receiver.stop()
+            if inspect.iscoroutinefunction(getattr(cc, "close", None)):
+                await cc.close()
+
+    return lifespan
+
+
+async def fastapi_config(request: Request) -> Mapping:
+    """Config loaded by config_lifespan, a single attribute read per request.
+
+    Declared async so FastAPI calls it on the event loop, not on a thread.
+    """
+    return request.app.state.config  # type: ignore
+
+
+async def _refresh_events(request: Request) -> Any:
+    try:
+        refresh = request.app.state.config_receiver.receive(
+            await request.body(),
+            request.headers.get("content-type", "application/json"),
+        )
+    except ValueError:
+        return JSONResponse({"error": "invalid refresh event"}, status_code=400)
+    return {"refresh": refresh}
+
+
+def _default_client() -> Any:
+    try:
+        from config.aio import AsyncConfigClient
+    except ImportError:
+        return ConfigClient()
+    return AsyncConfigClient()
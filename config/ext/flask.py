@@ -1,11 +1,18 @@
-from typing import Any, Optional
+import threading
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
 
+from flask import g, request
 from flask.app import Flask
 from flask.config import Config
 from glom import glom
 
 from config.logger import logger
-from config.spring import ConfigClient
+from config.monitor import RefreshReceiver
+from config.refresh import RefreshScheduler
+from config.spring import ConfigClient, _index, _lookup
+
+_MISSING = object()
 
 
 def _validate(instance) -> None:
@@ -16,24 +23,50 @@ def _validate(instance) -> None:
         )
 
 
+def _top_key(key: Any) -> Any:
+    if isinstance(key, str):
+        return key.split(".", 1)[0]
+    if isinstance(key, tuple) and key:
+        return key[0]
+    return _MISSING
+
+
 class FlaskConfig:
     def __init__(
-        self, app: Flask, client: Optional[ConfigClient] = None, **kwargs
+        self,
+        app: Flask,
+        client: Optional[ConfigClient] = None,
+        interval: Optional[float] = None,
+        jitter: float = 0.1,
+        monitor: Optional[str] = None,
+        **kwargs,
     ) -> None:
         """Configure Flask application with config-client.
 
+        The config of the current request is available as flask.g.config,
+        the same version from the start to the end of the request, even if a
+        refresh happens in the meantime.
+
         Usage:
 
         from config.ext.flask import FlaskConfig
-        from flask import Flask
+        from flask import Flask, g
 
 
         app = Flask(__name__)
-        FlaskConfig(app)
+        FlaskConfig(app, interval=60)
+
+
+        @app.route('/')
+        def home():
+            return g.config.get('info.description')
 
 
         :param app: Flask application.
         :param client: custom ConfigClient.
+        :param interval: seconds between background refreshes, None to disable them. [default=None].
+        :param jitter: random spread applied to interval, as a fraction of it. [default=0.1].
+        :param monitor: URL rule receiving the refresh events of Spring Cloud Bus or /monitor, None to disable it. [default=None].
         :param kwargs: any keyword argument used to request config from the server.
         """
         if not isinstance(app, Flask):
@@ -44,19 +77,114 @@ class FlaskConfig:
         _validate(client)
 
         self.app = app
+        self.client = client
+        self.scheduler: Optional[RefreshScheduler] = None
+        self.receiver: Optional[RefreshReceiver] = None
         logger.debug(f"FlaskConfig get_config params: [kwargs='{kwargs}']")
         client.get_config(**kwargs)
-        self.app.config = _Config(
+        self.config = self.app.config = _Config(
             root_path=self.app.root_path,
             defaults=self.app.config,
             _config=client.config,
         )
+        self.app.before_request(self._snapshot)
+        self.app.extensions["config_client"] = self
+        if interval is not None:
+            self.scheduler = RefreshScheduler(
+                client,
+                interval=interval,
+                jitter=jitter,
+                kwargs=kwargs,
+                on_refresh=self._refreshed,
+            )
+            self.scheduler.start()
+        if monitor is not None:
+            self.receiver = RefreshReceiver(
+                client, kwargs=kwargs, on_refresh=self._refreshed
+            )
+            self.app.add_url_rule(
+                monitor, "config_monitor", self._monitor, methods=["POST"]
+            )
+
+    def _refreshed(self) -> None:
+        self.config._publish(self.client.config)
+
+    def _monitor(self) -> Any:
+        try:
+            refresh = self.receiver.receive(  # type: ignore
+                request.get_data(), request.content_type or "application/json"
+            )
+        except ValueError:
+            return {"error": "invalid refresh event"}, 400
+        return {"refresh": refresh}
+
+    def _snapshot(self) -> None:
+        config = self.app.config
+        if isinstance(config, _Config):
+            g.config = config.snapshot
+
+
+class _Snapshot(Mapping):
+    """Read-only view of one config version, dotted keys read from its flat index."""
+
+    __slots__ = ("config", "index")
+
+    def __init__(self, config: Mapping) -> None:
+        self.config = config
+        self.index = _index(config)
+
+    @property
+    def version(self) -> Optional[str]:
+        return getattr(self.config, "version", None)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.config[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.config)
+
+    def __len__(self) -> int:
+        return len(self.config)
+
+    def get(self, key, default: Any = None) -> Any:
+        return _lookup(self.config, self.index, key, default)
 
 
 class _Config(Config):
-    def __init__(self, _config, *args, **kwargs):
+    def __init__(self, _config, *args, **kwargs) -> None:
         super(_Config, self).__init__(*args, **kwargs)
+        self._snapshot = _Snapshot(_config)
+        # the scheduler and the monitor publish from their own threads
+        self._lock = threading.Lock()
         Config.update(self, _config)
 
+    @property
+    def snapshot(self) -> _Snapshot:
+        return self._snapshot
+
+    def _publish(self, config: Mapping) -> None:
+        # get reads the snapshot once, so it sees either version but never a mix
+        snapshot = _Snapshot(config)
+        with self._lock:
+            previous, self._snapshot = self._snapshot, snapshot
+            Config.update(self, config)
+            for key in previous.keys() - config.keys():
+                self.pop(key, None)
+        logger.debug(
+            f"FlaskConfig config published: [version='{self._snapshot.version}']"
+        )
+
     def get(self, key, default: Any = None) -> Any:
-        return glom(self, key, default=default)
+        snapshot = self._snapshot
+        top = _top_key(key)
+        # app.config can be changed after a publish, e.g. app.config['server'] = ...,
+        # the index only answers while the top-level key holds the published value
+        published = snapshot.config.get(top, _MISSING)
+        if top is _MISSING or dict.get(self, top, _MISSING) is not published:
+            return glom(self, key, default=default)
+        value = snapshot.get(key, _MISSING)
+        if value is _MISSING:
+            # Flask settings, like DEBUG, and keys set after FlaskConfig
+            # aren't part of the server config
+            return glom(self, key, default=default)
+        return value
@@ -0,0 +1,289 @@
+"""Failover and hedged requests across config server replicas."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from attrs import field, mutable, validators
+from requests.exceptions import HTTPError
+
+from .logger import logger
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _close_result(future: "Future[Any]") -> None:
+    """Close the response of a request that lost the hedge, releasing its connection."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if callable(close):
+        close()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="config-client-hedge")
+        return _executor
+
+
+def _is_final(err: Exception) -> bool:
+    """Client errors (4xx) are answered the same way by every replica."""
+    status = getattr(err, "status", None)
+    if isinstance(err, HTTPError):
+        status = getattr(err.response, "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500
+
+
+@mutable
+class Replica:
+    """Health and latency statistics of one config server address."""
+
+    address: str = field(validator=validators.instance_of(str))
+    window: int = field(default=100, repr=False)
+    failures: int = field(default=0)
+    down_until: float = field(default=0.0, repr=False)
+    _latencies: Deque[float] = field(init=False, repr=False)
+    # hedged requests record from the executor threads
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False)
+
+    @_latencies.default
+    def _latencies_default(self) -> Deque[float]:
+        return deque(maxlen=self.window)
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= time.monotonic()
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency percentile (0 < p <= 1) of the recent successful requests."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(int(p * len(latencies)), len(latencies) - 1)]
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+        self.failures = 0
+        self.down_until = 0.0
+
+    def record_failure(self, cooldown: float) -> None:
+        self.failures += 1
+        self.down_until = time.monotonic() + cooldown
+
+
+@mutable
+class ReplicaSet:
+    """Select, fail over and hedge requests across config server replicas.
+
+    Usage:
+
+    replicas = ReplicaSet.from_address('http://cfg1:8888,http://cfg2:8888', hedge=True)
+    response = replicas.call(lambda address: http.get(f'{address}/foo/default/main'))
+
+    :param replicas: config server replicas, in preference order.
+    :param hedge: fire a second request when the first one is slower than usual.
+    :param hedge_percentile: latency percentile of the replica that triggers the hedge. [default=0.95].
+    :param hedge_delay: seconds before hedging while there are too few samples. [default=1.0].
+    :param min_samples: samples required to use the percentile. [default=10].
+    :param cooldown: seconds a failed replica is only used as last resort. [default=30].
+    """
+
+    replicas: List[Replica] = field(validator=validators.instance_of(list))
+    hedge: bool = field(default=False)
+    hedge_percentile: float = field(default=0.95)
+    hedge_delay: float = field(default=1.0)
+    min_samples: int = field(default=10)
+    cooldown: float = field(default=30.0)
+    source: str = field(default="", repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        if not self.replicas:
+            raise ValueError("at least one replica is required")
+
+    @classmethod
+    def from_address(cls, address: str, **kwargs) -> "ReplicaSet":
+        """Create from a comma separated list of addresses."""
+        addresses = [a.strip().rstrip("/") for a in address.split(",") if a.strip()]
+        return cls(
+            [Replica(a) for a in addresses or [address]], source=address, **kwargs
+        )
+
+    @property
+    def addresses(self) -> List[str]:
+        return [replica.address for replica in self.replicas]
+
+    @property
+    def primary(self) -> Replica:
+        return self.ordered()[0]
+
+    @property
+    def stats(self) -> Dict[str, dict]:
+        return {
+            r.address: dict(
+                healthy=r.healthy,
+                failures=r.failures,
+                samples=r.samples,
+                p50=r.percentile(0.5),
+                p95=r.percentile(0.95),
+            )
+            for r in self.replicas
+        }
+
+    def ordered(self) -> List[Replica]:
+        """Healthy replicas by median latency, then the ones cooling down."""
+        healthy = [r for r in self.replicas if r.healthy]
+        down = [r for r in self.replicas if not r.healthy]
+        healthy.sort(key=lambda r: r.percentile(0.5) or 0.0)
+        down.sort(key=lambda r: r.down_until)
+        return healthy + down
+
+    def threshold(self, replica: Replica) -> float:
+        """Seconds to wait on replica before hedging."""
+        if replica.samples < self.min_samples:
+            return self.hedge_delay
+        return replica.percentile(self.hedge_percentile) or self.hedge_delay
+
+    def call(self, fnc: Callable[[str], T]) -> T:
+        """Call fnc(address) on the best replica, failing over or hedging to the others."""
+        replicas = self.ordered()
+        if self.hedge and len(replicas) > 1:
+            return self._hedged(fnc, replicas)
+        last_error: Optional[Exception] = None
+        for replica in replicas:
+            try:
+                return self._timed(fnc, replica)
+            except Exception as err:
+                if _is_final(err):
+                    raise
+                last_error = err
+        raise last_error  # type: ignore
+
+    def _timed(self, fnc: Callable[[str], T], replica: Replica) -> T:
+        start = time.perf_counter()
+        try:
+            result = fnc(replica.address)
+        except Exception as err:
+            if not _is_final(err):
+                logger.warning(f"Replica failed: [address='{replica.address}']")
+                replica.record_failure(self.cooldown)
+            raise
+        replica.record_success(time.perf_counter() - start)
+        return result
+
+    def _hedged(self, fnc: Callable[[str], T], replicas: List[Replica]) -> T:
+        executor = _get_executor()
+        remaining = list(replicas)
+        pending: Dict["Future[T]", Replica] = {}
+        last_error: Optional[Exception] = None
+
+        def launch() -> Replica:
+            replica = remaining.pop(0)
+            pending[executor.submit(self._timed, fnc, replica)] = replica
+            return replica
+
+        current = launch()
+        try:
+            while pending:
+                timeout = self.threshold(current) if remaining else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.debug(f"Hedging request: [slow='{current.address}']")
+                    current = launch()
+                    continue
+                for future in done:
+                    pending.pop(future)
+                    try:
+                        return future.result()
+                    except Exception as err:
+                        if _is_final(err):
+                            raise
+                        last_error = err
+                if remaining:
+                    current = launch()
+            raise last_error  # type: ignore
+        finally:
+            for future in pending:
+                future.add_done_callback(_close_result)
+
+    async def call_async(self, fnc: Callable[[str], Awaitable[T]]) -> T:
+        """Await fnc(address) on the best replica, failing over or hedging to the others."""
+        replicas = self.ordered()
+        if self.hedge and len(replicas) > 1:
+            return await self._hedged_async(fnc, replicas)
+        last_error: Optional[Exception] = None
+        for replica in replicas:
+            try:
+                return await self._timed_async(fnc, replica)
+            except Exception as err:
+                if _is_final(err):
+                    raise
+                last_error = err
+        raise last_error  # type: ignore
+
+    async def _timed_async(
+        self, fnc: Callable[[str], Awaitable[T]], replica: Replica
+    ) -> T:
+        start = time.perf_counter()
+        try:
+            result = await fnc(replica.address)
+        except Exception as err:
+            if not _is_final(err):
+                logger.warning(f"Replica failed: [address='{replica.address}']")
+                replica.record_failure(self.cooldown)
+            raise
+        replica.record_success(time.perf_counter() - start)
+        return result
+
+    async def _hedged_async(
+        self, fnc: Callable[[str], Awaitable[T]], replicas: List[Replica]
+    ) -> T:
+        remaining = list(replicas)
+        pending: Dict["asyncio.Task[T]", Replica] = {}
+        last_error: Optional[Exception] = None
+
+        def launch() -> Replica:
+            replica = remaining.pop(0)
+            task = asyncio.ensure_future(self._timed_async(fnc, replica))
+            pending[task] = replica
+            return replica
+
+        current = launch()
+        try:
+            while pending:
+                timeout = self.threshold(current) if remaining else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.debug(f"Hedging request: [slow='{current.address}']")
+                    current = launch()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as err:
+                        if _is_final(err):
+                            raise
+                        last_error = err
+                if remaining:
+                    current = launch()
+            raise last_error  # type: ignore
+        finally:
+            for task in pending:
+                task.cancel()
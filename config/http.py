@@ -1,19 +1,89 @@
 import functools
+import threading
 import typing
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .logger import logger
 
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
 
-def _req(fnc: typing.Callable, uri: str, **kwargs) -> requests.Response:
-    logger.debug(
-        f"HTTP Request: [type='{fnc.__name__}', uri='{uri}', kwargs='{kwargs}']"
+_sessions: typing.Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    max_retries: int = 0,
+    pool_block: bool = False,
+) -> requests.Session:
+    """Create a keep-alive session backed by a tunable connection pool.
+
+    Usage:
+
+    session = http.create_session(pool_maxsize=32)
+    client = ConfigClient(app_name='foo', session=session)
+
+    :param pool_connections: number of host pools to cache.
+    :param pool_maxsize: maximum number of connections kept alive per host.
+    :param max_retries: number of retries for failed connections.
+    :param pool_block: block when no free connection is available.
+    """
+    session = requests.Session()
+    # shared between clients, a session cookie (e.g. JSESSIONID) set for one
+    # of them must never be sent on the requests of another
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=pool_block,
     )
-    response: requests.Response = fnc(uri, **kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def session_for(uri: str) -> requests.Session:
+    """Return the shared session for the origin (scheme://host:port) of uri."""
+    parts = urlsplit(uri)
+    origin = f"{parts.scheme}://{parts.netloc}".lower()
+    with _sessions_lock:
+        session = _sessions.get(origin)
+        if session is None:
+            logger.debug(f"Creating shared session: [origin='{origin}']")
+            session = create_session()
+            _sessions[origin] = session
+    return session
+
+
+def close_sessions() -> None:
+    """Close every shared session and release its pooled connections."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def _req(
+    method: str,
+    uri: str,
+    session: typing.Optional[requests.Session] = None,
+    **kwargs,
+) -> requests.Response:
+    logger.debug(f"HTTP Request: [type='{method}', uri='{uri}', kwargs='{kwargs}']")
+    if session is None:
+        session = session_for(uri)
+    response: requests.Response = session.request(method, uri, **kwargs)
     response.raise_for_status()
     return response
 
 
-get = functools.partial(_req, requests.get)
-post = functools.partial(_req, requests.post)
+get = functools.partial(_req, "get")
+post = functools.partial(_req, "post")
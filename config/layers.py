@@ -0,0 +1,195 @@
+"""Property sources kept as ordered layers and resolved by precedence on lookup."""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from attrs import field, frozen
+
+from ._config import build_index, build_tree, merge_dict
+from .placeholders import PlaceholderResolver, apply, has_placeholders
+from .snapshot import ConfigSnapshot, freeze, thaw
+
+_MISSING = object()
+
+
+@frozen
+class Layer:
+    """One property source with its own frozen tree and flat index."""
+
+    name: str
+    source: dict = field(repr=False)
+    tree: dict = field(repr=False, eq=False)
+    index: Dict[str, Any] = field(repr=False, eq=False)
+    templates: Tuple[str, ...] = field(default=(), repr=False, eq=False)
+
+    @classmethod
+    def build(cls, name: str, source: dict) -> "Layer":
+        tree = freeze(build_tree(source))
+        index = build_index(tree)
+        templates = tuple(k for k, v in index.items() if has_placeholders(v))
+        return cls(name, source, tree, index, templates)
+
+
+class LayeredConfig(Mapping):
+    """Read-only view of the property sources, the first one wins.
+
+    Values are resolved on demand with the same precedence as the merged
+    config: dicts of every layer are merged, any other value comes from the
+    first layer that has it. A refresh only rebuilds the layers whose source
+    changed, the others are reused from the previous view.
+
+    Usage:
+
+    layered = LayeredConfig.build([('app.yml', {...}), ('application.yml', {...})])
+    layered.get('spring.cloud.consul.port')
+    layered.tree
+    """
+
+    __slots__ = (
+        "layers",
+        "version",
+        "revision",
+        "placeholders",
+        "_resolved",
+        "_keys",
+        "_tree",
+    )
+
+    def __init__(
+        self,
+        layers: Iterable[Layer] = (),
+        version: Optional[str] = None,
+        revision: int = 0,
+    ) -> None:
+        self.layers: Tuple[Layer, ...] = tuple(layers)
+        self.version = version
+        self.revision = revision
+        self.placeholders: Dict[str, Any] = {}
+        self._resolved: Dict[str, Any] = {}
+        self._keys: Optional[List[str]] = None
+        self._tree: Optional[ConfigSnapshot] = None
+
+    @classmethod
+    def build(
+        cls,
+        sources: Iterable[Tuple[str, dict]],
+        previous: Optional["LayeredConfig"] = None,
+        version: Optional[str] = None,
+    ) -> "LayeredConfig":
+        """Layers of (name, source) pairs, reusing the unchanged ones of previous."""
+        known = {}
+        if previous is not None:
+            known = {layer.name: layer for layer in previous.layers}
+        layers = []
+        for name, source in sources:
+            layer = known.get(name)
+            if layer is None or layer.source != source:
+                layer = Layer.build(name, source)
+            layers.append(layer)
+        revision = previous.revision + 1 if previous is not None else 1
+        return cls(layers, version, revision)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of a dotted key, default if no visible layer has it."""
+        value = self._resolved.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._resolve(key)
+            if value is _MISSING:
+                return default
+            if self.placeholders:
+                value = self._patch(key, value)
+            self._resolved[key] = value
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Dotted keys visible after precedence, like the merged config index."""
+        if self._keys is None:
+            keys = dict.fromkeys(key for layer in self.layers for key in layer.index)
+            self._keys = [key for key in keys if key in self]
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def tree(self) -> ConfigSnapshot:
+        """The merged config, built on first use."""
+        if self._tree is None:
+            config: dict = {}
+            for layer in reversed(self.layers):
+                merge_dict(config, thaw(layer.tree))
+            apply(config, self.placeholders)
+            self._tree = ConfigSnapshot(freeze(config), self.version, self.revision)
+        return self._tree
+
+    def resolve_placeholders(self, resolver: PlaceholderResolver) -> None:
+        """Resolve the ${...} placeholders of every layer, before publishing the view."""
+        keys = dict.fromkeys(key for layer in self.layers for key in layer.templates)
+        self.placeholders = resolver.resolve(self, keys) if keys else {}
+        self._resolved = {}
+        self._keys = None
+        self._tree = None
+
+    def _patch(self, key: str, value: Any) -> Any:
+        if not isinstance(value, (dict, list)):
+            return self.placeholders.get(key, value)
+        start = f"{key}."
+        offset = len(start)
+        inner = {
+            k[offset:]: v for k, v in self.placeholders.items() if k.startswith(start)
+        }
+        if not inner:
+            return value
+        patched = thaw(value)
+        apply(patched, inner)
+        return freeze(patched)
+
+    def _resolve(self, key: str) -> Any:
+        layers = self.layers
+        parts = key.split(".")
+        for end in range(1, len(parts)):
+            layers = _visible(layers, ".".join(parts[:end]))
+            if not layers:
+                return _MISSING
+        return _value(layers, key)
+
+    def __repr__(self) -> str:
+        names = [layer.name for layer in self.layers]
+        return (
+            f"{type(self).__name__}(version={self.version!r}, "
+            f"revision={self.revision}, layers={names})"
+        )
+
+
+def _visible(layers: Tuple[Layer, ...], path: str) -> Tuple[Layer, ...]:
+    """Layers whose children of path are reachable: dicts merge, others replace."""
+    found = [(layer, layer.index.get(path, _MISSING)) for layer in layers]
+    dicts = tuple(layer for layer, value in found if isinstance(value, dict))
+    if dicts:
+        return dicts
+    for layer, value in found:
+        if value is not _MISSING:
+            return (layer,)
+    return ()
+
+
+def _value(layers: Tuple[Layer, ...], key: str) -> Any:
+    values = [layer.index.get(key, _MISSING) for layer in layers]
+    dicts = [value for value in values if isinstance(value, dict)]
+    if len(dicts) == 1:
+        return dicts[0]
+    if dicts:
+        merged: dict = {}
+        for value in reversed(dicts):
+            merge_dict(merged, thaw(value))
+        return freeze(merged)
+    return next((value for value in values if value is not _MISSING), _MISSING)
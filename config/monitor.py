@@ -0,0 +1,365 @@
+"""Refresh on the events of Spring Cloud Bus and the config server /monitor endpoint.
+
+Instead of polling, the client is refreshed when the server reports a change
+to one of its files, only if the change affects its app and profiles.
+"""
+
+import abc
+import asyncio
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs
+
+from attrs import field, mutable, validators
+
+from .logger import logger
+from .refresh import _Refresh, _TaskRefresh, _ThreadRefresh
+
+# events of spring-cloud-bus that ask for a refresh, others (e.g. acks) are ignored
+REFRESH_EVENTS = frozenset(
+    ["RefreshRemoteApplicationEvent", "EnvironmentChangeRemoteApplicationEvent"]
+)
+
+
+def read_events(body: bytes, content_type: str = "application/json") -> List[Mapping]:
+    """Events in a request body, raises ValueError if it can't be parsed.
+
+    Accepts a bus event or a list of them as JSON, the form sent to the
+    config server /monitor endpoint (path=...) and git webhooks (commits).
+    """
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return [{"path": parse_qs(body.decode()).get("path", [])}]
+    events = json.loads(body or b"{}")
+    if isinstance(events, dict):
+        events = [events]
+    if not isinstance(events, list) or not all(map(_valid, events)):
+        raise ValueError(f"Invalid refresh event: [type='{type(events).__name__}']")
+    return events
+
+
+def _strings(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _valid(event: Any) -> bool:
+    """True if the fields read by matches have the expected types."""
+    if not isinstance(event, dict):
+        return False
+    for key in ("type", "destinationService"):
+        if not isinstance(event.get(key, ""), (str, type(None))):
+            return False
+    path = event.get("path", [])
+    if not (isinstance(path, str) or _strings(path)):
+        return False
+    commits = event.get("commits", [])
+    return isinstance(commits, list) and all(map(_valid_commit, commits))
+
+
+def _valid_commit(commit: Any) -> bool:
+    if not isinstance(commit, dict):
+        return False
+    return all(_strings(commit.get(k, [])) for k in ("added", "modified", "removed"))
+
+
+def _destination(destination: Optional[str]) -> "re.Pattern[str]":
+    # spring-cloud-bus appends ':**' to destinations without it, like 'foo'
+    destination = destination or "**"
+    if destination != "**" and not destination.endswith(":**"):
+        destination += ":**"
+    pattern = re.escape(destination)
+    pattern = pattern.replace(r"\*\*", "**").replace(r"\*", "[^:]*")
+    pattern = pattern.replace(":**", "(?::.*)?").replace("**", ".*")
+    return re.compile(pattern)
+
+
+def _paths(event: Mapping) -> Iterator[str]:
+    paths = event.get("path", [])
+    yield from [paths] if isinstance(paths, str) else paths
+    for commit in event.get("commits", []):
+        for kind in ("added", "modified", "removed"):
+            yield from commit.get(kind, [])
+
+
+def _path_matches(path: str, app_name: str, profiles: List[str]) -> bool:
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in ("application", app_name):
+        return True
+    return any(name in (f"{app_name}-{p}", f"application-{p}") for p in profiles)
+
+
+def matches(event: Mapping, app_name: str, profile: str) -> bool:
+    """True if the event asks for a refresh of app_name with one of the profiles.
+
+    :param event: bus event (destinationService) or files changed (path, commits).
+    :param app_name: application name.
+    :param profile: comma separated profiles.
+    """
+    profiles = [p.strip() for p in profile.split(",") if p.strip()]
+    if "destinationService" in event or "type" in event:
+        if event.get("type", "RefreshRemoteApplicationEvent") not in REFRESH_EVENTS:
+            return False
+        pattern = _destination(event.get("destinationService"))
+        services = [f"{app_name}:{p}" for p in profiles] or [app_name]
+        return any(pattern.fullmatch(service) for service in services)
+    return any(_path_matches(path, app_name, profiles) for path in _paths(event))
+
+
+@mutable
+class _Receiver(_Refresh, abc.ABC):
+    client: Any = field()
+    kwargs: dict = field(factory=dict, validator=validators.instance_of(dict))
+    on_refresh: Optional[Callable[[], Any]] = field(
+        default=None, validator=validators.optional(validators.is_callable())
+    )
+    received: int = field(default=0, init=False)
+    coalesced: int = field(default=0, init=False)
+    _pending: bool = field(default=False, init=False, repr=False)
+
+    @property
+    def target(self) -> Tuple[str, str]:
+        client = getattr(self.client, "client", self.client)  # CF
+        return client.app_name, client.profile
+
+    def matches(self, event: Mapping) -> bool:
+        return matches(event, *self.target)
+
+    def receive(self, body: bytes, content_type: str = "application/json") -> bool:
+        """Notify the events of a request body, True if one of them matched."""
+        return any([self.notify(event) for event in read_events(body, content_type)])
+
+    def notify(self, event: Mapping) -> bool:
+        """Schedule a refresh if event matches the client, True when it does."""
+        if not self.matches(event):
+            logger.debug(f"Refresh event ignored: [event='{event}']")
+            return False
+        self.received += 1
+        logger.debug(f"Refresh event received: [event='{event}']")
+        self._schedule()
+        return True
+
+    @abc.abstractmethod
+    def _schedule(self) -> None:
+        """Run a refresh soon, or let the one waiting to run cover the event."""
+
+
+@mutable
+class RefreshReceiver(_Receiver, _ThreadRefresh):
+    """Refresh a client on a worker thread when a matching event is received.
+
+    Events received while a refresh is waiting to run share it, the ones
+    received while it runs schedule a single refresh after it, so a burst
+    of events costs at most two requests.
+
+    Usage:
+
+    client = ConfigClient(app_name='foo')
+    client.get_config()
+
+    receiver = RefreshReceiver(client)
+    receiver.notify({'type': 'RefreshRemoteApplicationEvent', 'destinationService': 'foo:**'})
+
+    :param client: ConfigClient or CF instance.
+    :param kwargs: keyword arguments used on every get_config call.
+    :param on_refresh: called after each refresh that changed the config.
+    """
+
+    _worker: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the scheduled refreshes, False on timeout."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+            return not worker.is_alive()
+        return True
+
+    def _schedule(self) -> None:
+        with self._lock:
+            if self._pending:
+                self.coalesced += 1
+                return
+            self._pending = True
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._drain, name="config-client-monitor", daemon=True
+                )
+                self._worker.start()
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                self._pending = False
+            self.refresh()
+
+
+@mutable
+class AsyncRefreshReceiver(_Receiver, _TaskRefresh):
+    """Refresh a client on an asyncio task when a matching event is received.
+
+    Events are coalesced like RefreshReceiver does.
+
+    Usage:
+
+    client = AsyncConfigClient(app_name='foo')
+    await client.get_config()
+
+    receiver = AsyncRefreshReceiver(client)
+    receiver.notify({'path': ['foo-development.yml']})
+    ...
+    await receiver.stop()
+
+    :param client: AsyncConfigClient, ConfigClient or CF instance.
+    :param kwargs: keyword arguments used on every get_config call.
+    :param on_refresh: called after each refresh that changed the config.
+    """
+
+    _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    async def wait(self) -> None:
+        """Wait for the scheduled refreshes."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._pending = False
+
+    def _schedule(self) -> None:
+        if self._pending:
+            self.coalesced += 1
+            return
+        self._pending = True
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self) -> None:
+        try:
+            while self._pending:
+                self._pending = False
+                await self.refresh()
+        finally:
+            self._task = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def do_POST(self) -> None:
+        if self.path.split("?", 1)[0] != self.server.monitor.path:
+            return self._reply(404, {"error": "not found"})
+        content_type = self.headers.get("Content-Type") or "application/json"
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length: [length='{length}']")
+            refresh = self.server.monitor.receiver.receive(
+                self.rfile.read(length), content_type
+            )
+        except ValueError:
+            return self._reply(400, {"error": "invalid refresh event"})
+        self._reply(200, {"refresh": refresh})
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"MonitorServer: [request='{format % args}']")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, monitor: "MonitorServer") -> None:
+        super().__init__((monitor.host, monitor.port), _Handler)
+        self.monitor = monitor
+
+
+@mutable
+class MonitorServer:
+    """Standalone HTTP endpoint for refresh events, served on a daemon thread.
+
+    Usage:
+
+    client = ConfigClient(app_name='foo')
+    client.get_config()
+
+    server = MonitorServer(RefreshReceiver(client), host='0.0.0.0', port=8081)
+    server.start()
+    ...
+    server.stop()
+
+    :param receiver: RefreshReceiver of the client.
+    :param host: address to listen on. [default=127.0.0.1].
+    :param port: port to listen on, 0 to pick a free one. [default=8081].
+    :param path: path events are posted to. [default=/monitor].
+    """
+
+    receiver: RefreshReceiver = field(validator=validators.instance_of(RefreshReceiver))
+    host: str = field(
+        default=os.getenv("CONFIG_MONITOR_HOST", "127.0.0.1"),
+        validator=validators.instance_of(str),
+    )
+    port: int = field(
+        default=int(os.getenv("CONFIG_MONITOR_PORT", "8081")),
+        validator=validators.instance_of(int),
+    )
+    path: str = field(default="/monitor", validator=validators.instance_of(str))
+    _server: Optional[_Server] = field(default=None, init=False, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def url(self) -> str:
+        """URL events are posted to, with the port bound when it was 0."""
+        port = self._server.server_address[1] if self._server else self.port
+        return f"http://{self.host}:{port}{self.path}"
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._server = _Server(self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="config-client-monitor-server",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.debug(f"MonitorServer started: [url='{self.url}']")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MonitorServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
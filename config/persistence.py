@@ -0,0 +1,63 @@
+"""Last-known-good config snapshots on the local disk."""
+
+import marshal
+import os
+import sys
+import tempfile
+from typing import Any, Optional, Tuple
+
+from attrs import frozen
+
+from .logger import logger
+
+FORMAT = 1
+
+
+@frozen
+class Snapshot:
+    target: Tuple[str, str, str]
+    version: Optional[str]
+    state: Any
+    config: dict
+
+
+def save_snapshot(path: str, snapshot: Snapshot) -> None:
+    """Write the snapshot atomically: readers see the old or the new file, never a partial one."""
+    payload = (
+        FORMAT,
+        tuple(sys.version_info[:2]),
+        tuple(snapshot.target),
+        snapshot.version,
+        snapshot.state,
+        snapshot.config,
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".config-snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    logger.debug(f"Snapshot saved: [path='{path}', version='{snapshot.version}']")
+
+
+def load_snapshot(path: str) -> Optional[Snapshot]:
+    """Read a snapshot written by save_snapshot, None if missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            payload = marshal.load(f)  # nosec B302 - file written by save_snapshot
+        fmt, python, target, version, state, config = payload
+    except FileNotFoundError:
+        return None
+    except Exception as err:
+        logger.warning(f"Invalid snapshot: [path='{path}', error='{err}']")
+        return None
+    if fmt != FORMAT or python != tuple(sys.version_info[:2]):
+        logger.warning(f"Incompatible snapshot: [path='{path}']")
+        return None
+    return Snapshot(tuple(target), version, state, config)
@@ -0,0 +1,210 @@
+"""Spring-style ${key:default} placeholders resolved against the config itself."""
+
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from attrs import field, frozen, mutable
+
+from .logger import logger
+
+PREFIX = "${"
+SUFFIX = "}"
+SEPARATOR = ":"
+
+_MISSING = object()
+_LIST_INDEX = re.compile(r"\[(\d+)\]")
+
+
+def has_placeholders(value: Any) -> bool:
+    return isinstance(value, str) and PREFIX in value
+
+
+def normalize(key: str) -> str:
+    """Index path of a property name, e.g. servers[0].host -> servers.0.host."""
+    return _LIST_INDEX.sub(r".\1", key.strip()) if "[" in key else key.strip()
+
+
+def parse(value: str) -> List[Any]:
+    """Split value into literal strings and (key, default, text) placeholder tuples.
+
+    Defaults may hold placeholders themselves: ${a:${b:c}}.
+    An unterminated placeholder is kept as a literal.
+    """
+    parts: List[Any] = []
+    position = 0
+    while True:
+        start = value.find(PREFIX, position)
+        if start < 0:
+            break
+        end = _closing(value, start + len(PREFIX))
+        if end < 0:
+            break
+        if start > position:
+            parts.append(value[position:start])
+        body = value[start + len(PREFIX) : end]  # noqa: E203
+        key, separator, default = body.partition(SEPARATOR)
+        text = value[start : end + len(SUFFIX)]  # noqa: E203
+        parts.append((normalize(key), default if separator else None, text))
+        position = end + len(SUFFIX)
+    if position < len(value):
+        parts.append(value[position:])
+    return parts
+
+
+def _closing(value: str, position: int) -> int:
+    depth = 0
+    while position < len(value):
+        if value.startswith(PREFIX, position):
+            depth += 1
+            position += len(PREFIX)
+        elif value.startswith(SUFFIX, position):
+            if depth == 0:
+                return position
+            depth -= 1
+            position += len(SUFFIX)
+        else:
+            position += 1
+    return -1
+
+
+@frozen
+class _Resolved:
+    template: str
+    value: Any
+    inputs: Tuple[Tuple[str, Any], ...]
+
+
+@mutable
+class PlaceholderResolver:
+    """Resolve ${key:default} placeholders of the config values.
+
+    Each value with placeholders is resolved once per refresh, following its
+    references through the flat index; the references form a dependency
+    graph whose cycles are left unresolved. Results are memoized with the
+    resolved values they were built from, so on the next refresh a value is
+    only resolved again when its text or one of its transitive dependencies
+    changed.
+
+    Resolved values are strings, as on Spring, even when made of a single
+    placeholder, e.g. '${server.port}' -> '8080'. References without a value
+    and without a default are left as they are.
+
+    Usage:
+
+    resolver = PlaceholderResolver()
+    resolver.resolve(build_index(config))
+    """
+
+    _memo: Dict[str, _Resolved] = field(factory=dict, init=False, repr=False)
+
+    def resolve(
+        self, index: Mapping[str, Any], keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Resolved value of each key holding placeholders.
+
+        :param index: dotted path -> value of the whole config.
+        :param keys: keys that may hold placeholders. [default=every key of index].
+
+        :return: dict of dotted path -> resolved value, only for the values
+                 with placeholders.
+        """
+        if keys is None:
+            keys = (key for key, value in index.items() if has_placeholders(value))
+        run = _Run(index, self._memo)
+        resolved = {}
+        for key in keys:
+            if has_placeholders(index.get(key)):
+                resolved[key] = run.value(key)
+        self._memo = run.memo
+        if run.reused:
+            logger.debug(
+                f"Placeholders resolved: [resolved={len(resolved)}, reused={run.reused}]"
+            )
+        return resolved
+
+    def clear(self) -> None:
+        self._memo = {}
+
+
+class _Run:
+    """Resolution of one version of the config."""
+
+    def __init__(self, index: Mapping[str, Any], previous: Dict[str, _Resolved]):
+        self.index = index
+        self.previous = previous
+        self.memo: Dict[str, _Resolved] = {}
+        self.reused = 0
+        self._stack: List[str] = []
+        self._cyclic: Set[str] = set()
+
+    def value(self, key: str) -> Any:
+        """Resolved value of key, _MISSING if it doesn't exist or is a subtree."""
+        done = self.memo.get(key)
+        if done is not None:
+            return done.value
+        raw = self.index.get(key, _MISSING)
+        if isinstance(raw, (dict, list)):
+            return _MISSING
+        if not has_placeholders(raw):
+            return raw
+        if key in self._stack:
+            self._cyclic.update(self._stack[self._stack.index(key) :])  # noqa: E203
+            logger.warning(f"Circular placeholder reference: [key='{key}']")
+            return _MISSING
+        old = self.previous.get(key)
+        self._stack.append(key)
+        try:
+            if old is not None and old.template == raw and self._unchanged(old):
+                result = old
+                self.reused += 1
+            else:
+                inputs: Dict[str, Any] = {}
+                value = self._substitute(raw, inputs)
+                result = _Resolved(raw, value, tuple(inputs.items()))
+        finally:
+            self._stack.pop()
+        if key in self._cyclic:
+            result = _Resolved(raw, raw, result.inputs)
+        self.memo[key] = result
+        return result.value
+
+    def _unchanged(self, old: _Resolved) -> bool:
+        return all(self.value(dep) == value for dep, value in old.inputs)
+
+    def _substitute(self, template: str, inputs: Dict[str, Any]) -> str:
+        parts = parse(template)
+        values = []
+        for part in parts:
+            if isinstance(part, str):
+                values.append(part)
+                continue
+            key, default, text = part
+            value = inputs[key] = self.value(key)
+            if value is _MISSING and default is not None:
+                value = self._substitute(default, inputs)
+            if value is _MISSING:
+                logger.debug(f"Unresolved placeholder: [key='{key}']")
+                value = text
+            values.append(value)
+        return "".join(_text(value) for value in values)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def apply(config: Any, resolved: Mapping[str, Any]) -> None:
+    """Write resolved values into a mutable config tree, in place."""
+    for key, value in resolved.items():
+        *parents, last = key.split(".")
+        node = config
+        for segment in parents:
+            node = node[int(segment)] if isinstance(node, list) else node[segment]
+        if isinstance(node, list):
+            node[int(last)] = value
+        else:
+            node[last] = value
@@ -0,0 +1,190 @@
+"""Keep a config client fresh in the background."""
+
+import asyncio
+import inspect
+import random
+import threading
+from typing import Any, Callable, Optional
+
+from attrs import field, mutable, validators
+
+from .logger import logger
+
+
+def _positive(instance, attribute, value) -> None:
+    if value <= 0:
+        raise ValueError(f"{attribute.name} must be greater than zero")
+
+
+async def _get_config(client: Any, **kwargs) -> Any:
+    """get_config of AsyncConfigClient, or get_config_async of ConfigClient and CF."""
+    if inspect.iscoroutinefunction(client.get_config):
+        return await client.get_config(**kwargs)
+    return await client.get_config_async(**kwargs)
+
+
+class _Refresh:
+    """Refresh of a client shared by the schedulers and the receivers."""
+
+    client: Any
+    kwargs: dict
+    on_refresh: Optional[Callable[[], Any]]
+
+    def _refreshed(self, changed: Any) -> bool:
+        if changed and self.on_refresh is not None:
+            self.on_refresh()
+        return bool(changed)
+
+    def _failed(self, err: BaseException) -> bool:
+        logger.error(f"Failed to refresh config: [client='{self.client}']")
+        logger.error(err)
+        return False
+
+
+class _ThreadRefresh(_Refresh):
+    def refresh(self) -> bool:
+        """Refresh the client now, errors are logged and never raised."""
+        try:
+            return self._refreshed(self.client.get_config(**self.kwargs))
+        except (Exception, SystemExit) as err:
+            return self._failed(err)
+
+
+class _TaskRefresh(_Refresh):
+    async def refresh(self) -> bool:
+        """Refresh the client now, errors are logged and never raised."""
+        try:
+            return self._refreshed(await _get_config(self.client, **self.kwargs))
+        except (Exception, SystemExit) as err:
+            return self._failed(err)
+
+
+@mutable
+class _Scheduler(_Refresh):
+    client: Any = field()
+    interval: float = field(
+        default=30.0,
+        validator=[validators.instance_of((int, float)), _positive],
+    )
+    jitter: float = field(
+        default=0.1,
+        validator=[validators.instance_of((int, float)), validators.ge(0)],
+    )
+    kwargs: dict = field(factory=dict, validator=validators.instance_of(dict))
+    on_refresh: Optional[Callable[[], Any]] = field(
+        default=None, validator=validators.optional(validators.is_callable())
+    )
+
+    def next_delay(self) -> float:
+        """Seconds until the next refresh: interval ± jitter (as a fraction of it)."""
+        spread = self.interval * min(self.jitter, 1.0)
+        return max(self.interval + random.uniform(-spread, spread), 0.0)
+
+
+@mutable
+class RefreshScheduler(_Scheduler, _ThreadRefresh):
+    """Refresh a client on a daemon thread.
+
+    Usage:
+
+    client = ConfigClient(app_name='foo')
+    client.get_config()
+
+    scheduler = RefreshScheduler(client, interval=60, jitter=0.2)
+    scheduler.start()
+    ...
+    scheduler.stop()
+
+    :param client: ConfigClient or CF instance.
+    :param interval: seconds between refreshes. [default=30].
+    :param jitter: random spread applied to interval, as a fraction of it. [default=0.1].
+    :param kwargs: keyword arguments used on every get_config call.
+    :param on_refresh: called after each refresh that changed the config.
+    """
+
+    _thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _stop: threading.Event = field(factory=threading.Event, init=False, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="config-client-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.next_delay()):
+            self.refresh()
+
+    def __enter__(self) -> "RefreshScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+@mutable
+class AsyncRefreshScheduler(_Scheduler, _TaskRefresh):
+    """Refresh a client on an asyncio task.
+
+    Usage:
+
+    client = AsyncConfigClient(app_name='foo')
+    await client.get_config()
+
+    scheduler = AsyncRefreshScheduler(client, interval=60, jitter=0.2)
+    scheduler.start()
+    ...
+    await scheduler.stop()
+
+    :param client: AsyncConfigClient, ConfigClient or CF instance.
+    :param interval: seconds between refreshes. [default=30].
+    :param jitter: random spread applied to interval, as a fraction of it. [default=0.1].
+    :param kwargs: keyword arguments used on every get_config call.
+    :param on_refresh: called after each refresh that changed the config.
+    """
+
+    _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.next_delay())
+            await self.refresh()
+
+    async def __aenter__(self) -> "AsyncRefreshScheduler":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
@@ -0,0 +1,106 @@
+"""Coalescing of concurrent calls: callers with the same key share one execution."""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from attrs import field, mutable
+
+from .logger import logger
+
+T = TypeVar("T")
+
+
+@mutable
+class SingleFlight:
+    """Threads calling do with the same key while a call is in flight wait for it.
+
+    Every waiter gets the result, or the exception, of that call.
+
+    Usage:
+
+    flight = SingleFlight()
+    flight.do('foo/development/master', client.get_config)
+    flight.coalesced
+    """
+
+    calls: int = field(default=0, init=False)
+    coalesced: int = field(default=0, init=False)
+    _flights: Dict[Hashable, Future] = field(factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False)
+
+    def do(self, key: Hashable, fnc: Callable[..., T], *args, **kwargs) -> T:
+        """Result of fnc(*args, **kwargs), shared with the concurrent calls of key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = Future()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            logger.debug(f"Waiting for in-flight call: [key='{key}']")
+            shared: T = flight.result()
+            return shared
+        try:
+            result = fnc(*args, **kwargs)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+
+@mutable
+class AsyncSingleFlight:
+    """Tasks awaiting do with the same key while a call is in flight wait for it.
+
+    Every waiter gets the result, or the exception, of that call, and is
+    cancelled if the task running it is.
+
+    Usage:
+
+    flight = AsyncSingleFlight()
+    await flight.do('foo/development/master', client.get_config)
+    flight.coalesced
+    """
+
+    calls: int = field(default=0, init=False)
+    coalesced: int = field(default=0, init=False)
+    _flights: Dict[Hashable, asyncio.Future] = field(
+        factory=dict, init=False, repr=False
+    )
+
+    async def do(
+        self, key: Hashable, fnc: Callable[..., Awaitable[T]], *args, **kwargs
+    ) -> T:
+        """Result of await fnc(*args, **kwargs), shared with the concurrent calls of key."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            logger.debug(f"Waiting for in-flight call: [key='{key}']")
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        try:
+            result = await fnc(*args, **kwargs)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as err:
+            flight.set_exception(err)
+            # retrieved, even when nobody else was waiting
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
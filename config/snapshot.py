@@ -0,0 +1,142 @@
+"""Immutable, versioned config snapshots published by a single reference swap."""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+from ._config import build_index
+
+_MISSING = object()
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenDict(dict):
+    """dict that can't be modified after it is created."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """list that can't be modified after it is created."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    clear = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list.__repr__(self)})"
+
+
+class ConfigSnapshot(FrozenDict):
+    """Read-only config tree of one server version, with its flat index.
+
+    Readers keep using the snapshot they got while a refresh builds and
+    publishes the next one, so they never take locks or see a partial config.
+    Subtrees equal to the previous snapshot are reused, not copied.
+
+    Usage:
+
+    snapshot = client.config
+    snapshot.version, snapshot.revision
+    snapshot['spring']['cloud']
+    """
+
+    __slots__ = ("version", "revision", "index")
+
+    def __init__(
+        self,
+        data: Any = (),
+        version: Optional[str] = None,
+        revision: int = 0,
+        index: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(data)
+        self.version = version
+        self.revision = revision
+        self.index = build_index(self) if index is None else index
+
+    @classmethod
+    def build(
+        cls,
+        config: dict,
+        previous: Optional[Mapping] = None,
+        version: Optional[str] = None,
+    ) -> "ConfigSnapshot":
+        """Freeze config, sharing the subtrees that didn't change since previous."""
+        frozen = freeze(config, previous)
+        revision = getattr(previous, "revision", 0) + 1
+        return cls(frozen, version, revision)
+
+    def __reduce__(self):
+        return type(self), (dict(self), self.version, self.revision)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(version={self.version!r}, "
+            f"revision={self.revision}, {dict.__repr__(self)})"
+        )
+
+
+def freeze(value: Any, previous: Any = _MISSING) -> Any:
+    """Read-only copy of value, reusing the parts of previous equal to it."""
+    if isinstance(value, dict):
+        old = previous if isinstance(previous, FrozenDict) else None
+        same = old is not None and len(old) == len(value)
+        items = {}
+        for key, item in value.items():
+            before = old.get(key, _MISSING) if old is not None else _MISSING
+            items[key] = frozen = freeze(item, before)
+            same = same and frozen is before
+        return old if same and type(old) is FrozenDict else FrozenDict(items)
+    if isinstance(value, list):
+        old_list = previous if isinstance(previous, FrozenList) else None
+        same = old_list is not None and len(old_list) == len(value)
+        elements = []
+        for position, item in enumerate(value):
+            before = old_list[position] if same else _MISSING  # type: ignore
+            elements.append(freeze(item, before))
+            same = same and elements[-1] is before
+        return old_list if same else FrozenList(elements)
+    if type(value) is type(previous) and value == previous:
+        return previous
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Plain dict/list copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
@@ -2,23 +2,71 @@
 
 import asyncio
 import os
+import re
+import threading
+from bisect import bisect_left
 from functools import partial, wraps
-from typing import Any, Callable, Dict, KeysView, Optional, Tuple
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import requests
 from attrs import converters, field, fields_dict, mutable, validators
 from glom import glom
 
-from . import http
-from ._config import merge_dict, to_dict
+from . import cipher, decoder, http, persistence
+from ._config import build_index, merge_sources
 from .auth import OAuth2
+from .changes import ChangeListeners, Listener, diff
+from .compact import CompactConfig
 from .core import singleton
+from .decoder import Decoder
 from .exceptions import RequestFailedException
+from .failover import ReplicaSet
+from .layers import LayeredConfig
 from .logger import logger
+from .placeholders import PlaceholderResolver, apply, has_placeholders
+from .singleflight import SingleFlight
+from .snapshot import ConfigSnapshot, thaw
+
+_DECRYPT_OPTIONS = ("auth", "cert", "session", "timeout", "verify")
+MODES = ("merged", "layered", "compact")
+_NEGATIVE_INDEX = re.compile(r"(^|\.)-\d")
+
+
+def _negative_index(key: str) -> bool:
+    return "-" in key and _NEGATIVE_INDEX.search(key) is not None
+
+
+def _tree(config: Any) -> dict:
+    return config.tree if isinstance(config, LayeredConfig) else config
+
+
+def _lookup(config: Any, index: Mapping[str, Any], key: str, default: Any) -> Any:
+    if not isinstance(key, str) or "*" in key or _negative_index(key):
+        return glom(_tree(config), key, default=default)
+    return index.get(key, default)
+
+
+def _index(config: Mapping) -> Mapping[str, Any]:
+    if isinstance(config, (ConfigSnapshot, CompactConfig)):
+        return config.index
+    return build_index(dict(config))
 
 
 @mutable
-class ConfigClient:
-    """Spring Cloud Config Client."""
+class BaseConfigClient:
+    """Settings and server response handling shared by the config clients."""
 
     address: str = field(
         default=os.getenv("CONFIGSERVER_ADDRESS", "http://localhost:8888"),
@@ -45,21 +93,438 @@ class ConfigClient:
         default=None,
         validator=validators.optional(validators.instance_of(OAuth2)),
     )
-    _config: dict = field(
-        factory=dict,
+    hedge: bool = field(  # type: ignore
+        default=os.getenv("CONFIG_HEDGE", False),
+        validator=validators.instance_of(bool),
+        converter=converters.to_bool,
+    )
+    snapshot_path: Optional[str] = field(
+        default=os.getenv("CONFIG_SNAPSHOT_PATH"),
+        validator=validators.optional(validators.instance_of(str)),
+    )
+    decryptor: Optional[cipher.Decryptor] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(cipher.Decryptor)),  # type: ignore
+        repr=False,
+    )
+    mode: str = field(
+        default=os.getenv("CONFIG_MODE", "merged"),
+        validator=validators.in_(MODES),
+    )
+    resolve_placeholders: bool = field(  # type: ignore
+        default=os.getenv("CONFIG_RESOLVE_PLACEHOLDERS", False),
+        validator=validators.instance_of(bool),
+        converter=converters.to_bool,
+    )
+    stream: bool = field(  # type: ignore
+        default=os.getenv("CONFIG_STREAM", False),
+        validator=validators.instance_of(bool),
+        converter=converters.to_bool,
+    )
+    json_decoder: Decoder = field(
+        default=decoder.loads,
+        validator=validators.is_callable(),
+        repr=False,
+    )
+    _config: Any = field(
+        factory=ConfigSnapshot,
         init=False,
-        validator=validators.instance_of(dict),
+        validator=validators.instance_of(Mapping),  # type: ignore
         repr=False,
     )
+    _layered: Optional[LayeredConfig] = field(default=None, init=False, repr=False)
+    _resolver: PlaceholderResolver = field(
+        factory=PlaceholderResolver, init=False, repr=False
+    )
+    _listeners: ChangeListeners = field(factory=ChangeListeners, init=False, repr=False)
+    _indexed: Tuple[Optional[Mapping], Dict[str, Any]] = field(
+        default=(None, {}), init=False, repr=False
+    )
+    _sorted: Tuple[Optional[Mapping], List[str]] = field(
+        default=(None, []), init=False, repr=False
+    )
+    _versions: Dict[Tuple[str, str, str], Tuple[Optional[str], Any]] = field(
+        factory=dict, init=False, repr=False
+    )
+    _etags: Dict[Tuple[str, str, str], str] = field(
+        factory=dict, init=False, repr=False
+    )
+    _replicas: Optional[ReplicaSet] = field(default=None, init=False, repr=False)
+
+    @property
+    def replicas(self) -> ReplicaSet:
+        """Config server replicas parsed from the comma separated address."""
+        if self._replicas is None or self._replicas.source != self.address:
+            self._replicas = ReplicaSet.from_address(self.address)
+        self._replicas.hedge = self.hedge
+        return self._replicas
 
     @property
     def url(self) -> str:
         """URL that will be used to request config."""
-        return f"{self.address}/{self.app_name}/{self.profile}/{self.label}"
+        return f"{self.replicas.primary.address}{self._path}"
+
+    @property
+    def _path(self) -> str:
+        return f"/{self.app_name}/{self.profile}/{self.label}"
+
+    @property
+    def version(self) -> Optional[str]:
+        """Server version (e.g. git commit) of the last config applied for app/profile/label."""
+        return self._versions.get(self._target, (None, None))[0]
+
+    @property
+    def _target(self) -> Tuple[str, str, str]:
+        return self.app_name, self.profile, self.label
+
+    def _conditional_headers(self, kwargs: dict) -> dict:
+        etag = self._etags.get(self._target)
+        if etag:
+            headers = dict(kwargs.get("headers") or {})
+            headers.setdefault("If-None-Match", etag)
+            kwargs["headers"] = headers
+        return kwargs
+
+    def _request_failed(self, err: Exception) -> bool:
+        logger.error(f"Failed to request: {self.url}")
+        logger.error(err)
+        if self.snapshot_path and (
+            self._target in self._versions or self.load_snapshot()
+        ):
+            logger.warning(
+                f"Using last-known-good config: [path='{self.snapshot_path}']"
+            )
+            return False
+        if self.fail_fast:
+            logger.info("fail_fast enabled. Terminating process.")
+            raise SystemExit("fail_fast enabled. Terminating process.")
+        raise ConnectionError("fail_fast disabled.")
+
+    def load_snapshot(self) -> bool:
+        """Load the last-known-good config saved on snapshot_path.
+
+        The version is restored too, so the next get_config skips parsing
+        when the server still has the same version.
+
+        :return: True if a snapshot for app_name/profile/label was loaded.
+        """
+        if not self.snapshot_path:
+            return False
+        snapshot = persistence.load_snapshot(self.snapshot_path)
+        if snapshot is None or snapshot.target != self._target:
+            return False
+        previous = self.config if self._listeners else None
+        self._publish(snapshot.config, snapshot.version)
+        self._notify(previous)
+        self._published((snapshot.version, snapshot.state))
+        logger.debug(f"Snapshot loaded: [version='{snapshot.version}']")
+        return True
+
+    def _save_snapshot(self, revision: Tuple[Optional[str], Any]) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            persistence.save_snapshot(
+                self.snapshot_path,
+                persistence.Snapshot(self._target, *revision, thaw(self.config)),
+            )
+        except (OSError, ValueError) as err:
+            logger.warning(f"Failed to save snapshot: [error='{err}']")
+
+    def _pending(self, environment: Optional[dict]) -> bool:
+        """True when the environment differs from the version already applied."""
+        if environment is None:
+            return False
+        version = environment.get("version")
+        revision = (version, environment.get("state"))
+        return version is None or self._versions.get(self._target) != revision
+
+    def _ciphers(self, environment: Optional[dict]) -> Set[str]:
+        """Ciphertexts to decrypt before applying the environment."""
+        if self.decryptor is None or environment is None:
+            return set()
+        if not self._pending(environment):
+            return set()
+        # streamed sources are read here and merged after the decryption
+        sources = environment["propertySources"] = list(
+            environment.get("propertySources", [])
+        )
+        return cipher.find_ciphers(source["source"] for source in sources)
+
+    def _decrypt_options(self, kwargs: dict) -> dict:
+        """Keyword arguments of get_config that also apply to decrypt requests."""
+        options = {k: v for k, v in kwargs.items() if k in _DECRYPT_OPTIONS}
+        headers = {"Content-Type": "text/plain"}
+        authorization = (kwargs.get("headers") or {}).get("Authorization")
+        if authorization:
+            headers["Authorization"] = authorization
+        options["headers"] = headers
+        return options
+
+    def _apply(
+        self,
+        environment: Optional[dict],
+        etag: Optional[str] = None,
+        plaintexts: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """Build the config from a server environment and swap it in.
+
+        The new tree is merged off to the side and published with a single
+        assignment, so readers never observe a partially merged config.
+        Returns False, skipping the parse and merge, when the server answered
+        304 Not Modified or reported the same version and state already applied.
+        {cipher} values found in plaintexts are replaced before the merge.
+        """
+        target = self._target
+        if environment is None:
+            logger.debug(f"Config not modified: [url='{self.url}', etag='{etag}']")
+            return False
+        changed = self._pending(environment)
+        if changed:
+            previous = self.config if self._listeners else None
+            layers = (
+                (source.get("name", ""), source["source"])
+                for source in environment["propertySources"]
+            )
+            if plaintexts:
+                layers = (
+                    (name, cipher.decrypt_source(source, plaintexts))
+                    for name, source in layers
+                )
+            if self.mode == "layered":
+                config: Any = LayeredConfig.build(layers, self._layered)
+            else:
+                config = self._resolve(source for _, source in layers)
+            # a streamed environment may send them after the sources
+            revision = (environment.get("version"), environment.get("state"))
+            if isinstance(config, LayeredConfig):
+                self._publish_layers(config, revision[0])
+            else:
+                self._publish(config, revision[0])
+            self._published(revision)
+            self._save_snapshot(revision)
+            self._notify(previous)
+        else:
+            version = environment.get("version")
+            logger.debug(f"Config unchanged: [url='{self.url}', version='{version}']")
+        if etag:
+            self._etags[target] = etag
+        else:
+            self._etags.pop(target, None)
+        return changed
+
+    def _published(self, revision: Tuple[Optional[str], Any]) -> None:
+        # there is a single config, versions and etags of other targets
+        # (e.g. a previous profile) no longer describe it
+        self._versions = {self._target: revision}
+        self._etags = {k: v for k, v in self._etags.items() if k == self._target}
+
+    def _publish(self, config: dict, version: Optional[str] = None) -> None:
+        """Freeze config into a new snapshot and swap it in with one assignment."""
+        kind = CompactConfig if self.mode == "compact" else ConfigSnapshot
+        self._config = kind.build(config, self._config, version)
+        self._layered = None
+
+    def _publish_layers(self, layered: LayeredConfig, version: Optional[str]) -> None:
+        """Swap in new layers, built reusing the property sources that didn't change."""
+        layered.version = version
+        if self.resolve_placeholders:
+            layered.resolve_placeholders(self._resolver)
+        self._layered = layered
+
+    def _resolve(self, sources: Iterable[dict]) -> dict:
+        """Merge the sources, read only once, and replace their ${...} placeholders."""
+        templated: List[dict] = []
+
+        def scan(sources: Iterable[dict]) -> Iterator[dict]:
+            for source in sources:
+                if not templated and any(map(has_placeholders, source.values())):
+                    templated.append(source)
+                yield source
+
+        config = merge_sources(scan(sources) if self.resolve_placeholders else sources)
+        if not templated:
+            self._resolver.clear()
+            return config
+        apply(config, self._resolver.resolve(build_index(config)))
+        return config
+
+    def _notify(self, previous: Optional[Mapping]) -> None:
+        """Send the changes since previous to the listeners of their keys."""
+        if previous is None:
+            return
+        changes = diff(previous, self.config)
+        called = self._listeners.dispatch(changes)
+        logger.debug(f"Config changes: [keys={len(changes)}, listeners={called}]")
+
+    def on_change(self, prefix: str = "", listener: Optional[Listener] = None) -> Any:
+        """Register a listener of the keys under prefix, called after each change.
+
+        The listener receives the list of ConfigChange of its keys and only
+        runs when one of them changed.
+
+        Usage:
+
+        # Example 1:
+        client.on_change('spring.datasource', lambda changes: pool.rebuild())
+
+        # Example 2:
+        @client.on_change('logging.level')
+        def set_levels(changes):
+            ...
+
+        :param prefix: dotted prefix, every key if empty. [default=''].
+        :param listener: callable receiving a list of ConfigChange.
+
+        :return: the listener, or a decorator when listener is not given.
+        """
+        if listener is None:
+            return partial(self.on_change, prefix)
+        self._listeners.add(prefix, listener)
+        return listener
+
+    def remove_listener(self, prefix: str, listener: Listener) -> bool:
+        """Unregister a listener added by on_change with the same prefix."""
+        return self._listeners.remove(prefix, listener)
+
+    def _current(self) -> Tuple[Any, Mapping[str, Any]]:
+        """Current config and its flat index, rebuilt if _config was replaced."""
+        layered = self._layered
+        if layered is not None:
+            return layered, layered
+        config = self._config
+        if isinstance(config, (ConfigSnapshot, CompactConfig)):
+            return config, config.index
+        indexed, index = self._indexed
+        if indexed is not config:
+            index = build_index(config)
+            self._indexed = (config, index)
+        return config, index
+
+    def _sorted_keys(self, index: Mapping[str, Any]) -> List[str]:
+        keys_of, keys = self._sorted
+        if keys_of is not index:
+            keys = sorted(index)
+            self._sorted = (index, keys)
+        return keys
+
+    @property
+    def config(self) -> Mapping:
+        """Getter from configurations retrieved from ConfigClient.
+
+        The config is a read-only ConfigSnapshot: each refresh publishes a new
+        one, so a reference kept by the caller never changes under it.
+        In layered mode the snapshot is merged from the layers on first use,
+        in compact mode it's a CompactConfig.
+        """
+        layered = self._layered
+        return layered.tree if layered is not None else self._config
+
+    def get(self, key: str, default: Any = "") -> Any:
+        """Loads a configuration from a key.
+
+        Usage:
+
+        # Example 1:
+        client.get('spring')
+
+        # Exampel 2:
+        client.get('spring.cloud.consul')
+
+        Dotted keys are a single lookup on a flat index built when the config
+        is applied, star paths, negative indices and other glom specs are
+        resolved by glom.
+
+        :param key: configuration key.
+        :param default: default value if key does not exist. [default=''].
+        """
+        return _lookup(*self._current(), key, default)
+
+    def get_many(self, keys: Iterable[str], default: Any = "") -> Dict[str, Any]:
+        """Loads many configurations at once.
+
+        Usage:
 
-    def get_config(self, **kwargs) -> None:
+        client.get_many(['spring.datasource.url', 'spring.datasource.username'])
+
+        :param keys: configuration keys.
+        :param default: value of the keys that do not exist. [default=''].
+
+        :return: dict of key -> value, in the same order as keys.
+        """
+        config, index = self._current()
+        return {key: _lookup(config, index, key, default) for key in keys}
+
+    def iter_prefix(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        """Iterates over the (key, value) leaves under a prefix, sorted by key.
+
+        Usage:
+
+        for key, value in client.iter_prefix('spring.datasource'):
+            ...
+
+        :param prefix: dotted prefix, the whole config if empty. [default=''].
+        """
+        _, index = self._current()
+        keys = self._sorted_keys(index)
+        start = f"{prefix}." if prefix else ""
+        for position in range(bisect_left(keys, start), len(keys)):
+            key = keys[position]
+            if not key.startswith(start):
+                break
+            value = index[key]
+            if not value or not isinstance(value, (Mapping, list)):
+                yield key, value
+
+    def get_prefix(self, prefix: str, nested: bool = False) -> Mapping[str, Any]:
+        """Loads every configuration under a prefix.
+
+        Usage:
+
+        # Example 1: {'url': '...', 'hikari.maximum-pool-size': 20}
+        client.get_prefix('spring.datasource')
+
+        # Example 2: {'url': '...', 'hikari': {'maximum-pool-size': 20}}
+        client.get_prefix('spring.datasource', nested=True)
+
+        :param prefix: dotted prefix.
+        :param nested: return the subtree instead of flat keys. [default=False].
+
+        :return: keys relative to the prefix, empty if there are none.
+        """
+        if nested:
+            config, index = self._current()
+            subtree = index.get(prefix) if prefix else _tree(config)
+            return subtree if isinstance(subtree, Mapping) else {}
+        offset = len(prefix) + 1 if prefix else 0
+        return {key[offset:]: value for key, value in self.iter_prefix(prefix)}
+
+    def keys(self) -> KeysView:
+        return self.config.keys()
+
+
+@mutable
+class ConfigClient(BaseConfigClient):
+    """Spring Cloud Config Client."""
+
+    session: Optional[requests.Session] = field(
+        default=None,
+        validator=validators.optional(validators.instance_of(requests.Session)),
+        repr=False,
+    )
+    _flight: SingleFlight = field(factory=SingleFlight, init=False, repr=False)
+
+    @property
+    def coalesced(self) -> int:
+        """Calls of get_config that shared the request of a concurrent one."""
+        return self._flight.coalesced
+
+    def get_config(self, **kwargs) -> bool:
         """Request the configuration to the config server.
 
+        Threads calling it while a request is in flight wait for that
+        request and get its result, instead of sending their own.
+
         Usage:
 
         # Example 1:
@@ -69,28 +534,42 @@ class ConfigClient:
         client.get_config(verify=False)
 
         :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: False if the server reported no change since the last request.
         """
-        kwargs = self._configure_oauth2(**kwargs)
+        return self._flight.do(self._target, self._fetch, **kwargs)
+
+    def _fetch(self, **kwargs) -> bool:
+        kwargs = self._with_session(
+            self._conditional_headers(self._configure_oauth2(**kwargs))
+        )
+        options = dict(kwargs, stream=True) if self.stream else kwargs
         try:
-            response = http.get(self.url, **kwargs)
+            response = self.replicas.call(
+                lambda address: http.get(f"{address}{self._path}", **options)
+            )
         except Exception as err:
-            logger.error(f"Failed to request: {self.url}")
-            logger.error(err)
-            if self.fail_fast:
-                logger.info("fail_fast enabled. Terminating process.")
-                raise SystemExit("fail_fast enabled. Terminating process.")
-            raise ConnectionError("fail_fast disabled.")
-        fconfig = [
-            to_dict(config)
-            for config in reversed(
-                glom(response.json(), ("propertySources", ["source"]))
+            return self._request_failed(err)
+        with response:
+            etag = response.headers.get("ETag")
+            if response.status_code == 304:
+                return self._apply(None, etag)
+            environment = self._decode(response)
+            try:
+                plaintexts = self._decrypt(environment, kwargs)
+            except Exception as err:
+                return self._request_failed(err)
+            return self._apply(environment, etag, plaintexts)
+
+    def _decode(self, response: requests.Response) -> dict:
+        if self.stream:
+            return decoder.stream_environment(
+                response.iter_content(decoder.CHUNK_SIZE), self.json_decoder
             )
-        ]
-        server_config: dict = {}
-        [merge_dict(server_config, c) for c in fconfig]
-        merge_dict(self._config, server_config)
+        environment: dict = self.json_decoder(response.content)
+        return environment
 
-    async def get_config_async(self, **kwargs) -> None:
+    async def get_config_async(self, **kwargs) -> bool:
         """Request the configuration to the config server.
 
         Usage:
@@ -102,9 +581,42 @@ class ConfigClient:
         await client.get_config_async(verify=False)
 
         :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: False if the server reported no change since the last request.
         """
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, partial(self.get_config, **kwargs))
+        return await loop.run_in_executor(None, partial(self.get_config, **kwargs))
+
+    def warm_start(self, **kwargs) -> bool:
+        """Load the last-known-good snapshot and revalidate it in the background.
+
+        Without a snapshot, the config is requested synchronously.
+
+        Usage:
+
+        client = ConfigClient(app_name='foo', snapshot_path='/var/cache/foo.snapshot')
+        client.warm_start()
+
+        :param kwargs: any keyword argument used to configure oauth2 or request for the server.
+
+        :return: True if the snapshot was loaded.
+        """
+        if not self.load_snapshot():
+            self.get_config(**kwargs)
+            return False
+        threading.Thread(
+            target=self._revalidate,
+            kwargs=kwargs,
+            name="config-client-revalidate",
+            daemon=True,
+        ).start()
+        return True
+
+    def _revalidate(self, **kwargs) -> None:
+        try:
+            self.get_config(**kwargs)
+        except (Exception, SystemExit) as err:
+            logger.error(f"Failed to revalidate snapshot: [error='{err}']")
 
     def _configure_oauth2(self, **kwargs) -> dict:
         if self.oauth2:
@@ -115,6 +627,36 @@ class ConfigClient:
                 kwargs.update(dict(headers=self.oauth2.authorization_header))
         return kwargs
 
+    def _decrypt(self, environment: dict, kwargs: dict) -> Dict[str, str]:
+        ciphertexts = self._ciphers(environment)
+        if not ciphertexts:
+            return {}
+        return self.decryptor.decrypt_all(  # type: ignore
+            ciphertexts, self, **self._decrypt_options(kwargs)
+        )
+
+    def _with_session(self, kwargs: dict) -> dict:
+        if self.session is not None:
+            kwargs.setdefault("session", self.session)
+        return kwargs
+
+    def _text(self, path: str, request: Callable[[str], requests.Response]) -> str:
+        failed = [self.address]
+
+        def call(address: str) -> requests.Response:
+            try:
+                return request(f"{address}{path}")
+            except Exception:
+                failed.append(address)
+                raise
+
+        try:
+            response = self.replicas.call(call)
+        except Exception:
+            # the URL of the replica that failed last, not the whole address list
+            raise RequestFailedException(f"{failed[-1]}{path}")
+        return response.text
+
     def get_file(self, filename: str, **kwargs: dict) -> str:
         """Request a file from the config server.
 
@@ -126,12 +668,10 @@ class ConfigClient:
         :param filename: filename to retrieve from the server.
         :param kwargs: any keyword argument used to configure request for the server.
         """
-        uri = f"{self.address}/{self.app_name}/{self.profile}/{self.label}/{filename}"
-        try:
-            response = http.get(uri, **kwargs)
-        except Exception:
-            raise RequestFailedException(f"{uri}")
-        return response.text
+        options: dict = self._with_session(kwargs)
+        return self._text(
+            f"{self._path}/{filename}", lambda url: http.get(url, **options)
+        )
 
     def encrypt(
         self,
@@ -152,13 +692,11 @@ class ConfigClient:
         :param headers: HTTP Headers to send to server.
         :param kwargs: any keyword argument used to configure request for the server.
         """
-        try:
-            response = http.post(
-                uri=f"{self.address}{path}", data=value, headers=headers, **kwargs
-            )
-        except Exception:
-            raise RequestFailedException(f"{self.address}{path}")
-        return response.text
+        options: dict = self._with_session(kwargs)
+        return self._text(
+            path,
+            lambda url: http.post(uri=url, data=value, headers=headers, **options),
+        )
 
     def decrypt(
         self,
@@ -179,38 +717,11 @@ class ConfigClient:
         :param headers: HTTP Headers to send to server.
         :param kwargs: any keyword argument used to configure request for the server.
         """
-        try:
-            response = http.post(
-                uri=f"{self.address}{path}", data=value, headers=headers, **kwargs
-            )
-        except Exception:
-            raise RequestFailedException(f"{self.address}{path}")
-        return response.text
-
-    @property
-    def config(self) -> dict:
-        """Getter from configurations retrieved from ConfigClient."""
-        return self._config
-
-    def get(self, key: str, default: Any = "") -> Any:
-        """Loads a configuration from a key.
-
-        Usage:
-
-        # Example 1:
-        client.get('spring')
-
-        # Exampel 2:
-        client.get('spring.cloud.consul')
-
-
-        :param key: configuration key.
-        :param default: default value if key does not exist. [default=''].
-        """
-        return glom(self._config, key, default=default)
-
-    def keys(self) -> KeysView:
-        return self._config.keys()
+        options: dict = self._with_session(kwargs)
+        return self._text(
+            path,
+            lambda url: http.post(uri=url, data=value, headers=headers, **options),
+        )
 
 
 @singleton
@@ -235,6 +746,12 @@ def create_config_client(**kwargs) -> ConfigClient:
     :param profile: config profile [default=development]
     :param fail_fast: enable fail_fast [default=True].
     :param oauth2: Spring Cloud Config Server.
+    :param hedge: enable hedged requests when address has many replicas [default=False].
+    :param snapshot_path: file used to keep the last-known-good config.
+    :param decryptor: decrypt {cipher} values while requesting the config, they are written decrypted to snapshot_path.
+    :param mode: merged, layered or compact config storage [default=merged].
+    :param resolve_placeholders: replace ${key:default} on values [default=False].
+    :param session: custom requests.Session used for every request.
 
     :return: ConfigClient instance.
     """
@@ -84,6 +84,33 @@ def config_mock(*args, **kwargs):
         return resp
 
 
+PLACEHOLDERS = {
+    "name": "test_app",
+    "profiles": ["development"],
+    "propertySources": [
+        {
+            "name": "test_app.yml",
+            "source": {
+                "app.url": "http://${spring.cloud.consul.host}:${server.port:80}"
+            },
+        },
+        {
+            "name": "application.yml",
+            "source": {"spring.cloud.consul.host": "discovery", "server.port": 8080},
+        },
+    ],
+    "version": "b478bb5c9784bb2285c461892fab22361007e0c9",
+}
+
+
+def placeholders_mock(*args, **kwargs):
+    URL = "http://localhost:8888/test_app/development/master"
+    with requests_mock.Mocker() as m:
+        m.get(URL, json=PLACEHOLDERS)
+        resp = requests.get(URL)
+        return resp
+
+
 def oauth2_mock(*args, **kwargs):
     URL = "https://p-spring-cloud-services.uaa.sys.example.com/oauth/token"
     with requests_mock.Mocker() as m:
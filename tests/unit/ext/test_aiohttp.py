@@ -1,8 +1,16 @@
+import asyncio
+
 import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestClient, TestServer
 from aiohttp.web import Application
+from requests import Session
 
-from config import http
-from config.ext.aiohttp import AioHttpConfig
+from config import http, spring
+from config._config import build_tree
+from config.aio import AsyncConfigClient
+from config.ext.aiohttp import AioHttpConfig, _Config
+from config.snapshot import ConfigSnapshot
 from config.spring import ConfigClient
 from tests import conftest
 
@@ -36,6 +44,13 @@ def test_aiohttp_get_config_dict(aiohttp_app, monkeypatch):
     assert aiohttp_app["config"]["spring"]["cloud"]["consul"]["host"] == "discovery"
 
 
+def test_aiohttp_get_config_placeholders(aiohttp_app, monkeypatch):
+    monkeypatch.setattr(http, "get", conftest.placeholders_mock)
+    client = ConfigClient(app_name="test_app", resolve_placeholders=True)
+    AioHttpConfig(aiohttp_app, client=client)
+    assert aiohttp_app["config"].get("app.url") == "http://discovery:8080"
+
+
 def test_invalid_aiohttp_app():
     with pytest.raises(TypeError):
         AioHttpConfig(int)
@@ -44,3 +59,89 @@ def test_invalid_aiohttp_app():
 def test_invalid_config_client_aiohttp_app(aiohttp_app):
     with pytest.raises(TypeError):
         AioHttpConfig(aiohttp_app, client=int)
+
+
+@pytest.fixture
+def config_server():
+    versions = iter(["v1", "v2"])
+
+    async def config(request):
+        body = dict(conftest.CONFIG, version=next(versions, "v2"))
+        return web.json_response(body)
+
+    app = Application()
+    app.router.add_get("/{app}/{profile}/{label}", config)
+    return TestServer(app)
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_setup(config_server):
+    async with config_server:
+        client = AsyncConfigClient(
+            address=str(config_server.make_url("")).rstrip("/"), app_name="test_app"
+        )
+        app = Application()
+        AioHttpConfig.setup(app, client=client, interval=0.01, jitter=0)
+        async with TestClient(TestServer(app)):
+            config = app["config"]
+            assert config.get("spring.cloud.consul.host") == "discovery"
+            assert isinstance(client.session, ClientSession)
+            session = client.session
+            while client.version != "v2":
+                await asyncio.sleep(0.01)
+            assert config is app["config"]
+            assert config == client.config
+        assert client.session is None
+        assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_setup_config_client(monkeypatch):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    client = ConfigClient(app_name="test_app")
+    app = Application()
+    AioHttpConfig.setup(app, client=client)
+    async with TestClient(TestServer(app)):
+        assert app["config"]["spring"]["cloud"]["consul"]["host"] == "discovery"
+        assert isinstance(client.session, Session)
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_setup_monitor(config_server):
+    async with config_server:
+        client = AsyncConfigClient(
+            address=str(config_server.make_url("")).rstrip("/"), app_name="test_app"
+        )
+        app = Application()
+        AioHttpConfig.setup(app, client=client, monitor="/monitor")
+        async with TestClient(TestServer(app)) as test_client:
+            config = app["config"]
+            assert client.version == "v1"
+            response = await test_client.post("/monitor", json={"path": "other.yml"})
+            assert await response.json() == {"refresh": False}
+            response = await test_client.post(
+                "/monitor", json={"destinationService": "test_app:**"}
+            )
+            assert await response.json() == {"refresh": True}
+            while client.version != "v2":
+                await asyncio.sleep(0.01)
+            assert config == client.config
+            response = await test_client.post("/monitor", data=b"{")
+            assert response.status == 400
+
+
+def test_aiohttp_setup_invalid_client():
+    with pytest.raises(TypeError):
+        AioHttpConfig.setup(Application(), client=int)
+
+
+def test_aiohttp_config_index(mocker):
+    source = conftest.CONFIG["propertySources"][0]["source"]
+    config = _Config(ConfigSnapshot.build(build_tree(source)))
+    spy = mocker.spy(spring, "glom")
+    assert config.get("python.cache.timeout") == 10
+    assert config.get("missing", "default") == "default"
+    spy.assert_not_called()
+    assert config.get("python.*") == [{"timeout": 10, "type": "simple"}]
+    spy.assert_called_once()
@@ -1,9 +1,19 @@
-from unittest.mock import MagicMock
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastapi import FastAPI
 
 from config import CF, ConfigClient, http
-from config.ext.fastapi import fastapi_cloud_foundry, fastapi_config_client
+from config.aio import AsyncConfigClient
+from config.ext.fastapi import (
+    _refresh_events,
+    config_lifespan,
+    fastapi_cloud_foundry,
+    fastapi_config,
+    fastapi_config_client,
+)
 from tests import conftest
 
 
@@ -104,3 +114,107 @@ async def test_fastapi_config_loaded_correctly(
     client = mock_request_without_config_client.app.config_client
     assert client.get("spring.cloud.consul.host") == "discovery"
     assert client.get("info.app.name") == "test_app"
+
+
+@pytest.mark.asyncio
+async def test_fastapi_config_client_concurrent_requests(
+    mock_request_without_config_client, monkeypatch, mocker
+):
+    """Concurrent first requests share one ConfigClient initialization."""
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    spy = mocker.spy(ConfigClient, "get_config_async")
+    await asyncio.gather(
+        *(fastapi_config_client(mock_request_without_config_client) for _ in range(5))
+    )
+    assert spy.call_count == 1
+    assert isinstance(
+        mock_request_without_config_client.app.config_client, ConfigClient
+    )
+
+
+@pytest.mark.asyncio
+async def test_config_lifespan(monkeypatch, mocker):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    app = FastAPI()
+    client = ConfigClient(app_name="test_app")
+    async with config_lifespan(client)(app):
+        assert app.state.config_client is client
+        assert app.state.config is client.config
+        request = MagicMock()
+        request.app = app
+        assert await fastapi_config(request) is client.config
+        spy = mocker.spy(http, "get")
+        await fastapi_config_client(request)
+        spy.assert_not_called()
+    assert client.get("spring.cloud.consul.host") == "discovery"
+
+
+@pytest.mark.asyncio
+async def test_config_lifespan_refresh(monkeypatch):
+    responses = iter([conftest.CONFIG, dict(conftest.CONFIG, version="v2")])
+
+    def get(*args, **kwargs):
+        response = MagicMock(status_code=200, headers={})
+        response.content = json.dumps(next(responses, conftest.CONFIG)).encode()
+        return response
+
+    monkeypatch.setattr(http, "get", get)
+    app = FastAPI()
+    client = ConfigClient(app_name="test_app")
+    tasks = len(asyncio.all_tasks())
+    async with config_lifespan(client, interval=0.01, jitter=0)(app):
+        first = app.state.config
+        assert len(asyncio.all_tasks()) == tasks + 1
+        while client.version != "v2":
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
+        assert app.state.config is client.config
+        assert app.state.config is not first
+    assert len(asyncio.all_tasks()) == tasks
+
+
+@pytest.mark.asyncio
+async def test_config_lifespan_async_client(mocker):
+    client = AsyncConfigClient(app_name="test_app")
+    get_config = mocker.patch.object(
+        AsyncConfigClient, "get_config", mocker.AsyncMock()
+    )
+    close = mocker.patch.object(AsyncConfigClient, "close", mocker.AsyncMock())
+    async with config_lifespan(client, verify=False)(FastAPI()):
+        get_config.assert_awaited_once_with(verify=False)
+    close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_config_lifespan_fail_fast():
+    client = ConfigClient(address="http://localhost:1", app_name="test_app")
+    with pytest.raises(SystemExit):
+        async with config_lifespan(client)(FastAPI()):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_config_lifespan_monitor(monkeypatch):
+    responses = iter([conftest.CONFIG, dict(conftest.CONFIG, version="v2")])
+
+    def get(*args, **kwargs):
+        response = MagicMock(status_code=200, headers={})
+        response.content = json.dumps(next(responses, conftest.CONFIG)).encode()
+        return response
+
+    monkeypatch.setattr(http, "get", get)
+    app = FastAPI()
+    client = ConfigClient(app_name="test_app")
+    request = MagicMock(app=app, headers={"content-type": "application/json"})
+    async with config_lifespan(client, monitor="/monitor")(app):
+        assert [r for r in app.routes if r.path == "/monitor"]
+        first = app.state.config
+        request.body = AsyncMock(return_value=b'{"path": ["test_app.yml"]}')
+        assert await _refresh_events(request) == {"refresh": True}
+        await app.state.config_receiver.wait()
+        assert client.version == "v2"
+        assert app.state.config is client.config
+        assert app.state.config is not first
+        request.body = AsyncMock(return_value=b"[1]")
+        response = await _refresh_events(request)
+        assert response.status_code == 400
@@ -1,5 +1,9 @@
+import threading
+
 import pytest
-from flask import Flask
+import requests_mock
+from flask import Flask, g
+from flask.config import Config
 
 from config import http
 from config.ext.flask import FlaskConfig, _Config
@@ -41,6 +45,144 @@ def test_flask_get_config_dict(flask_app, monkeypatch):
     assert flask_app.config["spring"]["cloud"]["consul"]["host"] == "discovery"
 
 
+def test_flask_get_config_placeholders(flask_app, monkeypatch):
+    monkeypatch.setattr(http, "get", conftest.placeholders_mock)
+    FlaskConfig(
+        flask_app, client=ConfigClient(app_name="test_app", resolve_placeholders=True)
+    )
+    assert flask_app.config.get("app.url") == "http://discovery:8080"
+    assert flask_app.config["app"]["url"] == "http://discovery:8080"
+
+
 def test_invalid_config_client_flask_app():
     with pytest.raises(TypeError):
         FlaskConfig(None)
+
+
+UPDATED = dict(
+    conftest.CONFIG,
+    version="v2",
+    propertySources=[
+        {"name": "application.yml", "source": {"spring.cloud.consul.host": "consul"}}
+    ],
+)
+
+
+@pytest.fixture
+def refreshed_app():
+    app = Flask(__name__)
+    client = ConfigClient(app_name="test_app")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, [{"json": conftest.CONFIG}, {"json": UPDATED}])
+        extension = FlaskConfig(app, client, interval=60)
+        yield app, extension
+        extension.scheduler.stop()
+
+
+def test_flask_get_uses_index(flask_app, monkeypatch, mocker):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    FlaskConfig(flask_app)
+    spy = mocker.patch("config.spring.glom")
+    assert flask_app.config.get("spring.cloud.consul.port") == 8500
+    assert flask_app.config.get("DEBUG") is False
+    assert flask_app.config.get("spring.missing", "default") == "default"
+    spy.assert_not_called()
+
+
+def test_flask_get_app_settings(monkeypatch):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    app = Flask(__name__)
+    app.config["ENGINE"] = {"pool_size": 5}
+    FlaskConfig(app)
+    app.config["extra"] = {"a": {"b": 1}}
+    assert app.config.get("ENGINE.pool_size") == 5
+    assert app.config.get("extra.a.b") == 1
+    assert app.config.get("extra.a.missing", "default") == "default"
+
+
+def test_flask_get_glom_paths(flask_app, monkeypatch):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    FlaskConfig(flask_app)
+    assert flask_app.config.get("spring.cloud.consul.*") == ["discovery", 8500]
+    assert flask_app.config.get(("info", "app", "name")) == "test_app"
+
+
+def test_flask_refresh(refreshed_app):
+    app, extension = refreshed_app
+    config = app.config
+    assert extension.scheduler.running
+    assert config.get("spring.cloud.consul.host") == "discovery"
+    assert extension.scheduler.refresh() is True
+    assert app.config is config
+    assert config.get("spring.cloud.consul.host") == "consul"
+    assert config.get("spring.cloud.consul.port") is None
+    assert config.snapshot.version == "v2"
+    assert "info" not in config
+    assert config.get("DEBUG") is False
+
+
+def test_flask_request_snapshot(refreshed_app):
+    app, extension = refreshed_app
+    with app.test_request_context():
+        app.preprocess_request()
+        snapshot = g.config
+        extension.scheduler.refresh()
+        assert g.config is snapshot
+        assert g.config.get("spring.cloud.consul.host") == "discovery"
+        assert g.config["info"]["app"]["name"] == "test_app"
+    with app.test_request_context():
+        app.preprocess_request()
+        assert g.config.get("spring.cloud.consul.host") == "consul"
+        assert g.config.version == "v2"
+
+
+def test_flask_monitor():
+    app = Flask(__name__)
+    client = ConfigClient(app_name="test_app")
+    event = {"type": "RefreshRemoteApplicationEvent", "destinationService": "test_app"}
+    with requests_mock.Mocker() as m:
+        m.get(client.url, [{"json": conftest.CONFIG}, {"json": UPDATED}])
+        extension = FlaskConfig(app, client, monitor="/monitor")
+        with app.test_client() as test_client:
+            response = test_client.post("/monitor", json=event)
+            assert response.json == {"refresh": True}
+            assert extension.receiver.wait(1)
+            assert app.config.get("spring.cloud.consul.host") == "consul"
+            response = test_client.post("/monitor", json={"path": "other.yml"})
+            assert response.json == {"refresh": False}
+            response = test_client.post("/monitor", data="{", content_type="text/plain")
+            assert response.status_code == 400
+    assert extension.scheduler is None
+    assert m.call_count == 2
+
+
+def test_flask_publish_is_serialized(monkeypatch, mocker):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    app = Flask(__name__)
+    FlaskConfig(app)
+    config = app.config
+    update = mocker.spy(Config, "update")
+    with config._lock:
+        thread = threading.Thread(target=config._publish, args=({"new": 1},))
+        thread.start()
+        thread.join(0.1)
+        # waits for the publish in progress before touching app.config
+        assert thread.is_alive()
+        update.assert_not_called()
+    thread.join(1)
+    assert config.get("new") == 1
+    assert "spring" not in config
+
+
+def test_flask_get_after_app_config_changes(monkeypatch):
+    monkeypatch.setattr(http, "get", conftest.config_mock)
+    app = Flask(__name__)
+    FlaskConfig(app)
+    app.config["spring"] = {"cloud": {"consul": {"host": "override"}}}
+    assert app.config.get("spring.cloud.consul.host") == "override"
+    assert app.config.get("spring.cloud.consul.port") is None
+    del app.config["spring"]
+    assert app.config.get("spring.cloud.consul.host", "deleted") == "deleted"
+    app.config.update(info={"app": {"name": "updated"}})
+    assert app.config.get("info.app.name") == "updated"
+    assert app.config.get(("info", "app", "name")) == "updated"
@@ -0,0 +1,314 @@
+"""Test aio module."""
+
+import asyncio
+import datetime
+import ssl
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from requests.auth import HTTPBasicAuth
+
+from config import spring
+from config.aio import AsyncConfigClient, _request_kwargs, fetch_many_async
+from config.auth import OAuth2
+from config.exceptions import RequestFailedException, RequestTokenException
+from tests import conftest
+
+
+async def _config(request):
+    assert request.headers.get("Authorization", "Bearer token") == "Bearer token"
+    return web.json_response(conftest.CONFIG)
+
+
+async def _file(request):
+    return web.Response(text=request.headers.get("Authorization", "some text"))
+
+
+async def _echo(request):
+    return web.Response(text=await request.text())
+
+
+async def _token(request):
+    assert request.headers["Authorization"].startswith("Basic ")
+    return web.json_response({"access_token": "token", "expires_in": 3600})
+
+
+@pytest_asyncio.fixture
+async def server():
+    app = web.Application()
+    app.router.add_get("/{app}/{profile}/{label}", _config)
+    app.router.add_get("/{app}/{profile}/{label}/{filename}", _file)
+    app.router.add_post("/encrypt", _echo)
+    app.router.add_post("/decrypt", _echo)
+    app.router.add_post("/oauth/token", _token)
+    async with TestServer(app) as srv:
+        yield srv
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    async with AsyncConfigClient(
+        address=str(server.make_url("")).rstrip("/"), app_name="test_app"
+    ) as cc:
+        yield cc
+
+
+@pytest.mark.asyncio
+async def test_get_config(client):
+    await client.get_config()
+    assert list(client.config) == ["health", "spring", "info", "server", "python"]
+    assert client.get("spring.cloud.consul.host") == "discovery"
+    assert client.get("info.app.description") == "pws test_app - development profile"
+
+
+@pytest.mark.asyncio
+async def test_get_config_reuses_session(client):
+    await client.get_config()
+    session = client.session
+    await client.get_config(timeout=5.0)
+    assert client.session is session
+
+
+@pytest.mark.asyncio
+async def test_close_owned_session(client):
+    await client.get_config()
+    session = client.session
+    await client.close()
+    assert session.closed
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_custom_session_not_closed(server):
+    async with aiohttp.ClientSession() as session:
+        async with AsyncConfigClient(
+            address=str(server.make_url("")).rstrip("/"),
+            app_name="test_app",
+            session=session,
+        ) as cc:
+            await cc.get_config()
+        assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_get_config_failed():
+    async with AsyncConfigClient(address="http://localhost:1", app_name="app") as cc:
+        with pytest.raises(SystemExit):
+            await cc.get_config()
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_disabled():
+    async with AsyncConfigClient(
+        address="http://localhost:1", app_name="app", fail_fast=False
+    ) as cc:
+        with pytest.raises(ConnectionError):
+            await cc.get_config()
+
+
+@pytest.mark.asyncio
+async def test_get_file(client):
+    assert await client.get_file("nginx.conf") == "some text"
+
+
+@pytest.mark.asyncio
+async def test_get_file_error():
+    async with AsyncConfigClient(address="http://localhost:1", app_name="app") as cc:
+        with pytest.raises(RequestFailedException):
+            await cc.get_file("nginx.conf")
+
+
+@pytest.mark.asyncio
+async def test_get_file_error_reports_replica():
+    async with AsyncConfigClient(
+        address="http://localhost:1,http://localhost:2", app_name="app"
+    ) as cc:
+        with pytest.raises(RequestFailedException) as err:
+            await cc.get_file("nginx.conf")
+    assert "[URL='http://localhost:2/app/" in str(err.value)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "auth",
+    [
+        aiohttp.BasicAuth("user", "pass"),
+        HTTPBasicAuth("user", "pass"),
+        ("user", "pass"),
+    ],
+)
+async def test_get_file_with_basic_auth(client, auth):
+    assert await client.get_file("nginx.conf", auth=auth) == "Basic dXNlcjpwYXNz"
+
+
+def _client_cert(tmp_path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "client")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    certfile, keyfile = tmp_path / "client.crt", tmp_path / "client.key"
+    certfile.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    keyfile.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(certfile), str(keyfile)
+
+
+def test_request_kwargs_cert(tmp_path):
+    certfile, keyfile = _client_cert(tmp_path)
+    options = _request_kwargs({"cert": (certfile, keyfile), "verify": False})
+    assert "cert" not in options
+    assert isinstance(options["ssl"], ssl.SSLContext)
+    assert options["ssl"].verify_mode == ssl.CERT_NONE
+    options = _request_kwargs({"cert": (certfile, keyfile)})
+    assert options["ssl"].verify_mode == ssl.CERT_REQUIRED
+
+
+@pytest.mark.asyncio
+async def test_get_file_with_invalid_cert(client, tmp_path):
+    with pytest.raises(RequestFailedException):
+        await client.get_file("nginx.conf", cert=str(tmp_path / "missing.pem"))
+
+
+@pytest.mark.asyncio
+async def test_encrypt_decrypt(client):
+    assert await client.encrypt("my-secret") == "my-secret"
+    assert await client.decrypt(conftest.ENCRYPTED_DATA) == conftest.ENCRYPTED_DATA
+
+
+@pytest.mark.asyncio
+async def test_client_with_auth(server):
+    oauth2 = OAuth2(
+        access_token_uri=str(server.make_url("/oauth/token")),
+        client_id="id",
+        client_secret="secret",
+    )
+    async with AsyncConfigClient(
+        address=str(server.make_url("")).rstrip("/"), app_name="app", oauth2=oauth2
+    ) as cc:
+        await cc.get_config(headers={"X-Client-ID": "test-client"})
+    assert oauth2.token == "token"
+
+
+@pytest.mark.asyncio
+async def test_client_with_auth_failed(server):
+    oauth2 = OAuth2(
+        access_token_uri=str(server.make_url("/invalid")),
+        client_id="id",
+        client_secret="secret",
+    )
+    async with AsyncConfigClient(
+        address=str(server.make_url("")).rstrip("/"), app_name="app", oauth2=oauth2
+    ) as cc:
+        with pytest.raises(RequestTokenException):
+            await cc.get_config()
+
+
+@pytest.mark.parametrize(
+    "attr",
+    ["address", "label", "app_name", "profile", "fail_fast", "oauth2", "url", "config"],
+)
+def test_async_config_client_attributes(attr):
+    assert hasattr(AsyncConfigClient(), attr)
+
+
+@pytest.mark.asyncio
+async def test_get_config_version_unchanged(client, mocker):
+    merge = mocker.spy(spring, "merge_sources")
+    assert await client.get_config() is True
+    assert await client.get_config() is False
+    assert merge.call_count == 1
+    assert client.version == conftest.CONFIG["version"]
+
+
+@pytest.mark.asyncio
+async def test_get_config_coalesced(client, mocker):
+    merge = mocker.spy(spring, "merge_sources")
+    results = await asyncio.gather(*(client.get_config() for _ in range(5)))
+    assert results == [True] * 5
+    assert client.coalesced == 4
+    assert merge.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_config_stream(client, server):
+    async with AsyncConfigClient(
+        address=client.address, app_name="test_app", stream=True
+    ) as cc:
+        assert await cc.get_config() is True
+        assert await cc.get_config() is False
+    await client.get_config()
+    assert cc.config == client.config
+    assert cc.version == conftest.CONFIG["version"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_async(server):
+    results = await fetch_many_async(
+        ["app1", ("app2", "production")],
+        address=str(server.make_url("")).rstrip("/"),
+        limit=2,
+    )
+    assert [r.ok for r in results] == [True, True]
+    assert results[1].profile == "production"
+    assert results[0].client.get("spring.cloud.consul.host") == "discovery"
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_async_errors():
+    results = await fetch_many_async(["app1"], address="http://localhost:1")
+    assert isinstance(results[0].error, ConnectionError)
+
+
+@pytest.mark.asyncio
+async def test_warm_start(server, tmp_path):
+    address = str(server.make_url("")).rstrip("/")
+    path = str(tmp_path / "test_app.snapshot")
+    async with AsyncConfigClient(
+        address=address, app_name="test_app", snapshot_path=path
+    ) as cc:
+        assert await cc.warm_start() is False
+
+    async with AsyncConfigClient(
+        address=address, app_name="test_app", snapshot_path=path
+    ) as cc:
+        assert await cc.warm_start() is True
+        assert cc.get("spring.cloud.consul.host") == "discovery"
+        assert await cc._revalidation is None
+
+
+@pytest.mark.asyncio
+async def test_client_with_cached_token(server, mocker):
+    oauth2 = OAuth2(
+        access_token_uri=str(server.make_url("/oauth/token")),
+        client_id="id",
+        client_secret="secret",
+    )
+    spy = mocker.spy(AsyncConfigClient, "_request_token")
+    async with AsyncConfigClient(
+        address=str(server.make_url("")).rstrip("/"), app_name="app", oauth2=oauth2
+    ) as cc:
+        await asyncio.gather(*(cc.get_config() for _ in range(5)))
+        await cc.get_config()
+    assert spy.call_count == 1
+    assert oauth2.valid
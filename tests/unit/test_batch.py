@@ -0,0 +1,64 @@
+import pytest
+import requests
+import requests_mock
+
+from config import http
+from config.batch import FetchResult, _target_params, fetch_many
+from config.spring import ConfigClient
+from tests import conftest
+
+
+@pytest.mark.parametrize(
+    "target, expected",
+    [
+        ("app", {"app_name": "app"}),
+        (("app", "prod"), {"app_name": "app", "profile": "prod"}),
+        (
+            ("app", "prod", "main"),
+            {"app_name": "app", "profile": "prod", "label": "main"},
+        ),
+    ],
+)
+def test_target_params(target, expected):
+    assert _target_params(target, {}) == expected
+
+
+@pytest.mark.parametrize("target", [(), ("a", "b", "c", "d")])
+def test_invalid_target(target):
+    with pytest.raises(ValueError):
+        _target_params(target, {})
+
+
+def test_fetch_many(mocker):
+    close = mocker.spy(requests.Session, "close")
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json=conftest.CONFIG)
+        m.get("http://localhost:8888/broken/development/master", status_code=500)
+        results = fetch_many(
+            ["app1", ("app2", "production"), ("broken",)], max_workers=2, timeout=5
+        )
+    assert [r.app_name for r in results] == ["app1", "app2", "broken"]
+    assert [r.ok for r in results] == [True, True, False]
+    assert results[1].profile == "production"
+    assert results[0].client.get("spring.cloud.consul.host") == "discovery"
+    assert isinstance(results[2].error, ConnectionError)
+    assert results[2].config == {}
+    assert results[0].client.session is results[1].client.session
+    close.assert_called_once_with(results[0].client.session)
+
+
+def test_fetch_many_custom_session(mocker):
+    session = http.create_session()
+    close = mocker.spy(session, "close")
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json=conftest.CONFIG)
+        results = fetch_many(["app1"], session=session)
+    assert results[0].client.session is session
+    close.assert_not_called()
+    assert isinstance(results[0].client, ConfigClient)
+
+
+def test_fetch_result():
+    result = FetchResult("app", "development", "master", error=ValueError())
+    assert not result.ok
+    assert result.config == {}
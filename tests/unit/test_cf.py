@@ -2,6 +2,7 @@ import pytest
 
 from config import CF, ConfigClient, http
 from config.auth import OAuth2
+from config.cfenv import CFenv
 from tests import conftest
 
 
@@ -85,3 +86,31 @@ def test_custom_properties(monkeypatch):
     cf = CF(oauth2=oauth2, client=client)
     assert cf.client == client
     assert cf.oauth2 == oauth2
+
+
+def test_session_shared_with_client_and_oauth2():
+    session = http.create_session()
+    cf = CF(session=session)
+    assert cf.client.session is session
+    assert cf.oauth2.session is session
+
+
+def test_many_config_server_bindings():
+    cfenv = CFenv(
+        vcap_services={
+            "p-config-server": [
+                {"credentials": {"uri": "http://cfg1"}},
+                {"credentials": {"uri": "http://cfg2"}},
+            ]
+        }
+    )
+    cf = CF(cfenv=cfenv)
+    assert cf.client.replicas.addresses == ["http://cfg1", "http://cfg2"]
+
+
+def test_cf_get_many_and_prefix(cf, monkeypatch):
+    monkeypatch.setattr(cf.client, "_config", {"a": {"b": 1, "c": {"d": 2}}})
+    assert cf.get_many(["a.b", "a.x"]) == {"a.b": 1, "a.x": ""}
+    assert cf.get_prefix("a") == {"b": 1, "c.d": 2}
+    assert cf.get_prefix("a", nested=True) == {"b": 1, "c": {"d": 2}}
+    assert list(cf.iter_prefix("a.c")) == [("a.c.d", 2)]
@@ -80,3 +80,21 @@ def test_custom_vcap_configserver_client_secret(custom_cfenv):
 )
 def test_cfenv_attributes(cfenv, attr):
     assert hasattr(cfenv, attr)
+
+
+def test_configserver_uris(custom_cfenv):
+    assert custom_cfenv.configserver_uris() == ["http://example_uri"]
+
+
+def test_configserver_uris_many_bindings():
+    cfenv = CFenv(
+        vcap_service_prefix="p.config-server",
+        vcap_services={
+            "p.config-server": [
+                {"credentials": {"uri": "http://cfg1"}},
+                {"credentials": {"uri": "http://cfg2"}},
+                {"credentials": {}},
+            ]
+        },
+    )
+    assert cfenv.configserver_uris() == ["http://cfg1", "http://cfg2"]
@@ -0,0 +1,167 @@
+import copy
+
+import pytest
+import requests_mock
+
+from config.changes import ChangeListeners, ConfigChange, diff
+from config.snapshot import ConfigSnapshot
+from config.spring import ConfigClient
+from tests import conftest
+
+OLD = {
+    "spring": {
+        "datasource": {"url": "jdbc:h2:mem", "pool": 5},
+        "application": {"name": "foo"},
+    },
+    "servers": ["a", "b"],
+    "logging": {"level": "INFO"},
+}
+
+
+class Unequal:
+    def __eq__(self, other):
+        raise AssertionError("shared subtree compared")
+
+
+@pytest.mark.parametrize(
+    "change,expected",
+    [
+        (
+            lambda c: c["spring"]["datasource"].update(pool=10),
+            [ConfigChange("spring.datasource.pool", "modified", 5, 10)],
+        ),
+        (
+            lambda c: c["spring"]["datasource"].update(user="sa"),
+            [ConfigChange("spring.datasource.user", "added", None, "sa")],
+        ),
+        (
+            lambda c: c["spring"].pop("application"),
+            [ConfigChange("spring.application", "removed", {"name": "foo"}, None)],
+        ),
+        (
+            lambda c: c["servers"].append("c"),
+            [ConfigChange("servers.2", "added", None, "c")],
+        ),
+        (
+            lambda c: c["servers"].__setitem__(0, "z"),
+            [ConfigChange("servers.0", "modified", "a", "z")],
+        ),
+        (
+            lambda c: c.update(logging="off"),
+            [ConfigChange("logging", "modified", {"level": "INFO"}, "off")],
+        ),
+        (
+            lambda c: c["spring"]["datasource"].update(pool="5"),
+            [ConfigChange("spring.datasource.pool", "modified", 5, "5")],
+        ),
+        (lambda c: None, []),
+    ],
+)
+def test_diff(change, expected):
+    new = copy.deepcopy(OLD)
+    change(new)
+    assert diff(OLD, new) == expected
+
+
+def test_diff_skips_shared_subtrees():
+    shared = {"value": Unequal()}
+    old = {"shared": shared, "a": 1}
+    assert diff(old, {"shared": shared, "a": 2}) == [
+        ConfigChange("a", "modified", 1, 2)
+    ]
+
+
+def test_diff_snapshots():
+    first = ConfigSnapshot.build(OLD)
+    changed = copy.deepcopy(OLD)
+    changed["logging"]["level"] = "DEBUG"
+    second = ConfigSnapshot.build(changed, first)
+    assert second["spring"] is first["spring"]
+    assert diff(first, second) == [
+        ConfigChange("logging.level", "modified", "INFO", "DEBUG")
+    ]
+
+
+def changes(*keys):
+    return [ConfigChange(key, "modified", 1, 2) for key in keys]
+
+
+def test_listeners_by_prefix():
+    calls = []
+    listeners = ChangeListeners()
+    listeners.add("spring.datasource", lambda c: calls.append(("db", c)))
+    listeners.add("spring.*", lambda c: calls.append(("spring", c)))
+    listeners.add("logging", lambda c: calls.append(("logging", c)))
+    listeners.add("", lambda c: calls.append(("all", c)))
+    assert listeners.dispatch(changes("spring.datasource.pool", "server.port")) == 3
+    assert calls == [
+        ("all", changes("spring.datasource.pool", "server.port")),
+        ("spring", changes("spring.datasource.pool")),
+        ("db", changes("spring.datasource.pool")),
+    ]
+
+
+def test_listeners_of_replaced_subtree():
+    calls = []
+    listeners = ChangeListeners()
+    listeners.add("spring.datasource.url", calls.append)
+    listeners.add("spring.application", calls.append)
+    listeners.dispatch(changes("spring"))
+    assert calls == [changes("spring")]
+
+
+def test_listener_called_once_per_dispatch():
+    calls = []
+    listeners = ChangeListeners()
+    listeners.add("spring", calls.append)
+    listeners.add("spring.datasource", calls.append)
+    listeners.dispatch(changes("spring.datasource.url", "spring.datasource.pool"))
+    assert calls == [changes("spring.datasource.url", "spring.datasource.pool")]
+
+
+def test_listener_errors_are_logged(caplog):
+    calls = []
+    listeners = ChangeListeners()
+    listeners.add("a", lambda c: 1 / 0)
+    listeners.add("a", calls.append)
+    assert listeners.dispatch(changes("a")) == 2
+    assert calls == [changes("a")]
+    assert "Failed to notify config change" in caplog.text
+
+
+def test_remove_listener():
+    calls = []
+    listeners = ChangeListeners()
+    listeners.add("a.b", calls.append)
+    assert listeners.remove("a.c", calls.append) is False
+    assert listeners.remove("a.b", calls.append) is True
+    assert len(listeners) == 0
+    assert listeners.dispatch(changes("a.b")) == 0
+    assert calls == []
+
+
+@pytest.mark.parametrize("mode", ["merged", "layered"])
+def test_client_on_change(mode):
+    client = ConfigClient(app_name="test_app", mode=mode)
+    consul, info = [], []
+    client.on_change("spring.cloud.consul", consul.append)
+
+    @client.on_change("info")
+    def on_info(changes):
+        info.append(changes)
+
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        assert len(consul) == len(info) == 1
+        client.get_config()
+        changed = copy.deepcopy(conftest.CONFIG)
+        changed["version"] = "v2"
+        changed["propertySources"][2]["source"]["spring.cloud.consul.port"] = 8501
+        m.get(client.url, json=changed)
+        client.get_config()
+    assert len(info) == 1
+    assert consul[-1] == [
+        ConfigChange("spring.cloud.consul.port", "modified", 8500, 8501)
+    ]
+    assert client.remove_listener("info", on_info) is True
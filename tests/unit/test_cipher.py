@@ -0,0 +1,201 @@
+import os
+import time
+
+import pytest
+import requests_mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from config import persistence
+from config.aio import AsyncConfigClient
+from config.cipher import (
+    DecryptCache,
+    Decryptor,
+    RemoteDecryptor,
+    decrypt_sources,
+    find_ciphers,
+)
+from config.spring import ConfigClient
+
+ENVIRONMENT = {
+    "name": "test_app",
+    "profiles": ["development"],
+    "label": "master",
+    "version": "v1",
+    "state": None,
+    "propertySources": [
+        {
+            "name": "test_app-development.yml",
+            "source": {
+                "db.password": "{cipher}aaa",
+                "db.user": "app",
+                "cache.password": "{cipher}aaa",
+            },
+        },
+        {
+            "name": "application.yml",
+            "source": {"db.password": "{cipher}bbb", "db.host": "localhost"},
+        },
+    ],
+}
+
+
+def _decrypt(request, context):
+    return request.text.upper()
+
+
+def test_find_ciphers():
+    sources = [ps["source"] for ps in ENVIRONMENT["propertySources"]]
+    assert find_ciphers(sources) == {"aaa", "bbb"}
+
+
+def test_decrypt_sources_reuses_plain_sources():
+    plain = {"a": 1}
+    sources = [{"b": "{cipher}x", "c": "{cipher}y"}, plain]
+    assert decrypt_sources(sources, {"x": "X"}) == [
+        {"b": "X", "c": "{cipher}y"},
+        plain,
+    ]
+    assert decrypt_sources(sources, {})[1] is plain
+
+
+def test_cache_lru():
+    cache = DecryptCache(maxsize=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_cache_ttl(mocker):
+    cache = DecryptCache(ttl=10)
+    cache.put("a", "A")
+    mocker.patch("config.cipher.time.monotonic", return_value=time.monotonic() + 11)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_get_config_decrypts_once_per_ciphertext():
+    client = ConfigClient(app_name="test_app", decryptor=RemoteDecryptor())
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        decrypt = m.post(f"{client.address}/decrypt", text=_decrypt)
+        client.get_config()
+    assert decrypt.call_count == 2
+    assert client.get("db.password") == "AAA"
+    assert client.get("cache.password") == "AAA"
+    assert client.get("db.user") == "app"
+    assert client.decryptor.stats.values == 2
+    assert client.decryptor.stats.calls == 2
+
+
+def test_decryptor_is_abstract():
+    with pytest.raises(TypeError):
+        Decryptor()
+
+
+def test_snapshot_keeps_plaintexts(tmp_path):
+    # the last-known-good config must be usable without the server
+    path = tmp_path / "test_app.snapshot"
+    client = ConfigClient(
+        app_name="test_app", decryptor=RemoteDecryptor(), snapshot_path=str(path)
+    )
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        m.post(f"{client.address}/decrypt", text=_decrypt)
+        client.get_config()
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    snapshot = persistence.load_snapshot(str(path))
+    assert snapshot.config["db"]["password"] == "AAA"
+    assert b"{cipher}" not in path.read_bytes()
+
+    restored = ConfigClient(
+        app_name="test_app", decryptor=RemoteDecryptor(), snapshot_path=str(path)
+    )
+    assert restored.load_snapshot() is True
+    assert restored.get("db.password") == "AAA"
+
+
+def test_refresh_uses_cache():
+    client = ConfigClient(app_name="test_app", decryptor=RemoteDecryptor())
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        decrypt = m.post(f"{client.address}/decrypt", text=_decrypt)
+        client.get_config()
+        m.get(client.url, json=dict(ENVIRONMENT, version="v2"))
+        assert client.get_config() is True
+    assert decrypt.call_count == 2
+    assert client.decryptor.stats.cached == 2
+    assert client.decryptor.stats.calls == 0
+
+
+def test_unchanged_version_skips_decrypt():
+    client = ConfigClient(app_name="test_app", decryptor=RemoteDecryptor())
+    client.decryptor.cache.maxsize = 0
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        decrypt = m.post(f"{client.address}/decrypt", text=_decrypt)
+        client.get_config()
+        assert client.get_config() is False
+    assert decrypt.call_count == 2
+
+
+def test_decrypt_forwards_authorization():
+    client = ConfigClient(app_name="test_app", decryptor=RemoteDecryptor())
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        decrypt = m.post(f"{client.address}/decrypt", text=_decrypt)
+        client.get_config(headers={"Authorization": "Bearer t", "X-Other": "1"})
+    request = decrypt.last_request
+    assert request.headers["Authorization"] == "Bearer t"
+    assert request.headers["Content-Type"] == "text/plain"
+    assert "X-Other" not in request.headers
+
+
+def test_decrypt_failure_keeps_config():
+    client = ConfigClient(
+        app_name="test_app", fail_fast=False, decryptor=RemoteDecryptor()
+    )
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        m.post(f"{client.address}/decrypt", status_code=500)
+        with pytest.raises(ConnectionError):
+            client.get_config()
+    assert client.config == {}
+    assert client.version is None
+
+
+def test_without_decryptor():
+    client = ConfigClient(app_name="test_app")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        client.get_config()
+    assert client.get("db.password") == "{cipher}aaa"
+
+
+@pytest.mark.asyncio
+async def test_async_client_decrypts():
+    calls = []
+
+    async def config(request):
+        return web.json_response(ENVIRONMENT)
+
+    async def decrypt(request):
+        calls.append(await request.text())
+        return web.Response(text=calls[-1].upper())
+
+    app = web.Application()
+    app.router.add_get("/{app}/{profile}/{label}", config)
+    app.router.add_post("/decrypt", decrypt)
+    async with TestServer(app) as server:
+        async with AsyncConfigClient(
+            address=str(server.make_url("")).rstrip("/"),
+            app_name="test_app",
+            decryptor=RemoteDecryptor(max_workers=1),
+        ) as client:
+            await client.get_config()
+    assert sorted(calls) == ["aaa", "bbb"]
+    assert client.get("db.password") == "AAA"
+    assert client.decryptor.stats.calls == 2
@@ -1,3 +1,6 @@
+import functools
+import json
+
 import pytest
 
 from config import __version__, http
@@ -98,6 +101,21 @@ class TestClientCommand:
         result = cli_runner.invoke(client, ["app", "--file", "nginx.conf"])
         assert result.output == "File saved: nginx.conf\n"
 
+    @pytest.mark.parametrize("args", [[], ["-f", "spring"], ["-f", "spring", "--json"]])
+    def test_compact_mode(self, cli_runner, monkeypatch, tmp_path, args):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(http, "get", conftest.config_mock)
+        monkeypatch.setattr(
+            "config.cli.ConfigClient", functools.partial(ConfigClient, mode="compact")
+        )
+        result = cli_runner.invoke(client, ["test_app", *args])
+        assert result.exit_code == 0, result.output
+        if "--json" in args:
+            saved = json.loads((tmp_path / "response.json").read_text())
+            assert saved["cloud"]["consul"]["host"] == "discovery"
+        else:
+            assert "discovery" in result.output
+
     @pytest.mark.parametrize(
         "cmdline", ["app --auth user:pass", "app --digest user:pass"]
     )
@@ -143,6 +161,30 @@ class TestDecryptCommand:
         )
         assert result.exit_code == 1
 
+    def test_decrypt_command_with_key(self, cli_runner, monkeypatch):
+        monkeypatch.setattr(http, "post", SystemExit())
+        result = cli_runner.invoke(
+            decrypt,
+            [
+                "{cipher}501adb5ab5059ac08700ef7ddb39cde9dfdcb8bc012fe0632c29e18ef1353aa4",
+                "--key",
+                "my-secret-key",
+            ],
+        )
+        assert result.exit_code == 0
+        assert "'123'" in result.output
+
+    def test_decrypt_command_with_wrong_key(self, cli_runner):
+        result = cli_runner.invoke(
+            decrypt,
+            [
+                "501adb5ab5059ac08700ef7ddb39cde9dfdcb8bc012fe0632c29e18ef1353aa4",
+                "-k",
+                "other",
+            ],
+        )
+        assert result.exit_code == 1
+
 
 class TestEncryptCommand:
     def _mock_encrypt(self, *_args, **_kwargs):
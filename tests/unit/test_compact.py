@@ -0,0 +1,119 @@
+import copy
+import json
+import pickle
+
+import pytest
+import requests_mock
+
+from config._config import build_index
+from config.compact import CompactConfig, CompactList, CompactNode
+from config.ext.aiohttp import _Config
+from config.spring import ConfigClient
+from tests import conftest
+
+CONFIG = {
+    "spring": {"cloud": {"consul": {"host": "discovery", "port": 8500}}},
+    "servers": [{"host": "a", "port": 1}, {"host": "b", "port": 1}],
+    "replicas": [{"host": "a", "port": 1}],
+    "flags": {"a": 1, "b": True, "c": 1.0},
+    "empty": {},
+}
+
+
+def test_compact_equals_config():
+    compact = CompactConfig.build(CONFIG, version="v1")
+    assert compact == CONFIG
+    assert CONFIG == compact
+    assert (compact.version, compact.revision) == ("v1", 1)
+    assert isinstance(compact["spring"], CompactNode)
+    assert isinstance(compact["servers"], CompactList)
+    assert compact["flags"]["b"] is True
+    assert type(compact["flags"]["c"]) is float
+
+
+def test_compact_shares_equal_subtrees():
+    compact = CompactConfig.build(CONFIG)
+    assert compact["servers"][0] is compact["replicas"][0]
+
+
+def test_compact_shares_nodes_across_builds():
+    first = CompactConfig.build(CONFIG, version="v1")
+    changed = copy.deepcopy(CONFIG)
+    changed["spring"]["cloud"]["consul"]["port"] = 8501
+    second = CompactConfig.build(changed, first, version="v2")
+    # e.g. the config of another profile
+    other = CompactConfig.build({"hosts": copy.deepcopy(CONFIG["servers"])})
+    assert second["servers"] is first["servers"]
+    assert second["flags"] is first["flags"]
+    assert second["spring"] is not first["spring"]
+    assert other["hosts"] is first["servers"]
+
+
+def test_compact_is_json_serializable():
+    compact = CompactConfig.build(CONFIG, version="v1")
+    assert json.loads(json.dumps(compact)) == CONFIG
+    assert json.loads(json.dumps(compact["spring"])) == CONFIG["spring"]
+    assert isinstance(compact["spring"], dict)
+
+
+def test_compact_interns_strings():
+    first = CompactConfig.build({"a": "".join(["disc", "overy"])})
+    second = CompactConfig.build({"b": "".join(["disc", "overy"])})
+    assert first["a"] is second["b"]
+
+
+def test_compact_is_read_only():
+    compact = CompactConfig.build(CONFIG)
+    with pytest.raises(TypeError):
+        compact["spring"]["cloud"] = {}
+    with pytest.raises(TypeError):
+        compact["servers"].append({})
+
+
+def test_compact_index():
+    compact = CompactConfig.build(CONFIG)
+    index = build_index(CONFIG)
+    assert sorted(compact.index) == sorted(index)
+    for key, value in index.items():
+        assert compact.index[key] == value
+    for key in ["missing", "servers.9", "servers.x", "spring.cloud.consul.host.x"]:
+        assert compact.index.get(key, "default") == "default"
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, pickle.dumps])
+def test_compact_copy(clone):
+    compact = CompactConfig.build(CONFIG, version="v1")
+    result = clone(compact)
+    if isinstance(result, bytes):
+        result = pickle.loads(result)
+    assert result == CONFIG
+    assert result.version == "v1"
+
+
+def test_client_compact_mode():
+    merged = ConfigClient(app_name="test_app")
+    client = ConfigClient(app_name="test_app", mode="compact")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        merged.get_config()
+        client.get_config()
+    assert isinstance(client.config, CompactConfig)
+    assert client.config == merged.config
+    assert list(client.keys()) == list(merged.keys())
+    for key in ["server.port", "info.app", "spring.cloud.consul.port", "info.*", "x"]:
+        assert client.get(key) == merged.get(key)
+    assert client.get_prefix("info") == merged.get_prefix("info")
+    assert client.get_prefix("info.app", nested=True) == merged.get("info.app")
+    assert _Config(client.config).get("spring.cloud.consul.host") == "discovery"
+
+
+def test_client_compact_snapshot(tmp_path):
+    path = str(tmp_path / "test_app.snapshot")
+    client = ConfigClient(app_name="test_app", mode="compact", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+    restored = ConfigClient(app_name="test_app", mode="compact", snapshot_path=path)
+    assert restored.load_snapshot() is True
+    assert isinstance(restored.config, CompactConfig)
+    assert restored.config == client.config
@@ -1,55 +1,93 @@
+import copy
+
 import pytest
 
-from config._config import merge_dict, merge_list, to_dict
+from config._config import (
+    build_index,
+    build_tree,
+    merge_dict,
+    merge_list,
+    merge_sources,
+    to_dict,
+)
+
+TO_DICT_CASES = [
+    ({"python.cache.timeout": 10}, {"python": {"cache": {"timeout": 10}}}),
+    ({"health.config.enabled": False}, {"health": {"config": {"enabled": False}}}),
+    (
+        {
+            "info": {
+                "description": "simple description",
+                "url": "http://localhost",
+                "docs": "http://localhost/docs",
+            },
+            "app": {"password": "234"},
+            "example[0]": 1,
+            "example[1]": 2,
+            "examples.one[0]": 1,
+            "examples.one[1]": 2,
+            "examples.one[2]": 3,
+            "examples.two[0]": 1,
+            "examples.two[1]": 2,
+            "examples.three.one[0]": 1,
+            "examples.three.one[1]": 2,
+            "examples.three.two.one[0]": 1,
+        },
+        {
+            "info": {
+                "description": "simple description",
+                "url": "http://localhost",
+                "docs": "http://localhost/docs",
+            },
+            "app": {"password": "234"},
+            "examples": {
+                "three": {"two": {"one": [1]}, "one": [1, 2]},
+                "one": [1, 2, 3],
+                "two": [1, 2],
+            },
+            "example": [1, 2],
+        },
+    ),
+    (
+        {"examples.three.one[0]": "one", "examples.three.one[1]": "thow"},
+        {"examples": {"three": {"one": ["one", "thow"]}}},
+    ),
+]
+
+
+@pytest.mark.parametrize("data, expected", TO_DICT_CASES)
+def test_to_dict(data, expected):
+    assert to_dict(data) == expected
+
+
+@pytest.mark.parametrize("data, expected", TO_DICT_CASES)
+def test_build_tree(data, expected):
+    assert build_tree(data) == expected
 
 
 @pytest.mark.parametrize(
-    "data, expected",
+    "data",
     [
-        ({"python.cache.timeout": 10}, {"python": {"cache": {"timeout": 10}}}),
-        ({"health.config.enabled": False}, {"health": {"config": {"enabled": False}}}),
-        (
-            {
-                "info": {
-                    "description": "simple description",
-                    "url": "http://localhost",
-                    "docs": "http://localhost/docs",
-                },
-                "app": {"password": "234"},
-                "example[0]": 1,
-                "example[1]": 2,
-                "examples.one[0]": 1,
-                "examples.one[1]": 2,
-                "examples.one[2]": 3,
-                "examples.two[0]": 1,
-                "examples.two[1]": 2,
-                "examples.three.one[0]": 1,
-                "examples.three.one[1]": 2,
-                "examples.three.two.one[0]": 1,
-            },
-            {
-                "info": {
-                    "description": "simple description",
-                    "url": "http://localhost",
-                    "docs": "http://localhost/docs",
-                },
-                "app": {"password": "234"},
-                "examples": {
-                    "three": {"two": {"one": [1]}, "one": [1, 2]},
-                    "one": [1, 2, 3],
-                    "two": [1, 2],
-                },
-                "example": [1, 2],
-            },
-        ),
-        (
-            {"examples.three.one[0]": "one", "examples.three.one[1]": "thow"},
-            {"examples": {"three": {"one": ["one", "thow"]}}},
-        ),
+        {"a": 1, "a.b": 2},
+        {"a.b": 2, "a": 1},
+        {"a.b": 1, "a.b.c": 2, "a.d": 3},
+        {"a[1]": 2, "b": 0, "a[0]": 1},
+        {"a.x.b.x": 1, "a.y": 2},
+        {"servers[0].host": "a", "servers[1].host": "b", "servers[0].port": 1},
+        {"info": {"x[0]": 1}, "info.y": 2},
+        {"info.y": 2, "info": {"x[0]": 1, "y": 3}},
     ],
 )
-def test_to_dict(data, expected):
-    assert to_dict(data) == expected
+def test_build_tree_same_as_to_dict(data):
+    expected = to_dict(copy.deepcopy(data))
+    result = build_tree(copy.deepcopy(data))
+    assert result == expected
+    assert repr(result) == repr(expected)
+
+
+def test_merge_sources_precedence():
+    sources = [{"a.b": 1, "l[0]": "x"}, {"a.b": 0, "a.c": 2, "l[0]": "y", "l[1]": "z"}]
+    assert merge_sources(sources) == {"a": {"b": 1, "c": 2}, "l": ["x"]}
 
 
 def test_merge_dict():
@@ -97,3 +135,71 @@ def test_merge_list():
     }
     merge_list(config)
     assert config == expected_config
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"a[0]": 1, "a[5]": 2}, {"a": [1, None, None, None, None, 2]}),
+        ({"a[2]": "c", "a[0]": "a", "a[1]": "b"}, {"a": ["a", "b", "c"]}),
+        (
+            {"servers[0].hosts[2]": "h2", "servers[0].hosts[0]": "h0"},
+            {"servers": [{"hosts": ["h0", None, "h2"]}]},
+        ),
+        (
+            {"servers[1].port": 2, "servers[0].port": 1, "servers[0].name": "a"},
+            {"servers": [{"port": 1, "name": "a"}, {"port": 2}]},
+        ),
+        (
+            {"matrix[0][1]": 2, "matrix[1][0]": 3, "matrix[0][0]": 1},
+            {"matrix": [[1, 2], [3]]},
+        ),
+        ({"a.b[0][0].c[1]": 1}, {"a": {"b": [[{"c": [None, 1]}]]}}),
+        ({"a[x]": 1, "a[0]b": 2}, {"a[x]": 1, "a[0]b": 2}),
+    ],
+)
+def test_build_tree_lists(data, expected):
+    assert build_tree(data) == expected
+
+
+def test_build_tree_lists_after_other_keys():
+    result = build_tree({"a[1]": 2, "b": 0, "c.d[0]": 1, "a[0]": 1, "c.e": 3})
+    assert repr(result) == repr({"b": 0, "c": {"e": 3, "d": [1]}, "a": [1, 2]})
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"a[0]": 1, "b[0]": 3, "a[1]": 2}, {"a": [1, 2], "b": [3]}),
+        ({"a[0]": 1, "b[1]": 3, "a[1]": 2}, {"a": [1, 2], "b": [None, 3]}),
+        ({"a[0]": 1, "a[x]": 2}, {"a[x]": 2, "a": [1]}),
+        ({"a": "old", "a[0]": 1}, {"a": [1]}),
+    ],
+)
+def test_merge_list_dense(data, expected):
+    merge_list(data)
+    assert data == expected
+
+
+def test_merge_list_sparse_and_chained():
+    config = {"x": 0, "a[3]": 3, "a[1]": 1, "m[1][1]": 4, "m[0][0]": 1}
+    merge_list(config)
+    assert config == {"x": 0, "a": [None, 1, None, 3], "m": [[1], [None, 4]]}
+
+
+def test_build_index():
+    config = {"a": {"b": 1, "c": [{"d": None}, 2], "e": {}}, "x.y": 3}
+    assert build_index(config) == {
+        "a": config["a"],
+        "a.b": 1,
+        "a.c": config["a"]["c"],
+        "a.c.0": {"d": None},
+        "a.c.0.d": None,
+        "a.c.1": 2,
+        "a.e": {},
+    }
+
+
+def test_merge_sources_iterator():
+    sources = [{"a.b": 1, "a.d": {}}, {"a": 0, "a.c": 2}, {"a.b": 0, "x": 1}]
+    assert merge_sources(iter(sources)) == {"a": {"b": 1, "c": 2, "d": {}}, "x": 1}
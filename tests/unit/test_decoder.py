@@ -0,0 +1,140 @@
+import json
+
+import orjson
+import pytest
+import requests_mock
+
+from config.cipher import RemoteDecryptor
+from config.decoder import EnvironmentParser, loads, stream_environment
+from config.spring import ConfigClient
+from tests import conftest
+
+BODY = json.dumps(conftest.CONFIG, indent=2).encode()
+# field order of Spring Cloud Config
+SPRING = json.dumps(
+    {
+        key: conftest.CONFIG[key]
+        for key in ["name", "profiles", "label", "version", "state", "propertySources"]
+    }
+).encode()
+TRAILING = {
+    "name": "test_app",
+    "propertySources": [
+        {"name": "a", "source": {"x": '}]"{\\', "y": [[]], "z": -1.5e3}},
+        {"name": "b", "source": {"x": "b", "w": None}},
+    ],
+    "version": "v1",
+    "state": None,
+    "flags": [True, False],
+}
+
+
+def chunked(body, size):
+    return [body[start:][:size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(BODY)])
+@pytest.mark.parametrize("decoder", [loads, orjson.loads])
+def test_stream_environment(size, decoder):
+    environment = stream_environment(chunked(BODY, size), decoder)
+    expected = dict(conftest.CONFIG)
+    assert list(environment.pop("propertySources")) == expected.pop("propertySources")
+    assert environment == expected
+
+
+@pytest.mark.parametrize("size", [1, 5])
+def test_stream_environment_fields_after_sources(size):
+    environment = stream_environment(chunked(json.dumps(TRAILING).encode(), size))
+    assert "version" not in environment
+    environment["propertySources"] = list(environment["propertySources"])
+    assert environment == TRAILING
+
+
+def test_stream_environment_reads_up_to_sources():
+    read = []
+
+    def chunks():
+        for chunk in chunked(SPRING, 16):
+            read.append(chunk)
+            yield chunk
+
+    environment = stream_environment(chunks())
+    assert environment["version"] == conftest.CONFIG["version"]
+    assert len(read) < len(SPRING) // 16 // 2
+    sources = list(environment["propertySources"])
+    assert sources == conftest.CONFIG["propertySources"]
+
+
+def test_parser_keeps_only_pending_bytes():
+    parser = EnvironmentParser()
+    body = json.dumps(TRAILING).encode()
+    first = body.index(b'{"name": "b"')
+    assert parser.feed(body[:first]) == TRAILING["propertySources"][:1]
+    assert len(parser._buffer) < 4
+    assert parser.feed(body[first:]) == TRAILING["propertySources"][1:]
+    assert parser.close() == {
+        k: v for k, v in TRAILING.items() if k != "propertySources"
+    }
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b'{"name": "x"', b'{"propertySources": [{"a": 1}', b'{"version": 1', b"{} {}"],
+)
+def test_incomplete_environment(body):
+    parser = EnvironmentParser()
+    parser.feed(body)
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+@pytest.mark.parametrize("body", [b"[]", b'{"propertySources": {}}', b'{"a" 1}'])
+def test_invalid_environment(body):
+    with pytest.raises(ValueError):
+        EnvironmentParser().feed(body)
+
+
+@pytest.mark.parametrize("mode", ["merged", "layered", "compact"])
+def test_client_stream(mode):
+    merged = ConfigClient(app_name="test_app")
+    client = ConfigClient(app_name="test_app", mode=mode, stream=True)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, content=json.dumps(TRAILING).encode())
+        merged.get_config()
+        assert client.get_config() is True
+        assert client.get_config() is False
+    assert client.config == merged.config
+    assert client.version == "v1"
+
+
+def test_client_stream_decrypt():
+    environment = {
+        "version": "v1",
+        "propertySources": [{"name": "a", "source": {"password": "{cipher}abc"}}],
+    }
+    client = ConfigClient(app_name="test_app", stream=True, decryptor=RemoteDecryptor())
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=environment)
+        m.post(f"{client.address}/decrypt", text="secret")
+        client.get_config()
+    assert client.get("password") == "secret"
+
+
+def test_client_json_decoder(mocker):
+    decoder = mocker.Mock(side_effect=json.loads)
+    client = ConfigClient(app_name="test_app", json_decoder=decoder)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+    decoder.assert_called_once()
+    assert client.get("spring.cloud.consul.host") == "discovery"
+
+
+def test_client_keeps_large_integers():
+    client = ConfigClient(app_name="test_app")
+    source = {"name": "a", "source": {"id": 123456789012345678901234}}
+    with requests_mock.Mocker() as m:
+        m.get(client.url, text=json.dumps({"propertySources": [source]}))
+        client.get_config()
+    assert client.json_decoder is json.loads
+    assert client.get("id") == 123456789012345678901234
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import requests_mock
+
+from config.exceptions import RequestFailedException
+from config.failover import Replica, ReplicaSet
+from config.spring import ConfigClient
+
+
+def make_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
+def test_from_address():
+    replicas = ReplicaSet.from_address("http://cfg1:8888/, http://cfg2:8888")
+    assert replicas.addresses == ["http://cfg1:8888", "http://cfg2:8888"]
+    assert replicas.source == "http://cfg1:8888/, http://cfg2:8888"
+
+
+def test_empty_replicas():
+    with pytest.raises(ValueError):
+        ReplicaSet([])
+
+
+def test_percentile():
+    replica = Replica("http://cfg1", window=10)
+    assert replica.percentile(0.5) is None
+    for latency in range(20):
+        replica.record_success(latency)
+    assert replica.samples == 10
+    assert replica.percentile(0.5) == 15
+    assert replica.percentile(1) == 19
+
+
+def test_percentile_while_recording():
+    replica = Replica("http://cfg1", window=1000)
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            replica.record_success(0.01)
+
+    writer = threading.Thread(target=record)
+    writer.start()
+    try:
+        for _ in range(1000):
+            replica.percentile(0.95)
+    finally:
+        stop.set()
+        writer.join()
+    assert replica.percentile(0.95) == 0.01
+
+
+def test_ordered_by_health_and_latency():
+    replicas = ReplicaSet.from_address("http://a,http://b,http://c")
+    a, b, c = replicas.replicas
+    a.record_failure(cooldown=60)
+    b.record_success(0.5)
+    c.record_success(0.1)
+    assert [r.address for r in replicas.ordered()] == [
+        "http://c",
+        "http://b",
+        "http://a",
+    ]
+    assert replicas.primary is c
+
+
+def test_failover():
+    replicas = ReplicaSet.from_address("http://a,http://b")
+
+    def fnc(address):
+        if address == "http://a":
+            raise requests.ConnectionError
+        return address
+
+    assert replicas.call(fnc) == "http://b"
+    assert not replicas.replicas[0].healthy
+    assert replicas.primary.address == "http://b"
+    assert replicas.stats["http://a"]["failures"] == 1
+
+
+def test_all_replicas_failed():
+    replicas = ReplicaSet.from_address("http://a,http://b")
+
+    def fnc(address):
+        raise requests.ConnectionError(address)
+
+    with pytest.raises(requests.ConnectionError):
+        replicas.call(fnc)
+
+
+def test_client_error_is_final():
+    replicas = ReplicaSet.from_address("http://a,http://b")
+    calls = []
+
+    def fnc(address):
+        calls.append(address)
+        raise requests.HTTPError(response=make_response(404))
+
+    with pytest.raises(requests.HTTPError):
+        replicas.call(fnc)
+    assert calls == ["http://a"]
+    assert replicas.replicas[0].healthy
+
+
+def test_hedged_request():
+    replicas = ReplicaSet.from_address("http://slow,http://fast", hedge=True)
+    replicas.hedge_delay = 0.01
+    release = threading.Event()
+
+    def fnc(address):
+        if address == "http://slow":
+            release.wait(1)
+        return address
+
+    assert replicas.call(fnc) == "http://fast"
+    release.set()
+
+
+def test_hedged_request_closes_loser():
+    replicas = ReplicaSet.from_address("http://slow,http://fast", hedge=True)
+    replicas.hedge_delay = 0.01
+    release = threading.Event()
+    responses = {address: MagicMock() for address in ["http://slow", "http://fast"]}
+    closed = threading.Event()
+    responses["http://slow"].close.side_effect = closed.set
+
+    def fnc(address):
+        if address == "http://slow":
+            release.wait(1)
+        return responses[address]
+
+    assert replicas.call(fnc) is responses["http://fast"]
+    release.set()
+    assert closed.wait(1)
+    responses["http://fast"].close.assert_not_called()
+
+
+def test_hedged_request_primary_wins():
+    replicas = ReplicaSet.from_address("http://a,http://b", hedge=True)
+    calls = []
+
+    def fnc(address):
+        calls.append(address)
+        return address
+
+    assert replicas.call(fnc) == "http://a"
+    assert calls == ["http://a"]
+
+
+def test_hedged_request_failover():
+    replicas = ReplicaSet.from_address("http://a,http://b", hedge=True)
+
+    def fnc(address):
+        if address == "http://a":
+            raise requests.ConnectionError
+        return address
+
+    assert replicas.call(fnc) == "http://b"
+
+
+def test_hedge_threshold_adapts():
+    replicas = ReplicaSet.from_address("http://a", min_samples=5)
+    replica = replicas.replicas[0]
+    assert replicas.threshold(replica) == replicas.hedge_delay
+    for latency in (0.01, 0.02, 0.03, 0.04, 0.05):
+        replica.record_success(latency)
+    assert replicas.threshold(replica) == 0.05
+
+
+@pytest.mark.asyncio
+async def test_call_async_failover():
+    replicas = ReplicaSet.from_address("http://a,http://b")
+
+    async def fnc(address):
+        if address == "http://a":
+            raise requests.ConnectionError
+        return address
+
+    assert await replicas.call_async(fnc) == "http://b"
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_async():
+    replicas = ReplicaSet.from_address("http://slow,http://fast", hedge=True)
+    replicas.hedge_delay = 0.01
+
+    async def fnc(address):
+        if address == "http://slow":
+            await asyncio.sleep(1)
+        return address
+
+    start = time.perf_counter()
+    assert await replicas.call_async(fnc) == "http://fast"
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.parametrize("method", ["get_file", "encrypt", "decrypt"])
+def test_request_failed_reports_replica(method):
+    client = ConfigClient(address="http://a:8888,http://b:8888", app_name="app")
+    with requests_mock.Mocker() as m:
+        m.register_uri(requests_mock.ANY, requests_mock.ANY, status_code=500)
+        with pytest.raises(RequestFailedException) as err:
+            getattr(client, method)("nginx.conf")
+    assert "http://b:8888/" in str(err.value)
+    assert "http://a:8888," not in str(err.value)
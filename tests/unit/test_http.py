@@ -1,4 +1,8 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 import pytest
+import requests_mock
 from requests import HTTPError
 
 from config import http
@@ -22,3 +26,67 @@ def test_post(monkeypatch):
 def test_post_error():
     with pytest.raises(HTTPError):
         http.post("https://postman-echo.com/status/404")
+
+
+def test_session_for_same_origin():
+    assert http.session_for("http://localhost:8888/a") is http.session_for(
+        "http://LOCALHOST:8888/b/c"
+    )
+
+
+def test_session_for_different_origin():
+    assert http.session_for("http://localhost:8888") is not http.session_for(
+        "http://localhost:9999"
+    )
+
+
+def test_close_sessions():
+    session = http.session_for("http://localhost:8888")
+    http.close_sessions()
+    assert http.session_for("http://localhost:8888") is not session
+
+
+def test_create_session_pool():
+    session = http.create_session(pool_connections=2, pool_maxsize=4)
+    adapter = session.get_adapter("https://localhost")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 4
+
+
+def test_get_with_custom_session():
+    session = http.create_session()
+    with requests_mock.Mocker(session=session) as m:
+        m.get("http://localhost:8888/app", text="ok")
+        resp = http.get("http://localhost:8888/app", session=session)
+    assert resp.text == "ok"
+
+
+@pytest.fixture
+def cookie_server():
+    cookies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            cookies.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "JSESSIONID=abc; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", cookies
+    server.shutdown()
+    server.server_close()
+
+
+def test_shared_session_keeps_no_cookies(cookie_server):
+    uri, cookies = cookie_server
+    http.get(uri, auth=("user", "secret"))
+    http.get(uri)
+    assert cookies == [None, None]
+    assert len(http.session_for(uri).cookies) == 0
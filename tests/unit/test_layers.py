@@ -0,0 +1,126 @@
+import copy
+
+import pytest
+import requests_mock
+
+from config._config import build_index, merge_sources
+from config.layers import LayeredConfig
+from config.snapshot import ConfigSnapshot
+from config.spring import ConfigClient
+from tests import conftest
+
+SOURCES = [
+    {
+        "spring.cloud.consul.port": 8501,
+        "servers[0]": "c",
+        "logging": "off",
+        "db.pool": 10,
+    },
+    {
+        "spring.cloud.consul.host": "discovery",
+        "spring.cloud.consul.port": 8500,
+        "servers[0]": "a",
+        "servers[1]": "b",
+        "logging.level.root": "INFO",
+        "db": "h2",
+        "db.url": "jdbc:h2:mem",
+    },
+    {"spring.application.name": "foo", "db.pool": 5, "extra[0].name": "x"},
+]
+
+
+def layered(sources=SOURCES):
+    return LayeredConfig.build([(str(i), src) for i, src in enumerate(sources)])
+
+
+def test_layered_matches_merged():
+    merged = merge_sources(SOURCES)
+    index = build_index(merged)
+    config = layered()
+    assert sorted(config) == sorted(index)
+    for key, value in index.items():
+        assert config[key] == value
+    assert config.tree == merged
+    assert isinstance(config.tree, ConfigSnapshot)
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("spring.cloud.consul.port", 8501),
+        ("spring.cloud", {"consul": {"host": "discovery", "port": 8501}}),
+        ("servers", ["c"]),
+        ("servers.0", "c"),
+        ("logging.level.root", "INFO"),
+        ("db", {"url": "jdbc:h2:mem", "pool": 10}),
+        ("extra.0.name", "x"),
+    ],
+)
+def test_layered_precedence(key, expected):
+    assert layered().get(key) == expected
+
+
+@pytest.mark.parametrize("key", ["servers.1", "missing", "spring.cloud.x", "db.pool.x"])
+def test_layered_missing(key):
+    config = layered()
+    assert config.get(key, "default") == "default"
+    assert key not in config
+    with pytest.raises(KeyError):
+        config[key]
+
+
+def test_layered_refresh_rebuilds_changed_layers():
+    first = layered()
+    sources = copy.deepcopy(SOURCES)
+    sources[1]["db.url"] = "jdbc:h2:file"
+    second = LayeredConfig.build(
+        [(str(i), src) for i, src in enumerate(sources)], first, "v2"
+    )
+    assert second.layers[0] is first.layers[0]
+    assert second.layers[1] is not first.layers[1]
+    assert second.layers[2] is first.layers[2]
+    assert second.get("db.url") == "jdbc:h2:file"
+    assert first.get("db.url") == "jdbc:h2:mem"
+    assert (second.version, second.revision) == ("v2", 2)
+
+
+def test_layered_values_are_read_only():
+    with pytest.raises(TypeError):
+        layered().get("db").update(url="other")
+
+
+def test_client_layered_mode():
+    merged = ConfigClient(app_name="test_app")
+    client = ConfigClient(app_name="test_app", mode="layered")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        merged.get_config()
+        client.get_config()
+    assert client.config == merged.config
+    for key in ["server.port", "info.app", "spring.cloud.consul.port", "x"]:
+        assert client.get(key) == merged.get(key)
+    assert client.get("info.*") == merged.get("info.*")
+    assert list(client.iter_prefix("info")) == list(merged.iter_prefix("info"))
+    assert client.get_prefix("", nested=True) == merged.config
+    assert client.config.version == conftest.CONFIG["version"]
+
+
+def test_client_layered_refresh():
+    client = ConfigClient(app_name="test_app", mode="layered")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        first = client._layered
+        changed = copy.deepcopy(conftest.CONFIG)
+        changed["version"] = "v2"
+        changed["propertySources"][2]["source"]["spring.cloud.consul.port"] = 8501
+        m.get(client.url, json=changed)
+        client.get_config()
+    assert client.get("spring.cloud.consul.port") == 8501
+    assert client._layered.layers[:2] == first.layers[:2]
+    assert client._layered.layers[0] is first.layers[0]
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        ConfigClient(mode="lazy")
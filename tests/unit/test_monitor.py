@@ -0,0 +1,252 @@
+import http.client
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+import pytest
+
+from config.monitor import (
+    AsyncRefreshReceiver,
+    MonitorServer,
+    RefreshReceiver,
+    _Receiver,
+    matches,
+    read_events,
+)
+
+
+class FakeClient:
+    app_name = "foo"
+    profile = "development,cloud"
+
+    def __init__(self, delay=0.0, error=None):
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get_config(self, **kwargs):
+        self.calls += 1
+        self.kwargs = kwargs
+        self.started.set()
+        self.release.wait(self.delay)
+        if self.error:
+            raise self.error
+        return True
+
+    async def get_config_async(self, **kwargs):
+        return self.get_config(**kwargs)
+
+
+class FakeCF:
+    def __init__(self, client):
+        self.client = client
+
+    def get_config(self, **kwargs):
+        return self.client.get_config(**kwargs)
+
+
+def bus_event(destination, kind="RefreshRemoteApplicationEvent"):
+    return {"type": kind, "destinationService": destination, "originService": "cs"}
+
+
+def send(url, body, content_type="application/json"):
+    """Fake event sender, like the config server or a git webhook."""
+    data = body if isinstance(body, bytes) else json.dumps(body).encode()
+    request = Request(url, data=data, headers={"Content-Type": content_type})
+    with urlopen(request, timeout=5) as response:
+        return response.status, json.loads(response.read())
+
+
+@pytest.mark.parametrize(
+    "destination,expected",
+    [
+        (None, True),
+        ("**", True),
+        ("foo", True),
+        ("foo:**", True),
+        ("foo:development", True),
+        ("foo:cloud:**", True),
+        ("fo*:**", True),
+        ("*:development", True),
+        ("foo:production", False),
+        ("bar:**", False),
+        ("foobar", False),
+    ],
+)
+def test_matches_destination(destination, expected):
+    assert matches(bus_event(destination), "foo", "development,cloud") is expected
+
+
+def test_matches_event_type():
+    assert not matches(bus_event("**", "AckRemoteApplicationEvent"), "foo", "dev")
+    assert matches(
+        bus_event("**", "EnvironmentChangeRemoteApplicationEvent"), "foo", "dev"
+    )
+    assert matches({"destinationService": "foo:**"}, "foo", "dev")
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("application.yml", True),
+        ("config/application.properties", True),
+        ("foo.yml", True),
+        ("foo-development.yml", True),
+        ("application-cloud.yml", True),
+        ("foo-production.yml", False),
+        ("application-production.yml", False),
+        ("bar.yml", False),
+        ("bar-development.yml", False),
+    ],
+)
+def test_matches_path(path, expected):
+    assert matches({"path": path}, "foo", "development,cloud") is expected
+    assert matches({"path": [path]}, "foo", "development,cloud") is expected
+
+
+def test_matches_git_webhook():
+    event = {"commits": [{"added": [], "modified": ["bar.yml"], "removed": []}]}
+    assert not matches(event, "foo", "development")
+    event["commits"].append({"removed": ["foo-development.yml"]})
+    assert matches(event, "foo", "development")
+
+
+def test_read_events():
+    assert read_events(b'{"path": "foo.yml"}') == [{"path": "foo.yml"}]
+    assert read_events(b'[{"destinationService": "foo"}]') == [
+        {"destinationService": "foo"}
+    ]
+    form = urlencode({"path": ["foo.yml", "bar.yml"]}, doseq=True).encode()
+    assert read_events(form, "application/x-www-form-urlencoded") == [
+        {"path": ["foo.yml", "bar.yml"]}
+    ]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"{",
+        b"1",
+        b'["foo.yml"]',
+        b"\xff",
+        b'{"path": 1}',
+        b'{"path": {"foo.yml": 1}}',
+        b'{"path": [1]}',
+        b'{"commits": "foo.yml"}',
+        b'{"commits": ["foo.yml"]}',
+        b'{"commits": [{"added": "foo.yml"}]}',
+        b'{"destinationService": ["foo"]}',
+        b'{"type": 1}',
+    ],
+)
+def test_read_events_invalid(body):
+    with pytest.raises(ValueError):
+        read_events(body)
+
+
+def test_receiver_ignores_other_apps():
+    client = FakeClient()
+    receiver = RefreshReceiver(client)
+    assert receiver.notify(bus_event("bar:**")) is False
+    assert receiver.wait(1)
+    assert (client.calls, receiver.received) == (0, 0)
+
+
+def test_receiver_refresh():
+    client = FakeClient()
+    refreshed = []
+    receiver = RefreshReceiver(
+        FakeCF(client), kwargs={"timeout": 1}, on_refresh=lambda: refreshed.append(1)
+    )
+    assert receiver.target == ("foo", "development,cloud")
+    assert receiver.notify({"path": "foo.yml"}) is True
+    assert receiver.wait(1)
+    assert client.calls == 1
+    assert client.kwargs == {"timeout": 1}
+    assert refreshed == [1]
+
+
+def test_receiver_coalesces_events():
+    client = FakeClient(delay=5)
+    receiver = RefreshReceiver(client)
+    receiver.notify(bus_event("foo:**"))
+    assert client.started.wait(1)
+    for _ in range(10):
+        receiver.notify(bus_event("foo:**"))
+    client.release.set()
+    assert receiver.wait(1)
+    # the events received during the first refresh share a second one
+    assert client.calls == 2
+    assert (receiver.received, receiver.coalesced) == (11, 9)
+
+
+def test_receiver_survives_errors():
+    client = FakeClient(error=ConnectionError())
+    receiver = RefreshReceiver(client)
+    assert receiver.refresh() is False
+    receiver.notify(bus_event("foo:**"))
+    assert receiver.wait(1)
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_async_receiver():
+    client = FakeClient()
+    refreshed = []
+    receiver = AsyncRefreshReceiver(client, on_refresh=lambda: refreshed.append(1))
+    assert receiver.notify(bus_event("foo:development")) is True
+    assert receiver.notify(bus_event("foo:development")) is True
+    assert receiver.notify(bus_event("bar:development")) is False
+    await receiver.wait()
+    assert client.calls == 1
+    assert receiver.coalesced == 1
+    assert refreshed == [1]
+    receiver.notify({"path": "application.yml"})
+    await receiver.stop()
+    await receiver.wait()
+    assert receiver._task is None
+
+
+def test_monitor_server():
+    client = FakeClient()
+    with MonitorServer(RefreshReceiver(client), port=0) as server:
+        assert server.running
+        assert send(server.url, bus_event("bar:**")) == (200, {"refresh": False})
+        assert send(server.url, bus_event("foo:**")) == (200, {"refresh": True})
+        form = urlencode({"path": "foo-cloud.yml"}).encode()
+        assert send(server.url, form, "application/x-www-form-urlencoded") == (
+            200,
+            {"refresh": True},
+        )
+        with pytest.raises(HTTPError) as err:
+            send(server.url, b"{")
+        assert err.value.code == 400
+        with pytest.raises(HTTPError) as err:
+            send(server.url.replace("/monitor", "/other"), {})
+        assert err.value.code == 404
+        assert server.receiver.wait(1)
+    assert not server.running
+    assert 1 <= client.calls <= 2
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_monitor_server_invalid_content_length(length):
+    with MonitorServer(RefreshReceiver(FakeClient()), port=0) as server:
+        url = urlsplit(server.url)
+        connection = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+        connection.putrequest("POST", server.path)
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read()) == {"error": "invalid refresh event"}
+        connection.close()
+
+
+def test_receiver_is_abstract():
+    with pytest.raises(TypeError):
+        _Receiver(FakeClient())
@@ -1,6 +1,12 @@
+import threading
+import time
+
 import pytest
+import requests
+import requests_mock
 
 from config import http
+from config.auth import OAuth2
 from config.exceptions import RequestFailedException, RequestTokenException
 from tests import conftest
 
@@ -46,3 +52,101 @@ def test_authorization_header(oauth2, monkeypatch):
 )
 def test_oauth_attributes(oauth2, attr):
     assert hasattr(oauth2, attr)
+
+
+def test_request_token_with_session(monkeypatch, mocker):
+    session = http.create_session()
+    monkeypatch.setattr(http, "post", conftest.oauth2_mock)
+    spy = mocker.spy(http, "post")
+
+    oauth2 = OAuth2(
+        access_token_uri="http://localhost/token",
+        client_id="id",
+        client_secret="secret",
+        session=session,
+    )
+    oauth2.configure()
+    assert spy.call_args.kwargs["session"] is session
+
+
+def _token_mock(expires_in=None, delay=0.0):
+    calls = []
+
+    def post(*args, **kwargs):
+        calls.append(kwargs)
+        time.sleep(delay)
+        body = {"access_token": f"token-{len(calls)}"}
+        if expires_in is not None:
+            body["expires_in"] = expires_in
+        with requests_mock.Mocker() as m:
+            m.post("http://localhost/token", json=body)
+            return requests.post("http://localhost/token")
+
+    return post, calls
+
+
+def _oauth2(**kwargs):
+    return OAuth2(
+        access_token_uri="http://localhost/token",
+        client_id="id",
+        client_secret="secret",
+        **kwargs,
+    )
+
+
+def test_token_cached_until_expiry(monkeypatch):
+    post, calls = _token_mock(expires_in=3600)
+    monkeypatch.setattr(http, "post", post)
+    oauth2 = _oauth2()
+    oauth2.configure()
+    oauth2.configure()
+    assert len(calls) == 1
+    assert oauth2.valid
+    assert oauth2.token == "token-1"
+
+
+def test_token_without_expiry_not_cached(monkeypatch):
+    post, calls = _token_mock()
+    monkeypatch.setattr(http, "post", post)
+    oauth2 = _oauth2()
+    oauth2.configure()
+    oauth2.configure()
+    assert len(calls) == 2
+    assert not oauth2.valid
+
+
+def test_token_renewed_before_expiry(monkeypatch):
+    post, calls = _token_mock(expires_in=3600)
+    monkeypatch.setattr(http, "post", post)
+    oauth2 = _oauth2(renew_before=60)
+    oauth2.configure()
+    renew_at = time.monotonic() + 3600 - 60
+    monkeypatch.setattr(time, "monotonic", lambda: renew_at + 1)
+    oauth2.configure()
+    assert len(calls) == 2
+    assert oauth2.token == "token-2"
+
+
+def test_short_lived_token_renewed_at_half_life():
+    oauth2 = _oauth2(renew_before=60)
+    oauth2.set_token("abc", expires_in=20)
+    assert oauth2._renew_at - time.monotonic() == pytest.approx(10, abs=1)
+
+
+def test_concurrent_configure_single_request(monkeypatch):
+    post, calls = _token_mock(expires_in=3600, delay=0.05)
+    monkeypatch.setattr(http, "post", post)
+    oauth2 = _oauth2()
+    threads = [threading.Thread(target=oauth2.configure) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_token_setter_invalidates_cache():
+    oauth2 = _oauth2()
+    oauth2.set_token("abc", expires_in=3600)
+    oauth2.token = "xyz"
+    assert not oauth2.valid
@@ -0,0 +1,44 @@
+import marshal
+
+import pytest
+
+from config.persistence import Snapshot, load_snapshot, save_snapshot
+
+SNAPSHOT = Snapshot(
+    target=("app", "development", "master"),
+    version="b478bb5c",
+    state=None,
+    config={"spring": {"cloud": {"port": 8500, "hosts": ["a", "b"]}}, "x": 1.5},
+)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "cache" / "app.snapshot")
+    save_snapshot(path, SNAPSHOT)
+    assert load_snapshot(path) == SNAPSHOT
+    assert list(tmp_path.joinpath("cache").iterdir()) == [
+        tmp_path / "cache" / "app.snapshot"
+    ]
+
+
+def test_load_missing(tmp_path):
+    assert load_snapshot(str(tmp_path / "missing")) is None
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"garbage", marshal.dumps((99, (3, 0), (), None, None, {}))],
+)
+def test_load_invalid(tmp_path, content):
+    path = tmp_path / "app.snapshot"
+    path.write_bytes(content)
+    assert load_snapshot(str(path)) is None
+
+
+def test_save_failure_keeps_previous(tmp_path):
+    path = str(tmp_path / "app.snapshot")
+    save_snapshot(path, SNAPSHOT)
+    with pytest.raises(ValueError):
+        save_snapshot(path, Snapshot(SNAPSHOT.target, None, None, {"x": object()}))
+    assert load_snapshot(path) == SNAPSHOT
+    assert len(list(tmp_path.iterdir())) == 1
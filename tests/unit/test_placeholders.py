@@ -0,0 +1,153 @@
+import copy
+
+import pytest
+import requests_mock
+
+from config._config import build_index
+from config.placeholders import PlaceholderResolver, apply, parse
+from config.spring import ConfigClient
+
+CONFIG = {
+    "server": {"port": 8080, "host": "localhost", "secure": False},
+    "app": {
+        "url": "http://${server.host}:${server.port}/api",
+        "port": "${server.port}",
+        "health": "${app.url}/health",
+        "timeout": "${app.missing:30}s",
+        "nested": "${app.missing:${server.host}}",
+        "empty": "${app.missing:}",
+        "unresolved": "${app.missing}",
+        "first": "${servers[0].host}",
+        "flag": "secure=${server.secure}",
+        "literal": "${unterminated",
+    },
+    "servers": [{"host": "a"}, {"host": "b"}],
+}
+
+
+def resolve(config):
+    config = copy.deepcopy(config)
+    apply(config, PlaceholderResolver().resolve(build_index(config)))
+    return config["app"]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("plain", ["plain"]),
+        ("${a}", [("a", None, "${a}")]),
+        ("x${a:b}y", ["x", ("a", "b", "${a:b}"), "y"]),
+        ("${a:${b:c}}", [("a", "${b:c}", "${a:${b:c}}")]),
+        ("${l[1].x}", [("l.1.x", None, "${l[1].x}")]),
+        ("${open", ["${open"]),
+    ],
+)
+def test_parse(value, expected):
+    assert parse(value) == expected
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("url", "http://localhost:8080/api"),
+        ("port", "8080"),
+        ("health", "http://localhost:8080/api/health"),
+        ("timeout", "30s"),
+        ("nested", "localhost"),
+        ("empty", ""),
+        ("unresolved", "${app.missing}"),
+        ("first", "a"),
+        ("flag", "secure=false"),
+        ("literal", "${unterminated"),
+    ],
+)
+def test_resolve(key, expected):
+    assert resolve(CONFIG)[key] == expected
+
+
+@pytest.mark.parametrize(
+    "app",
+    [
+        {"a": "${app.a}"},
+        {"a": "${app.b}", "b": "${app.a}"},
+        {"a": "x${app.b}", "b": "${app.c}", "c": "${app.a}y"},
+    ],
+)
+def test_cycles_are_left_unresolved(app):
+    assert resolve({"app": app}) == app
+
+
+def test_subtree_reference_is_unresolved():
+    assert resolve({"app": {"a": "${server}"}, "server": {"port": 1}}) == {
+        "a": "${server}"
+    }
+
+
+def test_refresh_resolves_changed_dependencies():
+    resolver = PlaceholderResolver()
+    index = build_index(CONFIG)
+    first = resolver.resolve(index)
+    changed = copy.deepcopy(CONFIG)
+    changed["server"]["host"] = "example.com"
+    second = resolver.resolve(build_index(changed))
+    assert second["app.url"] == "http://example.com:8080/api"
+    assert second["app.health"] == "http://example.com:8080/api/health"
+    assert second["app.nested"] == "example.com"
+    assert second["app.timeout"] is first["app.timeout"]
+    assert second["app.port"] == first["app.port"]
+
+
+def test_refresh_reuses_unchanged_values(mocker):
+    resolver = PlaceholderResolver()
+    resolver.resolve(build_index(CONFIG))
+    parse_spy = mocker.patch("config.placeholders.parse", wraps=parse)
+    resolver.resolve(build_index(copy.deepcopy(CONFIG)))
+    assert parse_spy.call_count == 0
+    changed = copy.deepcopy(CONFIG)
+    changed["server"]["port"] = 9090
+    resolver.resolve(build_index(changed))
+    # url, port and health depend on server.port
+    assert parse_spy.call_count == 3
+
+
+ENVIRONMENT = {
+    "name": "test_app",
+    "version": "v1",
+    "propertySources": [
+        {
+            "name": "test_app.yml",
+            "source": {"app.url": "http://${server.host}:${server.port:80}"},
+        },
+        {
+            "name": "application.yml",
+            "source": {"server.host": "localhost", "server.port": 8080},
+        },
+    ],
+}
+
+
+@pytest.mark.parametrize("mode", ["merged", "layered"])
+def test_client_resolves_placeholders(mode):
+    client = ConfigClient(app_name="test_app", mode=mode, resolve_placeholders=True)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        client.get_config()
+        assert client.get("app.url") == "http://localhost:8080"
+        assert client.get("app") == {"url": "http://localhost:8080"}
+        assert client.config["app"]["url"] == "http://localhost:8080"
+        changed = copy.deepcopy(ENVIRONMENT)
+        changed["version"] = "v2"
+        changed["propertySources"][1]["source"]["server.host"] = "example.com"
+        m.get(client.url, json=changed)
+        client.get_config()
+    assert client.get("app.url") == "http://example.com:8080"
+    assert client.config["app"]["url"] == "http://example.com:8080"
+
+
+@pytest.mark.parametrize("params", [{}, {"resolve_placeholders": False}])
+def test_client_placeholders_disabled(params):
+    client = ConfigClient(app_name="test_app", **params)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=ENVIRONMENT)
+        client.get_config()
+    assert client.get("app.url") == "http://${server.host}:${server.port:80}"
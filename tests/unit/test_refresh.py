@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from config.refresh import AsyncRefreshScheduler, RefreshScheduler
+
+
+class FakeClient:
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.called = threading.Event()
+
+    def get_config(self, **kwargs):
+        self.calls += 1
+        self.kwargs = kwargs
+        self.called.set()
+        if self.error:
+            raise self.error
+        return True
+
+    async def get_config_async(self, **kwargs):
+        return self.get_config(**kwargs)
+
+
+class FakeAsyncClient(FakeClient):
+    async def get_config(self, **kwargs):
+        return FakeClient.get_config(self, **kwargs)
+
+
+@pytest.mark.parametrize("jitter", [0, 0.5, 3])
+def test_next_delay(jitter):
+    scheduler = RefreshScheduler(FakeClient(), interval=10, jitter=jitter)
+    for _ in range(100):
+        assert max(0, 10 - 10 * min(jitter, 1)) <= scheduler.next_delay()
+        assert scheduler.next_delay() <= 10 + 10 * min(jitter, 1)
+
+
+@pytest.mark.parametrize("params", [dict(interval=0), dict(interval=1, jitter=-1)])
+def test_invalid_params(params):
+    with pytest.raises(ValueError):
+        RefreshScheduler(FakeClient(), **params)
+
+
+def test_refresh_scheduler():
+    client = FakeClient()
+    with RefreshScheduler(client, interval=0.01, kwargs={"timeout": 1}) as scheduler:
+        assert client.called.wait(1)
+        assert scheduler.running
+    assert not scheduler.running
+    assert client.kwargs == {"timeout": 1}
+
+
+@pytest.mark.parametrize("error", [ConnectionError(), SystemExit()])
+def test_refresh_scheduler_survives_errors(error):
+    client = FakeClient(error=error)
+    scheduler = RefreshScheduler(client, interval=0.01)
+    assert scheduler.refresh() is False
+    scheduler.start()
+    while client.calls < 3:
+        client.called.wait(1)
+    assert scheduler.running
+    scheduler.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client", [FakeClient(), FakeAsyncClient()])
+async def test_async_refresh_scheduler(client):
+    async with AsyncRefreshScheduler(client, interval=0.01) as scheduler:
+        while client.calls < 2:
+            await asyncio.sleep(0.01)
+        assert scheduler.running
+    assert not scheduler.running
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_scheduler_survives_errors():
+    client = FakeAsyncClient(error=SystemExit())
+    scheduler = AsyncRefreshScheduler(client, interval=0.01)
+    assert await scheduler.refresh() is False
+    scheduler.start()
+    while client.calls < 3:
+        await asyncio.sleep(0.01)
+    assert scheduler.running
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_on_refresh():
+    calls = []
+    scheduler = AsyncRefreshScheduler(
+        FakeAsyncClient(), on_refresh=lambda: calls.append(1)
+    )
+    assert await scheduler.refresh() is True
+    scheduler.client.error = ConnectionError()
+    assert await scheduler.refresh() is False
+    assert calls == [1]
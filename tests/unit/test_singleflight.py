@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests_mock
+
+from config.singleflight import AsyncSingleFlight, SingleFlight
+from config.spring import ConfigClient
+from tests import conftest
+
+
+def blocked(calls, release, result="done"):
+    def fnc():
+        calls.append(1)
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return fnc
+
+
+def run_concurrently(flight, fnc, *args, count=5):
+    """Futures of count calls, returned once they all reached the flight."""
+    executor = ThreadPoolExecutor(count)
+    futures = [executor.submit(fnc, *args) for _ in range(count)]
+    executor.shutdown(wait=False)
+    while flight.calls + flight.coalesced < count:
+        threading.Event().wait(0.001)
+    return futures
+
+
+def test_single_flight():
+    calls, release = [], threading.Event()
+    flight = SingleFlight()
+    futures = run_concurrently(flight, flight.do, "a", blocked(calls, release))
+    release.set()
+    assert [f.result() for f in futures] == ["done"] * 5
+    assert len(calls) == 1
+    assert (flight.calls, flight.coalesced) == (1, 4)
+    assert flight.do("a", lambda: "again") == "again"
+
+
+def test_single_flight_shares_errors():
+    calls, release = [], threading.Event()
+    flight = SingleFlight()
+    futures = run_concurrently(
+        flight, flight.do, "a", blocked(calls, release, ValueError("x"))
+    )
+    release.set()
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    assert len(calls) == 1
+
+
+def test_single_flight_keys():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: flight.do("b", lambda: 1)) == 1
+    assert (flight.calls, flight.coalesced) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight():
+    calls = []
+    flight = AsyncSingleFlight()
+
+    async def fnc(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(*(flight.do("a", fnc, i) for i in range(5)))
+    assert results == [0] * 5
+    assert calls == [0]
+    assert (flight.calls, flight.coalesced) == (1, 4)
+    assert await flight.do("a", fnc, 9) == 9
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_shares_errors():
+    flight = AsyncSingleFlight()
+
+    async def fnc():
+        await asyncio.sleep(0.01)
+        raise ValueError("x")
+
+    results = await asyncio.gather(
+        *(flight.do("a", fnc) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_cancelled_waiter():
+    flight = AsyncSingleFlight()
+
+    async def fnc():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("a", fnc))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(flight.do("a", fnc))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    assert await leader == "done"
+    assert waiter.cancelled()
+
+
+def test_client_coalesces_get_config():
+    client = ConfigClient(app_name="test_app")
+    release = threading.Event()
+
+    def config(request, context):
+        release.wait(5)
+        return conftest.CONFIG
+
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=config)
+        futures = run_concurrently(client._flight, client.get_config)
+        release.set()
+        assert [f.result() for f in futures] == [True] * 5
+    assert m.call_count == 1
+    assert client.coalesced == 4
+    assert client.get("spring.cloud.consul.host") == "discovery"
@@ -0,0 +1,121 @@
+import copy
+import pickle
+
+import pytest
+import requests_mock
+
+from config.snapshot import ConfigSnapshot, FrozenDict, FrozenList, freeze, thaw
+from config.spring import ConfigClient
+from tests import conftest
+
+CONFIG = {
+    "spring": {"cloud": {"consul": {"host": "discovery", "port": 8500}}},
+    "servers": [{"host": "a"}, {"host": "b"}],
+    "debug": False,
+}
+
+
+def test_freeze():
+    frozen = freeze(CONFIG)
+    assert frozen == CONFIG
+    assert type(frozen["spring"]["cloud"]) is FrozenDict
+    assert type(frozen["servers"]) is FrozenList
+    assert thaw(frozen) == CONFIG
+    assert type(thaw(frozen)["servers"][0]) is dict
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda s: s.__setitem__("debug", True),
+        lambda s: s.__delitem__("debug"),
+        lambda s: s.update(debug=True),
+        lambda s: s.pop("debug"),
+        lambda s: s.setdefault("new", 1),
+        lambda s: s.clear(),
+        lambda s: s["spring"]["cloud"].update(x=1),
+        lambda s: s["servers"].append({}),
+        lambda s: s["servers"].__setitem__(0, {}),
+        lambda s: s["servers"].sort(),
+        lambda s: s["servers"][0].__setitem__("host", "c"),
+    ],
+)
+def test_snapshot_is_read_only(mutate):
+    snapshot = ConfigSnapshot.build(CONFIG)
+    with pytest.raises(TypeError):
+        mutate(snapshot)
+    assert snapshot == CONFIG
+
+
+def test_snapshot_shares_unchanged_subtrees():
+    first = ConfigSnapshot.build(CONFIG, version="v1")
+    changed = copy.deepcopy(CONFIG)
+    changed["servers"][1]["host"] = "c"
+    second = ConfigSnapshot.build(changed, first, version="v2")
+    assert second is not first
+    assert second["spring"] is first["spring"]
+    assert second["servers"] is not first["servers"]
+    assert second["servers"][0] is first["servers"][0]
+    assert first["servers"][1]["host"] == "b"
+    assert (first.version, first.revision) == ("v1", 1)
+    assert (second.version, second.revision) == ("v2", 2)
+
+
+def test_snapshot_type_change_is_not_shared():
+    first = ConfigSnapshot.build({"a": {"b": 1}})
+    second = ConfigSnapshot.build({"a": {"b": True}}, first)
+    assert second["a"]["b"] is True
+    assert second["a"] is not first["a"]
+
+
+def test_snapshot_index():
+    snapshot = ConfigSnapshot.build(CONFIG)
+    assert snapshot.index["spring.cloud.consul.port"] == 8500
+    assert snapshot.index["servers.1.host"] == "b"
+    assert snapshot.index["spring"] is snapshot["spring"]
+
+
+@pytest.mark.parametrize("clone", [copy.copy, copy.deepcopy, pickle.dumps])
+def test_snapshot_copy(clone):
+    snapshot = ConfigSnapshot.build(CONFIG, version="v1")
+    result = clone(snapshot)
+    if isinstance(result, bytes):
+        result = pickle.loads(result)
+    assert result == snapshot
+    assert type(result) is ConfigSnapshot
+    assert result.version == "v1"
+    assert type(result["servers"]) is FrozenList
+
+
+def test_client_publishes_new_snapshot():
+    client = ConfigClient(app_name="test_app")
+    assert client.config == {}
+    assert isinstance(client.config, ConfigSnapshot)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        first = client.config
+        changed = copy.deepcopy(conftest.CONFIG)
+        changed["version"] = "v2"
+        changed["propertySources"][0]["source"]["server.port"] = 9090
+        m.get(client.url, json=changed)
+        client.get_config()
+    second = client.config
+    assert first.version == conftest.CONFIG["version"]
+    assert first["server"]["port"] == 8080
+    assert (second.version, second["server"]["port"]) == ("v2", 9090)
+    assert second["spring"] is first["spring"]
+    assert client.get("spring") is first["spring"]
+
+
+def test_client_snapshot_persisted(tmp_path):
+    path = str(tmp_path / "test_app.snapshot")
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+    restored = ConfigClient(app_name="test_app", snapshot_path=path)
+    assert restored.load_snapshot() is True
+    assert restored.config == client.config
+    assert isinstance(restored.config, ConfigSnapshot)
+    assert restored.config.version == conftest.CONFIG["version"]
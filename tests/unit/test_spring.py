@@ -1,10 +1,11 @@
 """Test spring module."""
 
-from unittest.mock import PropertyMock
+import copy
 
 import pytest
+import requests_mock
 
-from config import http
+from config import http, spring
 from config.exceptions import RequestFailedException
 from config.spring import ConfigClient, config_client, create_config_client
 from tests import conftest
@@ -113,8 +114,8 @@ def test_create_config_client_with_singleton(monkeypatch):
     assert id(client1) == id(client2)
 
 
-def test_keys(client):
-    type(client)._config = PropertyMock(return_value=conftest.CONFIG)
+def test_keys(client, monkeypatch):
+    monkeypatch.setattr(client, "_config", conftest.CONFIG)
     assert client.keys() == conftest.CONFIG.keys()
 
 
@@ -172,7 +173,7 @@ def test_encrypt(client, monkeypatch, mocker, path):
 
 
 @pytest.mark.parametrize("path", ["/configuration/decrypt", "/decrypt"])
-def test_decrypt(client, mocker, monkeypatch, path):
+def test_decrypt(client, monkeypatch, mocker, path):
     monkeypatch.setattr(http, "post", conftest.decrypt_mock)
     spy = mocker.spy(http, "post")
 
@@ -220,3 +221,302 @@ def test_client_with_auth_and_headers(monkeypatch, mocker, oauth2):
 )
 def test_config_client_attributes(client, attr):
     assert hasattr(client, attr)
+
+
+def test_get_config_with_session(mocker):
+    session = http.create_session()
+    mocker.patch.object(http, "get", conftest.config_mock)
+    spy = mocker.spy(http, "get")
+
+    client = ConfigClient(app_name="test_app", session=session)
+    client.get_config(timeout=5.0)
+    spy.assert_called_with(client.url, timeout=5.0, session=session)
+
+
+def test_encrypt_with_session(monkeypatch, mocker):
+    session = http.create_session()
+    monkeypatch.setattr(http, "post", conftest.encrypt_mock)
+    spy = mocker.spy(http, "post")
+
+    client = ConfigClient(app_name="test_app", session=session)
+    client.encrypt("my-secret")
+    spy.assert_called_with(
+        uri=f"{client.address}/encrypt",
+        data="my-secret",
+        headers={"Content-Type": "text/plain"},
+        session=session,
+    )
+
+
+def test_get_config_version_unchanged(mocker):
+    client = ConfigClient(app_name="test_app")
+    merge = mocker.spy(spring, "merge_sources")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        assert client.get_config() is True
+        assert client.get_config() is False
+    assert merge.call_count == 1
+    assert client.version == conftest.CONFIG["version"]
+    assert client.get("spring.cloud.consul.host") == "discovery"
+
+
+def test_get_config_version_changed():
+    client = ConfigClient(app_name="test_app")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        m.get(client.url, json=dict(conftest.CONFIG, version="abc123"))
+        assert client.get_config() is True
+    assert client.version == "abc123"
+
+
+def test_get_config_without_version():
+    client = ConfigClient(app_name="test_app")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=dict(conftest.CONFIG, version=None))
+        assert client.get_config() is True
+        assert client.get_config() is True
+
+
+def test_get_config_version_per_profile():
+    client = ConfigClient(app_name="test_app")
+    production = dict(
+        conftest.CONFIG,
+        propertySources=[{"name": "production.yml", "source": {"server.port": 9999}}],
+    )
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG, headers={"ETag": '"dev"'})
+        client.get_config()
+        client.profile = "production"
+        m.get(client.url, json=production, headers={"ETag": '"prod"'})
+        assert client.get_config() is True
+        assert client.get_config() is False
+        assert client.get("server.port") == 9999
+        client.profile = "development"
+        assert client.get_config() is True
+        assert "If-None-Match" not in m.last_request.headers
+        assert client.get("server.port") == 8080
+        assert client.version == conftest.CONFIG["version"]
+
+
+def test_get_config_not_modified():
+    client = ConfigClient(app_name="test_app")
+    with requests_mock.Mocker() as m:
+        m.get(
+            client.url,
+            [
+                {"json": conftest.CONFIG, "headers": {"ETag": '"v1"'}},
+                {"status_code": 304, "headers": {"ETag": '"v1"'}},
+            ],
+        )
+        assert client.get_config() is True
+        assert client.get_config() is False
+        assert m.last_request.headers["If-None-Match"] == '"v1"'
+    assert client.get("spring.cloud.consul.host") == "discovery"
+
+
+def test_get_config_swaps_config():
+    client = ConfigClient(app_name="test_app")
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        previous = client.config
+        m.get(client.url, json=dict(conftest.CONFIG, version="abc123"))
+        client.get_config()
+    assert client.config is not previous
+    assert client.config == previous
+
+
+def test_get_config_failover():
+    client = ConfigClient(
+        address="http://cfg1:8888,http://cfg2:8888", app_name="test_app"
+    )
+    with requests_mock.Mocker() as m:
+        m.get("http://cfg1:8888/test_app/development/master", status_code=503)
+        m.get("http://cfg2:8888/test_app/development/master", json=conftest.CONFIG)
+        client.get_config()
+    assert client.get("spring.cloud.consul.host") == "discovery"
+    assert client.url == "http://cfg2:8888/test_app/development/master"
+
+
+def test_replicas_follow_address():
+    client = ConfigClient(address="http://cfg1:8888", hedge=True)
+    assert client.replicas.addresses == ["http://cfg1:8888"]
+    client.address = "http://cfg1:8888,http://cfg2:8888"
+    assert client.replicas.addresses == ["http://cfg1:8888", "http://cfg2:8888"]
+    assert client.replicas.hedge
+
+
+def test_snapshot_saved_and_loaded(tmp_path):
+    path = str(tmp_path / "test_app.snapshot")
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    assert client.load_snapshot() is True
+    assert client.get("spring.cloud.consul.host") == "discovery"
+    assert client.version == conftest.CONFIG["version"]
+
+    client.profile = "production"
+    assert client.load_snapshot() is False
+
+
+def test_snapshot_survives_outage(tmp_path):
+    path = str(tmp_path / "test_app.snapshot")
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, status_code=503)
+        assert client.get_config() is False
+    assert client.get("spring.cloud.consul.host") == "discovery"
+
+
+def test_snapshot_outage_other_profile(tmp_path):
+    path = str(tmp_path / "test_app.snapshot")
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(requests_mock.ANY, json=conftest.CONFIG)
+        client.get_config()
+        client.profile = "production"
+        client.get_config()
+        client.profile = "development"
+        m.get(requests_mock.ANY, status_code=503)
+        # the config and the snapshot are production's, not development's
+        with pytest.raises(SystemExit):
+            client.get_config()
+
+
+def test_snapshot_missing_fail_fast(tmp_path):
+    client = ConfigClient(
+        app_name="test_app", snapshot_path=str(tmp_path / "missing.snapshot")
+    )
+    with requests_mock.Mocker() as m:
+        m.get(client.url, status_code=503)
+        with pytest.raises(SystemExit):
+            client.get_config()
+
+
+def test_warm_start(tmp_path, mocker):
+    path = str(tmp_path / "test_app.snapshot")
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        assert client.warm_start() is False
+
+    client = ConfigClient(app_name="test_app", snapshot_path=path)
+    revalidate = mocker.patch.object(ConfigClient, "_revalidate")
+    assert client.warm_start(timeout=5) is True
+    assert client.get("spring.cloud.consul.host") == "discovery"
+    revalidate.assert_called_once_with(timeout=5)
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("spring.cloud.consul", {"host": "discovery", "port": 8500}),
+        ("spring.cloud.consul.port", 8500),
+        ("spring.cloud.missing", "default"),
+        (("spring", "cloud", "consul", "host"), "discovery"),
+        ("spring.*.consul.port", [8500]),
+    ],
+)
+def test_get_uses_index(client, key, expected, mocker):
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+    glom = mocker.spy(spring, "glom")
+    assert client.get(key, "default") == expected
+    assert glom.called is (not isinstance(key, str) or "*" in key)
+
+
+def test_get_index_follows_refresh(client):
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        assert client.get("spring.cloud.consul.port") == 8500
+        changed = copy.deepcopy(conftest.CONFIG)
+        changed["version"] = "v2"
+        changed["propertySources"][2]["source"]["spring.cloud.consul.port"] = 8501
+        m.get(client.url, json=changed)
+        client.get_config()
+    assert client.get("spring.cloud.consul.port") == 8501
+
+
+def test_get_index_follows_config(client, monkeypatch):
+    monkeypatch.setattr(client, "_config", {"a": {"b": [1, 2]}})
+    assert client.get("a.b.1") == 2
+    assert client.get("a.b.-1") == 2
+
+
+DATASOURCE = {
+    "spring": {
+        "datasource": {"url": "jdbc:h2:mem", "hikari": {"pool-size": 5, "tags": []}},
+        "datasourcex": {"url": "other"},
+        "application": {"name": "foo"},
+    },
+    "servers": [{"host": "a"}, {"host": "b"}],
+}
+
+
+def test_get_many(client, monkeypatch):
+    monkeypatch.setattr(client, "_config", DATASOURCE)
+    assert client.get_many(
+        ["spring.datasource.url", "spring.datasource.missing", "servers.-1.host"],
+        default=None,
+    ) == {
+        "spring.datasource.url": "jdbc:h2:mem",
+        "spring.datasource.missing": None,
+        "servers.-1.host": "b",
+    }
+
+
+def test_iter_prefix(client, monkeypatch):
+    monkeypatch.setattr(client, "_config", DATASOURCE)
+    assert list(client.iter_prefix("spring.datasource")) == [
+        ("spring.datasource.hikari.pool-size", 5),
+        ("spring.datasource.hikari.tags", []),
+        ("spring.datasource.url", "jdbc:h2:mem"),
+    ]
+    assert list(client.iter_prefix("servers")) == [
+        ("servers.0.host", "a"),
+        ("servers.1.host", "b"),
+    ]
+    assert len(list(client.iter_prefix())) == 7
+
+
+@pytest.mark.parametrize(
+    "prefix,nested,expected",
+    [
+        (
+            "spring.datasource",
+            False,
+            {"hikari.pool-size": 5, "hikari.tags": [], "url": "jdbc:h2:mem"},
+        ),
+        ("spring.datasource", True, DATASOURCE["spring"]["datasource"]),
+        ("spring.data", False, {}),
+        ("spring.datasource.url", True, {}),
+        ("", True, DATASOURCE),
+    ],
+)
+def test_get_prefix(client, monkeypatch, prefix, nested, expected):
+    monkeypatch.setattr(client, "_config", DATASOURCE)
+    assert client.get_prefix(prefix, nested=nested) == expected
+
+
+def test_prefix_follows_refresh(client):
+    with requests_mock.Mocker() as m:
+        m.get(client.url, json=conftest.CONFIG)
+        client.get_config()
+        assert client.get_prefix("server") == {"port": 8080}
+        changed = copy.deepcopy(conftest.CONFIG)
+        changed["version"] = "v2"
+        changed["propertySources"][0]["source"]["server.address"] = "0.0.0.0"
+        m.get(client.url, json=changed)
+        client.get_config()
+    assert client.get_prefix("server") == {"address": "0.0.0.0", "port": 8080}